@@ -0,0 +1,51 @@
+"""Fit the judge-skip policy from logged judge decisions.
+
+Collect decisions by running the server or eval harness with
+JUDGE_DECISION_LOG=judge_decisions.jsonl, then:
+
+Usage:
+    venv/bin/python3 scripts/calibrate_judge_skip.py judge_decisions.jsonl
+    venv/bin/python3 scripts/calibrate_judge_skip.py judge_decisions.jsonl --target-far 0.01 -o judge_skip.json
+
+Point JUDGE_SKIP_CALIBRATION at the output file to enable the fast path.
+The file records the SEARCH_FUSION / SEARCH_TOP_K the decisions were logged
+under; search ignores it when run with different settings.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.orchestration.judge_policy import fit_policy, load_decision_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the judge-skip threshold")
+    parser.add_argument("log", help="JSONL judge decision log")
+    parser.add_argument("--target-far", type=float, default=0.02,
+                        help="Max false-accept rate on the log (default: 0.02)")
+    parser.add_argument("--min-accepts", type=int, default=20,
+                        help="Min skipped decisions needed to trust a threshold (default: 20)")
+    parser.add_argument("-o", "--output", default="judge_skip.json",
+                        help="Calibration file to write (default: judge_skip.json)")
+    args = parser.parse_args()
+
+    records = load_decision_log(args.log)
+    policy = fit_policy(records, args.target_far, min_accepts=args.min_accepts)
+    policy.save(args.output)
+
+    print(f"Fitted on {policy.samples} decisions "
+          f"(SEARCH_FUSION={policy.search_fusion}, SEARCH_TOP_K={policy.search_top_k})")
+    if policy.threshold > 1.0:
+        print("No threshold meets the target — policy will never skip the judge")
+    else:
+        print(f"Threshold: {policy.threshold:.4f}")
+        print(f"Expected skip rate: {policy.expected_skip_rate:.1%}")
+        print(f"Expected false-accept rate: {policy.expected_false_accept_rate:.2%}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,190 @@
+import asyncio
 import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, TypeVar
 
-from neo4j import AsyncGraphDatabase
+from neo4j import READ_ACCESS, WRITE_ACCESS, AsyncGraphDatabase
 
-from src.utils.config import EMBEDDING_DIM
+from src.skills.models import FILTER_FIELDS
+from src.utils.config import (
+    EMBEDDING_DIM,
+    NEO4J_ACQUISITION_TIMEOUT_S,
+    NEO4J_FETCH_SIZE,
+    NEO4J_LIVENESS_CHECK_S,
+    NEO4J_MAX_CONNECTION_LIFETIME_S,
+    NEO4J_MAX_POOL_SIZE,
+    NEO4J_VECTOR_FILTERING,
+)
+from src.utils.histogram import Histogram
+
+T = TypeVar("T")
 
 _driver = None
+# Shared by every session: reads wait for this process's latest writes
+_bookmarks = None
+# Driver construction is synchronous, so within one event loop it can't
+# interleave; the lock covers callers on other threads (eval scripts, tests)
+_driver_lock = threading.Lock()
 
 
 async def get_driver():
-    global _driver
+    global _driver, _bookmarks
     if _driver is None:
-        uri = os.environ["NEO4J_URI"]
-        user = os.environ.get("NEO4J_USERNAME") or os.environ["NEO4J_USER"]
-        password = os.environ["NEO4J_PASSWORD"]
-        _driver = AsyncGraphDatabase.driver(uri, auth=(user, password))
+        with _driver_lock:
+            if _driver is None:
+                _bookmarks = AsyncGraphDatabase.bookmark_manager()
+                uri = os.environ["NEO4J_URI"]
+                user = os.environ.get("NEO4J_USERNAME") or os.environ["NEO4J_USER"]
+                password = os.environ["NEO4J_PASSWORD"]
+                _driver = AsyncGraphDatabase.driver(uri, auth=(user, password), **pool_config())
+                _pool_metrics.instrument(_driver)
     return _driver
 
 
+def pool_config() -> dict:
+    """Driver pool settings from config (see .env.example)."""
+    config = {
+        "max_connection_pool_size": NEO4J_MAX_POOL_SIZE,
+        "connection_acquisition_timeout": NEO4J_ACQUISITION_TIMEOUT_S,
+        "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME_S,
+        "fetch_size": NEO4J_FETCH_SIZE,
+    }
+    if NEO4J_LIVENESS_CHECK_S:
+        config["liveness_check_timeout"] = float(NEO4J_LIVENESS_CHECK_S)
+    return config
+
+
+# Acquisition wait buckets (ms) — a warm pool hands out connections in well
+# under a millisecond; anything in the tens of ms means saturation
+_WAIT_BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000, 5000)
+
+
+class PoolMetrics:
+    """In-use / idle connections and acquisition wait for the driver's pool.
+
+    The driver exposes no pool metrics, so this reads its (private) pool:
+    wraps pool.acquire to time every connection checkout and counts
+    connections by their in_use flag. If a driver release changes those
+    internals, stats degrade to None instead of failing.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.wait_ms = Histogram(_WAIT_BUCKETS_MS)
+        self.failures = 0
+
+    def instrument(self, driver) -> None:
+        pool = getattr(driver, "_pool", None)
+        acquire = getattr(pool, "acquire", None)
+        if acquire is None:
+            return
+        self._pool = pool
+
+        async def timed_acquire(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                return await acquire(*args, **kwargs)
+            except Exception:
+                self.failures += 1
+                raise
+            finally:
+                self.wait_ms.observe((time.monotonic() - start) * 1000)
+
+        pool.acquire = timed_acquire
+
+    def stats(self) -> dict:
+        connections = getattr(self._pool, "connections", None)
+        in_use = idle = None
+        if connections is not None:
+            flags = [bool(getattr(c, "in_use", False)) for conns in connections.values() for c in conns]
+            in_use, idle = sum(flags), len(flags) - sum(flags)
+        return {
+            "max_size": NEO4J_MAX_POOL_SIZE,
+            "in_use": in_use,
+            "idle": idle,
+            "acquisition_failures": self.failures,
+            "acquisition_wait_ms": self.wait_ms.snapshot(),
+        }
+
+
+_pool_metrics = PoolMetrics()
+
+
+def pool_stats() -> dict | None:
+    """Pool metrics for /stats, or None before the driver exists."""
+    return _pool_metrics.stats() if _driver is not None else None
+
+
 async def close_driver():
     global _driver
-    if _driver is not None:
-        await _driver.close()
-        _driver = None
+    with _driver_lock:
+        driver, _driver = _driver, None
+    if driver is not None:
+        await driver.close()
+
+
+async def execute_read(
+    work: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+) -> T:
+    """Run work(tx, *args, **kwargs) as a managed READ transaction.
+
+    On a cluster it is routed to a follower / read replica; the driver
+    retries it on transient errors (so work may run more than once and must
+    consume its results inside the transaction); and the shared bookmark
+    manager orders it after this process's own writes.
+    """
+    driver = await get_driver()
+    async with driver.session(default_access_mode=READ_ACCESS, bookmark_manager=_bookmarks) as session:
+        return await session.execute_read(work, *args, **kwargs)
+
+
+async def execute_write(
+    work: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+) -> T:
+    """Run work(tx, *args, **kwargs) as a managed WRITE transaction on the
+    leader, retried on transient errors; its bookmark is shared with reads."""
+    driver = await get_driver()
+    async with driver.session(default_access_mode=WRITE_ACCESS, bookmark_manager=_bookmarks) as session:
+        return await session.execute_write(work, *args, **kwargs)
+
+
+async def warm_pool(connections: int) -> None:
+    """Open `connections` pooled Bolt connections up front (TLS + handshake +
+    auth), so the first requests after a cold start don't pay for them.
+
+    Each session holds its connection until all have run a query — otherwise
+    the pool would hand the same connection back every time. Sessions are
+    READ, the mode search uses, so on a cluster the connections opened are
+    the ones to the servers reads are routed to.
+    """
+    driver = await get_driver()
+    await driver.verify_connectivity()
+    connections = min(connections, NEO4J_MAX_POOL_SIZE)
+    if connections <= 1:
+        return
+    arrived = 0
+    all_open = asyncio.Event()
+
+    async def _hold() -> None:
+        nonlocal arrived
+        async with driver.session(default_access_mode=READ_ACCESS) as session:
+            try:
+                result = await session.run("RETURN 1")
+                await result.consume()
+            finally:
+                arrived += 1
+                if arrived == connections:
+                    all_open.set()
+            await all_open.wait()
+
+    results = await asyncio.gather(*(_hold() for _ in range(connections)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
 
 
 async def health_check() -> dict:
@@ -39,15 +202,36 @@ async def health_check() -> dict:
         }
 
 
+async def _check_vector_filter_properties(session) -> None:
+    """Fail startup if skill_embedding predates NEO4J_VECTOR_FILTERING —
+    otherwise every filtered search would fail in its SEARCH ... WHERE."""
+    result = await session.run(
+        "SHOW VECTOR INDEXES YIELD name, properties "
+        "WHERE name = 'skill_embedding' RETURN properties"
+    )
+    record = await result.single()
+    missing = [f for f in FILTER_FIELDS if f not in (record["properties"] if record else [])]
+    if missing:
+        raise RuntimeError(
+            "NEO4J_VECTOR_FILTERING is on, but the existing skill_embedding vector index "
+            f"does not store {missing}. Run DROP INDEX skill_embedding and restart to "
+            "rebuild it with the filter properties, or turn NEO4J_VECTOR_FILTERING off."
+        )
+
+
 async def initialize_indexes():
     driver = await get_driver()
     async with driver.session() as session:
-        # Vector index for semantic search
+        # Vector index for semantic search. With native filtering the filter
+        # properties are stored in the index (Neo4j 2026.01+). IF NOT EXISTS
+        # leaves an older index without them, so that is checked below rather
+        # than silently rebuilding every embedding on boot.
+        with_filters = " WITH [s.product_area, s.issue_type]" if NEO4J_VECTOR_FILTERING else ""
         result = await session.run(
             f"""
             CREATE VECTOR INDEX skill_embedding IF NOT EXISTS
             FOR (s:Skill)
-            ON (s.embedding)
+            ON (s.embedding){with_filters}
             OPTIONS {{indexConfig: {{
                 `vector.dimensions`: {EMBEDDING_DIM},
                 `vector.similarity_function`: 'cosine'
@@ -55,6 +239,8 @@ async def initialize_indexes():
             """
         )
         await result.consume()
+        if NEO4J_VECTOR_FILTERING:
+            await _check_vector_filter_properties(session)
 
         # Full-text index for keyword search
         # DROP first — IF NOT EXISTS won't update an existing index with old fields
@@ -0,0 +1,213 @@
+"""In-process BM25 replica of the skill_keywords fulltext index.
+
+A pure-Python inverted index over title, problem, resolution_md and
+keywords, scored with BM25F: per-field term frequencies are length
+normalized, weighted by a per-field boost, and summed before saturation.
+Loaded in full at startup, kept in sync from Neo4j via `updated_at`
+(see src/db/replica.py) and by the write paths in queries.py. Raw scores
+are unbounded like Lucene's, so _merge_scores normalizes them the same way.
+"""
+
+import heapq
+import logging
+import math
+import re
+
+from src.db.connection import execute_read
+from src.skills.models import CARD_PROJECTION, Skill, SkillCard
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("title", "problem", "resolution_md", "keywords")
+DEFAULT_BOOSTS = {"title": 2.0, "problem": 1.0, "resolution_md": 1.0, "keywords": 2.0}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def parse_boosts(spec: str) -> dict[str, float]:
+    """Parse "title=3,keywords=2" into a full boost map over FIELDS."""
+    boosts = dict(DEFAULT_BOOSTS)
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in boosts:
+            raise ValueError(f"Unknown keyword index field '{name}' (expected one of {FIELDS})")
+        boosts[name] = float(value)
+    return boosts
+
+
+class LocalKeywordIndex:
+    def __init__(self, boosts: dict[str, float] | None = None, k1: float = 1.2, b: float = 0.75):
+        self.boosts = [(boosts or DEFAULT_BOOSTS)[f] for f in FIELDS]
+        self.k1 = k1
+        self.b = b
+        # term -> {skill_id: per-field term frequencies}
+        self._postings: dict[str, dict[str, list[int]]] = {}
+        self._lengths: dict[str, list[int]] = {}
+        self._doc_terms: dict[str, set[str]] = {}
+        self._length_sums = [0] * len(FIELDS)
+        self._cards: dict[str, dict] = {}
+        self.synced_at = ""
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, skill_id: str) -> bool:
+        return skill_id in self._lengths
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "size": len(self._lengths),
+            "terms": len(self._postings),
+            "synced_at": self.synced_at,
+        }
+
+    def upsert(self, skill_id: str, fields: dict, card: dict) -> None:
+        """Index (or re-index) one skill. `fields` maps FIELDS names to text or lists."""
+        self.remove(skill_id)
+        lengths = [0] * len(FIELDS)
+        terms: set[str] = set()
+        for i, name in enumerate(FIELDS):
+            value = fields.get(name) or ""
+            text = " ".join(value) if isinstance(value, list) else value
+            tokens = tokenize(text)
+            lengths[i] = len(tokens)
+            terms.update(tokens)
+            for token in tokens:
+                tfs = self._postings.setdefault(token, {}).setdefault(
+                    skill_id, [0] * len(FIELDS)
+                )
+                tfs[i] += 1
+        self._lengths[skill_id] = lengths
+        self._doc_terms[skill_id] = terms
+        self._length_sums = [s + n for s, n in zip(self._length_sums, lengths)]
+        self._cards[skill_id] = card
+
+    def upsert_skill(self, skill: Skill) -> None:
+        self.upsert(
+            skill.skill_id,
+            {f: getattr(skill, f) for f in FIELDS},
+            {f: getattr(skill, f) for f in SkillCard.FIELDS},
+        )
+
+    def remove(self, skill_id: str) -> None:
+        lengths = self._lengths.pop(skill_id, None)
+        if lengths is None:
+            return
+        self._length_sums = [s - n for s, n in zip(self._length_sums, lengths)]
+        self._cards.pop(skill_id, None)
+        for term in self._doc_terms.pop(skill_id, ()):
+            docs = self._postings[term]
+            del docs[skill_id]
+            if not docs:
+                del self._postings[term]
+
+    def search(
+        self, query_text: str, k: int, filters: dict[str, str] | None = None
+    ) -> list[tuple[dict, float]]:
+        """BM25F top-k. Returns (card props, score) pairs, best first.
+
+        `filters` restricts results to cards whose fields equal the given values.
+        """
+        n_docs = len(self._lengths)
+        if n_docs == 0 or k <= 0:
+            return []
+        avg_lengths = [max(s / n_docs, 1e-9) for s in self._length_sums]
+
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query_text)):
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1.0 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for skill_id, tfs in docs.items():
+                lengths = self._lengths[skill_id]
+                tf = sum(
+                    boost * tf_f / (1.0 - self.b + self.b * len_f / avg_f)
+                    for boost, tf_f, len_f, avg_f in zip(self.boosts, tfs, lengths, avg_lengths)
+                    if tf_f
+                )
+                scores[skill_id] = scores.get(skill_id, 0.0) + idf * tf / (self.k1 + tf)
+
+        if filters:
+            scores = {
+                sid: score
+                for sid, score in scores.items()
+                if all(self._cards[sid].get(f) == v for f, v in filters.items())
+            }
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self._cards[sid], score) for sid, score in top]
+
+    async def load(self) -> None:
+        """Replace the replica with a full snapshot of every skill in Neo4j."""
+        fresh = LocalKeywordIndex(dict(zip(FIELDS, self.boosts)), self.k1, self.b)
+        await fresh._pull(since="")
+        self._postings, self._lengths, self._doc_terms = (
+            fresh._postings, fresh._lengths, fresh._doc_terms,
+        )
+        self._length_sums, self._cards = fresh._length_sums, fresh._cards
+        self.synced_at = fresh.synced_at
+        self.ready = True
+        logger.info("Local keyword index loaded: %d skills, %d terms", len(self), len(self._postings))
+
+    async def sync(self) -> int:
+        """Apply skills written since the last sync; full reload on a count mismatch."""
+        if not self.ready:
+            await self.load()
+            return len(self)
+        changed = await self._pull(since=self.synced_at)
+
+        async def work(tx):
+            result = await tx.run("MATCH (s:Skill) RETURN count(s) AS n")
+            return await result.single()
+
+        record = await execute_read(work)
+        if record["n"] != len(self):
+            await self.load()
+        return changed
+
+    async def _pull(self, since: str) -> int:
+        async def work(tx):
+            result = await tx.run(
+                f"""
+                MATCH (s:Skill)
+                WHERE s.updated_at >= $since
+                RETURN s.skill_id AS skill_id, s.updated_at AS updated_at,
+                       s {{.title, .problem, .resolution_md, .keywords}} AS fields,
+                       s {{{CARD_PROJECTION}}} AS card
+                """,
+                since=since,
+            )
+            return [record async for record in result]
+
+        records = await execute_read(work)
+        for record in records:
+            card = {k: v for k, v in dict(record["card"]).items() if v is not None}
+            self.upsert(record["skill_id"], dict(record["fields"]), card)
+            if record["updated_at"] > self.synced_at:
+                self.synced_at = record["updated_at"]
+        return len(records)
+
+
+_index: LocalKeywordIndex | None = None
+
+
+def get_keyword_index() -> LocalKeywordIndex | None:
+    """The process-wide replica, or None until init_keyword_index() has run."""
+    return _index
+
+
+async def init_keyword_index(boosts: dict[str, float] | None = None) -> LocalKeywordIndex:
+    global _index
+    if _index is None:
+        _index = LocalKeywordIndex(boosts)
+    await _index.load()
+    return _index
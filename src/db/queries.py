@@ -1,39 +1,149 @@
+import asyncio
+import heapq
+import inspect
+from collections.abc import Awaitable
 from datetime import datetime, timezone
 
-from src.db.connection import get_driver
-from src.skills.models import Skill, SkillUpdate
-from src.utils.config import validate_embedding
+from src.db.connection import execute_read, execute_write
+from src.db.keyword_index import get_keyword_index
+from src.db.vector_index import get_vector_index
+from src.skills.models import CARD_PROJECTION, FILTER_FIELDS, Skill, SkillCard, SkillUpdate
+from src.utils.cache import LRUCache
+from src.utils.config import (
+    FILTER_OVERSAMPLE_MAX,
+    HYBRID_SEARCH_MODE,
+    NEO4J_VECTOR_FILTERING,
+    RRF_K,
+    SEARCH_FETCH_FACTOR,
+    SEARCH_FUSION,
+    SKILL_BODY_CACHE_SIZE,
+    SKILL_BODY_CACHE_TTL_S,
+    validate_embedding,
+)
+
+# resolution_md by (skill_id, version) — an update bumps version, so stale
+# bodies are never served, they just age out
+_body_cache = LRUCache(maxsize=SKILL_BODY_CACHE_SIZE, ttl_s=SKILL_BODY_CACHE_TTL_S)
+
 
 
 async def get_skill(skill_id: str) -> Skill | None:
-    driver = await get_driver()
-    async with driver.session() as session:
-        result = await session.run(
+    async def work(tx):
+        result = await tx.run(
             "MATCH (s:Skill {skill_id: $skill_id}) RETURN properties(s) AS props",
             skill_id=skill_id,
         )
-        record = await result.single(strict=False)
-        if record is None:
-            return None
-        return Skill.from_neo4j_node(dict(record["props"]))
+        return await result.single(strict=False)
+
+    record = await execute_read(work)
+    if record is None:
+        return None
+    return Skill.from_neo4j_node(dict(record["props"]))
+
+
+async def get_skill_resolution(skill_id: str, version: int | None = None) -> str | None:
+    """Fetch one skill's resolution_md by id, served from cache when possible."""
+    if version is not None:
+        cached = _body_cache.get((skill_id, version))
+        if cached is not None:
+            return cached
+
+    async def work(tx):
+        result = await tx.run(
+            """
+            MATCH (s:Skill {skill_id: $skill_id})
+            RETURN s.resolution_md AS resolution_md, s.version AS version
+            """,
+            skill_id=skill_id,
+        )
+        return await result.single(strict=False)
+
+    record = await execute_read(work)
+    if record is None:
+        return None
+    _body_cache.set((skill_id, record["version"]), record["resolution_md"])
+    return record["resolution_md"]
+
+
+async def get_skill_resolutions(keys: list[tuple[str, int]]) -> dict[str, str]:
+    """Batch get_skill_resolution: (skill_id, version) pairs → {skill_id: resolution_md}.
+
+    Cache misses are fetched with one UNWIND query; deleted skills are absent
+    from the result.
+    """
+    bodies: dict[str, str] = {}
+    missing = []
+    for skill_id, version in keys:
+        cached = _body_cache.get((skill_id, version))
+        if cached is not None:
+            bodies[skill_id] = cached
+        else:
+            missing.append(skill_id)
+    if not missing:
+        return bodies
+
+    async def work(tx):
+        result = await tx.run(
+            """
+            UNWIND $skill_ids AS skill_id
+            MATCH (s:Skill {skill_id: skill_id})
+            RETURN s.skill_id AS skill_id, s.resolution_md AS resolution_md,
+                   s.version AS version
+            """,
+            skill_ids=missing,
+        )
+        return [record async for record in result]
+
+    for record in await execute_read(work):
+        _body_cache.set((record["skill_id"], record["version"]), record["resolution_md"])
+        bodies[record["skill_id"]] = record["resolution_md"]
+    return bodies
+
+
+def clear_skill_body_cache() -> None:
+    _body_cache.clear()
 
 
 async def create_skill(skill: Skill) -> Skill:
-    driver = await get_driver()
-    async with driver.session() as session:
-        result = await session.run(
+    async def work(tx):
+        result = await tx.run(
             "CREATE (s:Skill) SET s = $props RETURN properties(s) AS props",
             props=skill.to_neo4j_props(),
         )
-        record = await result.single()
-        return Skill.from_neo4j_node(dict(record["props"]))
+        return await result.single()
+
+    record = await execute_write(work)
+    created = Skill.from_neo4j_node(dict(record["props"]))
+    _replicate(created)
+    return created
+
+
+def _replicate(skill: Skill) -> None:
+    """Apply a write to the local index replicas so this process reads it at once."""
+    index = get_vector_index()
+    if index is not None:
+        index.upsert(
+            skill.skill_id,
+            skill.embedding,
+            {f: getattr(skill, f) for f in SkillCard.FIELDS},
+        )
+    keyword_index = get_keyword_index()
+    if keyword_index is not None:
+        keyword_index.upsert_skill(skill)
 
 
 async def check_duplicate(embedding: list[float], threshold: float = 0.95) -> Skill | None:
     validate_embedding(embedding, context="check_duplicate")
-    driver = await get_driver()
-    async with driver.session() as session:
-        result = await session.run(
+
+    index = get_vector_index()
+    if index is not None and index.ready:
+        hits = index.search(embedding, 1)
+        if not hits or hits[0][1] <= threshold:
+            return None
+        return await get_skill(hits[0][0]["skill_id"])
+
+    async def work(tx):
+        result = await tx.run(
             """
             CALL db.index.vector.queryNodes('skill_embedding', 1, $embedding)
             YIELD node, score
@@ -41,12 +151,14 @@ async def check_duplicate(embedding: list[float], threshold: float = 0.95) -> Sk
             """,
             embedding=embedding,
         )
-        record = await result.single(strict=False)
-        if record is None:
-            return None
-        if record["score"] > threshold:
-            return Skill.from_neo4j_node(dict(record["props"]))
+        return await result.single(strict=False)
+
+    record = await execute_read(work)
+    if record is None:
         return None
+    if record["score"] > threshold:
+        return Skill.from_neo4j_node(dict(record["props"]))
+    return None
 
 
 async def update_skill(skill_id: str, updates: SkillUpdate) -> Skill:
@@ -56,9 +168,8 @@ async def update_skill(skill_id: str, updates: SkillUpdate) -> Skill:
     changes = {k: v for k, v in updates.model_dump().items() if v is not None}
     updated_at = datetime.now(timezone.utc).isoformat()
 
-    driver = await get_driver()
-    async with driver.session() as session:
-        result = await session.run(
+    async def work(tx):
+        result = await tx.run(
             """
             MATCH (s:Skill {skill_id: $skill_id})
             SET s += $changes, s.version = s.version + 1, s.updated_at = $updated_at
@@ -68,57 +179,376 @@ async def update_skill(skill_id: str, updates: SkillUpdate) -> Skill:
             changes=changes,
             updated_at=updated_at,
         )
-        record = await result.single(strict=False)
-        if record is None:
-            raise ValueError(f"Skill {skill_id} not found")
-        return Skill.from_neo4j_node(dict(record["props"]))
+        return await result.single(strict=False)
+
+    record = await execute_write(work)
+    if record is None:
+        raise ValueError(f"Skill {skill_id} not found")
+    updated = Skill.from_neo4j_node(dict(record["props"]))
+    _replicate(updated)
+    return updated
 
 
 async def hybrid_search(
-    query_embedding: list[float],
+    query_embedding: list[float] | None | Awaitable[list[float] | None],
     query_text: str,
     top_k: int = 5,
     min_score: float = 0.0,
+    filters: dict[str, str] | None = None,
 ) -> list[dict]:
     """Search skills by combined vector + keyword similarity.
 
-    Returns list of dicts with keys: skill (Skill), score (float).
+    query_embedding may be an awaitable (e.g. an in-flight embed() task) —
+    the fulltext query only needs query_text, so it starts immediately on
+    its own session and overlaps with the embedding round trip and the
+    vector query. An embedding of None (e.g. one that missed its deadline)
+    makes the search keyword-only.
+
+    filters (exact match on FILTER_FIELDS) are applied inside retrieval, so
+    the fetch budget is spent on the right partition: native vector index
+    filtering when NEO4J_VECTOR_FILTERING is on, adaptive oversampling
+    otherwise, and a predicate on the fulltext hits.
+
+    With HYBRID_SEARCH_MODE=single, both index calls and the score fusion
+    run in one Cypher statement instead (see _hybrid_query; linear fusion,
+    unfiltered only — anything else takes the split path). When a local
+    replica (vector_index / keyword_index) is loaded, its half is answered
+    in-process instead — with both loaded, search makes no DB round trip.
+
+    Both modes project card fields only — no embeddings or resolution bodies
+    cross the wire. Returns list of dicts with keys: skill (SkillCard),
+    score (float), plus the vector_score / keyword_score components it was
+    fused from.
     Score is normalized to [0, 1].
     """
-    validate_embedding(query_embedding, context="hybrid_search")
-    fetch_count = top_k * 2
+    fetch_count = top_k * SEARCH_FETCH_FACTOR
+    filters = _validate_filters(filters)
 
-    driver = await get_driver()
-    async with driver.session() as session:
-        # Vector search
-        vec_result = await session.run(
-            """
-            CALL db.index.vector.queryNodes('skill_embedding', $fetch_count, $embedding)
+    if (
+        HYBRID_SEARCH_MODE == "single"
+        and SEARCH_FUSION == "linear"
+        and not filters
+        and not _local_replica_ready()
+    ):
+        if inspect.isawaitable(query_embedding):
+            query_embedding = await query_embedding
+        if query_embedding is not None:
+            validate_embedding(query_embedding, context="hybrid_search")
+            records = await _hybrid_query(
+                query_embedding, (query_text or "").strip(), fetch_count, top_k, min_score
+            )
+            return [
+                {
+                    "skill": SkillCard.from_neo4j_node(dict(props)),
+                    "score": score,
+                    "vector_score": v_score,
+                    "keyword_score": k_score,
+                }
+                for props, score, v_score, k_score in records
+            ]
+
+    # Fulltext search (skip if query_text is empty/whitespace)
+    kw_task = None
+    if query_text and query_text.strip():
+        kw_task = asyncio.ensure_future(
+            _keyword_query(query_text.strip(), fetch_count, filters)
+        )
+
+    try:
+        if inspect.isawaitable(query_embedding):
+            query_embedding = await query_embedding
+        vec_records = []
+        if query_embedding is not None:
+            validate_embedding(query_embedding, context="hybrid_search")
+            vec_records = await _vector_query(query_embedding, fetch_count, filters)
+        kw_records = await kw_task if kw_task is not None else []
+    finally:
+        if kw_task is not None and not kw_task.done():
+            kw_task.cancel()
+
+    return _merge_scores(vec_records, kw_records, min_score, top_k)
+
+
+def _validate_filters(filters: dict[str, str] | None) -> dict[str, str]:
+    filters = {k: v for k, v in (filters or {}).items() if v}
+    unknown = set(filters) - set(FILTER_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unsupported search filter(s) {sorted(unknown)} (expected {list(FILTER_FIELDS)})"
+        )
+    return filters
+
+
+def _filter_clause(var: str, filters: dict[str, str]) -> str:
+    """Cypher predicate over `var` for validated filters, using $f_<field> params."""
+    return " AND ".join(f"{var}.{field} = $f_{field}" for field in filters) or "true"
+
+
+def _filter_params(filters: dict[str, str]) -> dict:
+    return {f"f_{field}": value for field, value in filters.items()}
+
+
+async def _vector_query(
+    embedding: list[float],
+    fetch_count: int,
+    filters: dict[str, str] | None = None,
+) -> list:
+    filters = filters or {}
+    index = get_vector_index()
+    if index is not None and index.ready:
+        return index.search(embedding, fetch_count, filters)
+
+    async def work(tx):
+        if not filters:
+            result = await tx.run(
+                f"""
+                CALL db.index.vector.queryNodes('skill_embedding', $fetch_count, $embedding)
+                YIELD node, score
+                RETURN node {{{CARD_PROJECTION}}} AS props, score
+                """,
+                fetch_count=fetch_count,
+                embedding=embedding,
+            )
+            return await result.values()
+
+        if NEO4J_VECTOR_FILTERING:
+            # Requires the index to be created WITH the filter properties
+            # (see initialize_indexes) — Neo4j 2026.01+ SEARCH clause
+            result = await tx.run(
+                f"""
+                MATCH (node:Skill)
+                SEARCH node IN (
+                    VECTOR INDEX skill_embedding FOR $embedding
+                    WHERE {_filter_clause("node", filters)}
+                    LIMIT $fetch_count
+                ) SCORE AS score
+                RETURN node {{{CARD_PROJECTION}}} AS props, score
+                """,
+                fetch_count=fetch_count,
+                embedding=embedding,
+                **_filter_params(filters),
+            )
+            return await result.values()
+
+        # Adaptive oversampling: widen k until enough rows pass the filter
+        # or the index has nothing more to give
+        k = fetch_count * 4
+        while True:
+            result = await tx.run(
+                f"""
+                CALL db.index.vector.queryNodes('skill_embedding', $k, $embedding)
+                YIELD node, score
+                WITH collect({{node: node, score: score}}) AS rows
+                RETURN size(rows) AS scanned,
+                       [r IN rows WHERE {_filter_clause("r.node", filters)}
+                        | [r.node {{{CARD_PROJECTION}}}, r.score]][..$fetch_count] AS hits
+                """,
+                k=k,
+                embedding=embedding,
+                fetch_count=fetch_count,
+                **_filter_params(filters),
+            )
+            record = await result.single()
+            hits = record["hits"]
+            if len(hits) >= fetch_count or record["scanned"] < k or k >= FILTER_OVERSAMPLE_MAX:
+                return [tuple(hit) for hit in hits]
+            k = min(k * 2, FILTER_OVERSAMPLE_MAX)
+
+    return await execute_read(work)
+
+
+def _local_replica_ready() -> bool:
+    return any(
+        index is not None and index.ready
+        for index in (get_vector_index(), get_keyword_index())
+    )
+
+
+async def _keyword_query(
+    query_text: str,
+    fetch_count: int,
+    filters: dict[str, str] | None = None,
+) -> list:
+    filters = filters or {}
+    index = get_keyword_index()
+    if index is not None and index.ready:
+        return index.search(query_text, fetch_count, filters)
+
+    async def work(tx):
+        # Filter fields aren't in the fulltext index (they would skew ranking
+        # for every query), so the filter is a predicate on the hits
+        result = await tx.run(
+            f"""
+            CALL db.index.fulltext.queryNodes('skill_keywords', $query_text)
             YIELD node, score
-            RETURN properties(node) AS props, score
+            WHERE {_filter_clause("node", filters)}
+            RETURN node {{{CARD_PROJECTION}}} AS props, score
+            LIMIT $fetch_count
             """,
+            query_text=query_text,
             fetch_count=fetch_count,
-            embedding=query_embedding,
+            **_filter_params(filters),
         )
-        vec_records = await vec_result.values()
-
-        # Fulltext search (skip if query_text is empty/whitespace)
-        kw_records = []
-        has_keyword = query_text and query_text.strip()
-        if has_keyword:
-            kw_result = await session.run(
-                """
-                CALL db.index.fulltext.queryNodes('skill_keywords', $query_text)
+        return await result.values()
+
+    return await execute_read(work)
+
+
+async def hybrid_search_batch(
+    query_embeddings: list[list[float]],
+    query_texts: list[str],
+    top_k: int = 5,
+    min_score: float = 0.0,
+) -> list[list[dict]]:
+    """hybrid_search for many queries at once; results are in input order.
+
+    Both index lookups run as UNWIND queries in one read transaction — two
+    statements for the whole batch instead of two sessions per query. A
+    loaded local replica answers its half in-process, as in hybrid_search.
+    """
+    for embedding in query_embeddings:
+        validate_embedding(embedding, context="hybrid_search_batch")
+    fetch_count = top_k * SEARCH_FETCH_FACTOR
+    texts = [(t or "").strip() for t in query_texts]
+    vec_rows: list[list] = [[] for _ in texts]
+    kw_rows: list[list] = [[] for _ in texts]
+
+    vec_index = get_vector_index()
+    kw_index = get_keyword_index()
+    local_vec = vec_index is not None and vec_index.ready
+    local_kw = kw_index is not None and kw_index.ready
+    if local_vec:
+        vec_rows = [vec_index.search(e, fetch_count) for e in query_embeddings]
+    if local_kw:
+        kw_rows = [kw_index.search(t, fetch_count) if t else [] for t in texts]
+
+    if not (local_vec and local_kw):
+        # Rows are collected fresh per attempt — the driver may retry work
+        async def work(tx):
+            vec, kw = [[] for _ in texts], [[] for _ in texts]
+            if not local_vec:
+                result = await tx.run(
+                    f"""
+                    UNWIND range(0, size($embeddings) - 1) AS i
+                    CALL db.index.vector.queryNodes('skill_embedding', $fetch_count, $embeddings[i])
+                    YIELD node, score
+                    RETURN i, node {{{CARD_PROJECTION}}} AS props, score
+                    """,
+                    embeddings=query_embeddings,
+                    fetch_count=fetch_count,
+                )
+                async for record in result:
+                    vec[record["i"]].append((record["props"], record["score"]))
+            if not local_kw and any(texts):
+                result = await tx.run(
+                    f"""
+                    UNWIND range(0, size($texts) - 1) AS i
+                    WITH i WHERE $texts[i] <> ''
+                    CALL db.index.fulltext.queryNodes('skill_keywords', $texts[i], {{limit: $fetch_count}})
+                    YIELD node, score
+                    RETURN i, node {{{CARD_PROJECTION}}} AS props, score
+                    """,
+                    texts=texts,
+                    fetch_count=fetch_count,
+                )
+                async for record in result:
+                    kw[record["i"]].append((record["props"], record["score"]))
+            return vec, kw
+
+        vec, kw = await execute_read(work)
+        if not local_vec:
+            vec_rows = vec
+        if not local_kw:
+            kw_rows = kw
+
+    return [
+        _merge_scores(vec, kw, min_score, top_k)
+        for vec, kw in zip(vec_rows, kw_rows)
+    ]
+
+
+async def _hybrid_query(
+    embedding: list[float],
+    query_text: str,
+    fetch_count: int,
+    top_k: int,
+    min_score: float,
+) -> list:
+    """Vector + fulltext lookup with server-side fusion in a single round trip.
+
+    Mirrors _merge_scores: vector scores clamped to [0, 1], fulltext scores
+    min-max normalized within the result set, 0.7/0.3 weighting only when
+    the fulltext branch actually returned rows.
+    """
+    async def work(tx):
+        result = await tx.run(
+            f"""
+            CALL {{
+                CALL db.index.vector.queryNodes('skill_embedding', $fetch_count, $embedding)
                 YIELD node, score
-                RETURN properties(node) AS props, score
+                RETURN node, score AS vec, null AS kw
+                UNION ALL
+                WITH $query_text AS q WHERE q <> ''
+                CALL db.index.fulltext.queryNodes('skill_keywords', q)
+                YIELD node, score
+                RETURN node, null AS vec, score AS kw
                 LIMIT $fetch_count
-                """,
-                query_text=query_text.strip(),
-                fetch_count=fetch_count,
-            )
-            kw_records = await kw_result.values()
+            }}
+            WITH node, max(vec) AS vec, max(kw) AS kw
+            WITH collect({{node: node, vec: vec, kw: kw}}) AS rows,
+                 max(kw) AS kw_max, min(kw) AS kw_min
+            UNWIND rows AS r
+            WITH r.node AS s,
+                 CASE WHEN r.vec IS NULL OR r.vec < 0.0 THEN 0.0
+                      WHEN r.vec > 1.0 THEN 1.0 ELSE r.vec END AS v,
+                 CASE WHEN r.kw IS NULL THEN 0.0
+                      WHEN kw_max = kw_min THEN 1.0
+                      ELSE (r.kw - kw_min) / (kw_max - kw_min) END AS k,
+                 kw_max IS NOT NULL AS has_kw
+            WITH s, v, k, CASE WHEN has_kw THEN 0.7 * v + 0.3 * k ELSE v END AS score
+            WHERE score >= $min_score
+            RETURN s {{{CARD_PROJECTION}}} AS props, score, v, k
+            ORDER BY score DESC
+            LIMIT $top_k
+            """,
+            embedding=embedding,
+            query_text=query_text,
+            fetch_count=fetch_count,
+            top_k=top_k,
+            min_score=min_score,
+        )
+        return await result.values()
+
+    return await execute_read(work)
 
-    return _merge_scores(vec_records, kw_records, min_score, top_k)
+
+def _fuse_linear(vec: dict[str, float], kw: dict[str, float]) -> dict[str, float]:
+    """0.7 * vector + 0.3 * min-max keyword — or pure vector when kw is empty."""
+    if not kw:
+        return dict(vec)
+    return {
+        sid: 0.7 * vec.get(sid, 0.0) + 0.3 * kw.get(sid, 0.0)
+        for sid in vec.keys() | kw.keys()
+    }
+
+
+def _fuse_rrf(vec: dict[str, float], kw: dict[str, float]) -> dict[str, float]:
+    """Reciprocal rank fusion, scaled so rank 1 in every non-empty list scores 1.0.
+
+    Uses only ranks, so it is unaffected by how spread out one result set's
+    raw BM25 scores happen to be.
+    """
+    lists = [scores for scores in (vec, kw) if scores]
+    fused: dict[str, float] = {}
+    for scores in lists:
+        ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+        for rank, sid in enumerate(ranked, start=1):
+            fused[sid] = fused.get(sid, 0.0) + 1.0 / (RRF_K + rank)
+    best = len(lists) / (RRF_K + 1)
+    return {sid: score / best for sid, score in fused.items()}
+
+
+_FUSIONS = {"linear": _fuse_linear, "rrf": _fuse_rrf}
 
 
 def _merge_scores(
@@ -126,6 +556,7 @@ def _merge_scores(
     kw_records: list,
     min_score: float,
     top_k: int,
+    fusion: str | None = None,
 ) -> list[dict]:
     """Pure scoring logic — merge vector + keyword results into ranked list.
 
@@ -133,46 +564,49 @@ def _merge_scores(
     Weighting is based on whether kw_records actually contains results, not on
     whether a keyword query was attempted — avoids the 0.7 cap when fulltext
     returns zero rows for a non-empty query_text.
+
+    `fusion` picks the strategy from _FUSIONS (default: SEARCH_FUSION). Scores
+    are fused on plain floats and the top_k survivors selected with a heap;
+    only those are turned into SkillCards.
     """
+    fusion = fusion or SEARCH_FUSION
+    if fusion not in _FUSIONS:
+        raise ValueError(f"Unknown fusion '{fusion}' (expected one of {list(_FUSIONS)})")
+    fuse = _FUSIONS[fusion]
+
     # Build score maps keyed by skill_id
-    vec_scores: dict[str, tuple[dict, float]] = {}
+    props_by_id: dict[str, dict] = {}
+    vec_scores: dict[str, float] = {}
     for props, score in vec_records:
-        props = dict(props) if not isinstance(props, dict) else props
         sid = props["skill_id"]
+        props_by_id[sid] = props
         # Clamp vector score to [0, 1]
-        vec_scores[sid] = (props, max(0.0, min(1.0, score)))
+        vec_scores[sid] = max(0.0, min(1.0, score))
 
-    kw_scores: dict[str, tuple[dict, float]] = {}
+    kw_scores: dict[str, float] = {}
     if kw_records:
-        raw_kw = [(dict(p) if not isinstance(p, dict) else p, s) for p, s in kw_records]
-        kw_max = max(s for _, s in raw_kw)
-        kw_min = min(s for _, s in raw_kw)
+        kw_max = max(s for _, s in kw_records)
+        kw_min = min(s for _, s in kw_records)
         kw_range = kw_max - kw_min
-        for props, score in raw_kw:
+        for props, score in kw_records:
             sid = props["skill_id"]
-            normalized = (score - kw_min) / kw_range if kw_range > 0 else 1.0
-            kw_scores[sid] = (props, normalized)
-
-    has_keyword_results = bool(kw_scores)
-
-    # Merge — collect all skill_ids from both result sets
-    all_ids = set(vec_scores.keys()) | set(kw_scores.keys())
-    combined: list[dict] = []
-
-    for sid in all_ids:
-        v_score = vec_scores[sid][1] if sid in vec_scores else 0.0
-        k_score = kw_scores[sid][1] if sid in kw_scores else 0.0
-        props = vec_scores[sid][0] if sid in vec_scores else kw_scores[sid][0]
-
-        if has_keyword_results:
-            final = 0.7 * v_score + 0.3 * k_score
-        else:
-            final = v_score
-
-        final = max(0.0, min(1.0, final))
+            props_by_id.setdefault(sid, props)
+            kw_scores[sid] = (score - kw_min) / kw_range if kw_range > 0 else 1.0
 
-        if final >= min_score:
-            combined.append({"skill": Skill.from_neo4j_node(props), "score": final})
+    fused = fuse(vec_scores, kw_scores)
+    survivors = heapq.nlargest(
+        top_k,
+        ((max(0.0, min(1.0, final)), sid) for sid, final in fused.items()),
+        key=lambda item: item[0],
+    )
 
-    combined.sort(key=lambda x: x["score"], reverse=True)
-    return combined[:top_k]
+    return [
+        {
+            "skill": SkillCard.from_neo4j_node(dict(props_by_id[sid])),
+            "score": final,
+            "vector_score": vec_scores.get(sid, 0.0),
+            "keyword_score": kw_scores.get(sid, 0.0),
+        }
+        for final, sid in survivors
+        if final >= min_score
+    ]
@@ -0,0 +1,17 @@
+"""Background sync for the in-process index replicas (vector_index, keyword_index)."""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_sync_loop(replicas: list, interval_s: float) -> None:
+    """Pull changes into each replica every `interval_s` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval_s)
+        for replica in replicas:
+            try:
+                await replica.sync()
+            except Exception:
+                logger.exception("%s sync failed", type(replica).__name__)
@@ -0,0 +1,191 @@
+"""In-process replica of the skill_embedding vector index.
+
+Holds every skill embedding in one contiguous float32 matrix (rows
+L2-normalized) plus the card fields search needs, so exact cosine top-k is
+a single matrix-vector product with no Bolt round trip. Loaded in full at
+startup, then kept in sync incrementally from Neo4j via `updated_at` (see
+src/db/replica.py) and by the write paths in queries.py. Scores use Neo4j's
+cosine scale, (1 + cos) / 2, so thresholds mean the same thing against
+either backend.
+
+Requires numpy (pip install -e ".[local-index]").
+"""
+
+import logging
+
+from src.db.connection import execute_read
+from src.skills.models import CARD_PROJECTION
+from src.utils.config import EMBEDDING_DIM
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency — only needed when the replica is enabled
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorIndex:
+    def __init__(self, dim: int = EMBEDDING_DIM, capacity: int = 1024):
+        if np is None:
+            raise ImportError(
+                "LOCAL_VECTOR_INDEX requires numpy — pip install -e \".[local-index]\""
+            )
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._cards: dict[str, dict] = {}
+        self.synced_at = ""  # max updated_at seen from Neo4j
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, skill_id: str) -> bool:
+        return skill_id in self._rows
+
+    def stats(self) -> dict:
+        return {"ready": self.ready, "size": len(self._ids), "synced_at": self.synced_at}
+
+    def card(self, skill_id: str) -> dict | None:
+        return self._cards.get(skill_id)
+
+    def upsert(self, skill_id: str, embedding: list[float], card: dict) -> None:
+        vec = np.asarray(embedding, dtype=np.float32)
+        if vec.shape != (self.dim,):
+            raise ValueError(f"Expected embedding dim {self.dim}, got {vec.shape[0]}")
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec /= norm
+
+        row = self._rows.get(skill_id)
+        if row is None:
+            row = len(self._ids)
+            if row == self._matrix.shape[0]:
+                grown = np.zeros((row * 2, self.dim), dtype=np.float32)
+                grown[:row] = self._matrix
+                self._matrix = grown
+            self._ids.append(skill_id)
+            self._rows[skill_id] = row
+        self._matrix[row] = vec
+        self._cards[skill_id] = card
+
+    def remove(self, skill_id: str) -> None:
+        row = self._rows.pop(skill_id, None)
+        if row is None:
+            return
+        self._cards.pop(skill_id, None)
+        last = len(self._ids) - 1
+        if row != last:
+            # Swap the last row into the hole to keep the matrix contiguous
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+
+    def search(
+        self, embedding: list[float], k: int, filters: dict[str, str] | None = None
+    ) -> list[tuple[dict, float]]:
+        """Exact cosine top-k. Returns (card props, score) pairs, best first.
+
+        `filters` restricts results to cards whose fields equal the given values.
+        """
+        n = len(self._ids)
+        if n == 0 or k <= 0:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        sims = self._matrix[:n] @ query
+        if filters:
+            hits = []
+            for i in np.argsort(-sims):
+                card = self._cards[self._ids[i]]
+                if all(card.get(f) == v for f, v in filters.items()):
+                    hits.append((card, (1.0 + float(sims[i])) / 2.0))
+                    if len(hits) == k:
+                        break
+            return hits
+
+        k = min(k, n)
+        top = np.argpartition(-sims, k - 1)[:k] if k < n else np.arange(n)
+        top = top[np.argsort(-sims[top])]
+        return [
+            (self._cards[self._ids[i]], (1.0 + float(sims[i])) / 2.0)
+            for i in top
+        ]
+
+    async def load(self) -> None:
+        """Replace the replica with a full snapshot of every skill in Neo4j."""
+        fresh = LocalVectorIndex(self.dim, capacity=max(1024, len(self._ids)))
+        await fresh._pull(since="")
+        self._matrix, self._ids, self._rows, self._cards = (
+            fresh._matrix, fresh._ids, fresh._rows, fresh._cards,
+        )
+        self.synced_at = fresh.synced_at
+        self.ready = True
+        logger.info("Local vector index loaded: %d skills", len(self._ids))
+
+    async def sync(self) -> int:
+        """Apply skills written since the last sync. Returns rows upserted.
+
+        `updated_at` cannot reveal deletions, so a count mismatch with Neo4j
+        triggers a full reload.
+        """
+        if not self.ready:
+            await self.load()
+            return len(self._ids)
+        changed = await self._pull(since=self.synced_at)
+
+        async def work(tx):
+            result = await tx.run(
+                "MATCH (s:Skill) WHERE s.embedding IS NOT NULL RETURN count(s) AS n"
+            )
+            return await result.single()
+
+        record = await execute_read(work)
+        if record["n"] != len(self._ids):
+            await self.load()
+        return changed
+
+    async def _pull(self, since: str) -> int:
+        async def work(tx):
+            result = await tx.run(
+                f"""
+                MATCH (s:Skill)
+                WHERE s.embedding IS NOT NULL AND s.updated_at >= $since
+                RETURN s.skill_id AS skill_id, s.embedding AS embedding,
+                       s.updated_at AS updated_at, s {{{CARD_PROJECTION}}} AS card
+                """,
+                since=since,
+            )
+            return [record async for record in result]
+
+        records = await execute_read(work)
+        for record in records:
+            card = {k: v for k, v in dict(record["card"]).items() if v is not None}
+            self.upsert(record["skill_id"], record["embedding"], card)
+            if record["updated_at"] > self.synced_at:
+                self.synced_at = record["updated_at"]
+        return len(records)
+
+
+_index: LocalVectorIndex | None = None
+
+
+def get_vector_index() -> LocalVectorIndex | None:
+    """The process-wide replica, or None until init_vector_index() has run."""
+    return _index
+
+
+async def init_vector_index() -> LocalVectorIndex:
+    global _index
+    if _index is None:
+        _index = LocalVectorIndex()
+    await _index.load()
+    return _index
+
@@ -355,8 +355,10 @@ class EvaluationHarness:
         return {"eval_scoped": eval_tracker, "global": global_tracker}
 
     @staticmethod
-    def export_dual(trackers: dict[str, MetricsTracker], output_path: str):
-        """Export dual-view metrics to a single JSON file."""
+    def export_dual(
+        trackers: dict[str, MetricsTracker], output_path: str, llm_calls: dict | None = None
+    ):
+        """Export dual-view metrics (plus the phase's LLM call telemetry) to one JSON file."""
         data = {}
         for scope, tracker in trackers.items():
             data[scope] = {
@@ -364,6 +366,8 @@ class EvaluationHarness:
                 "checkpoints": tracker._checkpoints,
                 "final": asdict(tracker.aggregate()),
             }
+        if llm_calls is not None:
+            data["llm_calls"] = llm_calls
         with open(output_path, "w") as f:
             json.dump(data, f, indent=2)
 
@@ -373,6 +377,8 @@ class EvaluationHarness:
 # ---------------------------------------------------------------------------
 
 async def _main():
+    from src.llm.client import llm_call_stats, reset_llm_call_stats
+
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
     logger.info("Loading datasets...")
@@ -384,17 +390,25 @@ async def _main():
     await harness.setup()
     await harness.clear_eval_skills()
 
+    phase_calls = {}
+
     logger.info("=== Phase 1: Baseline ===")
+    reset_llm_call_stats()
     baseline = await harness.run_baseline(dev)
-    EvaluationHarness.export_dual(baseline, "eval_baseline.json")
+    phase_calls["baseline"] = llm_call_stats()
+    EvaluationHarness.export_dual(baseline, "eval_baseline.json", phase_calls["baseline"])
 
     logger.info("=== Phase 2: Learning ===")
+    reset_llm_call_stats()
     learning = await harness.run_learning(train)
-    EvaluationHarness.export_dual(learning, "eval_learning.json")
+    phase_calls["learning"] = llm_call_stats()
+    EvaluationHarness.export_dual(learning, "eval_learning.json", phase_calls["learning"])
 
     logger.info("=== Phase 3: Post-Learning ===")
+    reset_llm_call_stats()
     post = await harness.run_post_learning(dev)
-    EvaluationHarness.export_dual(post, "eval_post_learning.json")
+    phase_calls["post_learning"] = llm_call_stats()
+    EvaluationHarness.export_dual(post, "eval_post_learning.json", phase_calls["post_learning"])
 
     # Summary
     b_eval = baseline["eval_scoped"].aggregate()
@@ -404,6 +418,13 @@ async def _main():
     logger.info("Post-learning hit rate: %.1f%%", p_eval.judge_hit_rate * 100)
     logger.info("Improvement: +%.1f pp", (p_eval.judge_hit_rate - b_eval.judge_hit_rate) * 100)
     logger.info("Skills created: %d", len(harness._eval_owned_ids))
+    for phase, calls in phase_calls.items():
+        total = calls["total"]
+        logger.info(
+            "LLM %s: %d calls, %d retries, %d/%d tokens in/out, ~$%.4f",
+            phase, total["calls"], total["retries"],
+            total["prompt_tokens"], total["output_tokens"], total["cost_usd"],
+        )
 
 
 if __name__ == "__main__":
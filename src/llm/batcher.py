@@ -0,0 +1,94 @@
+"""Asyncio micro-batcher: coalesce concurrent single-item calls into one request.
+
+Items submitted under the same key within `max_wait_s` (or until `max_items`
+are queued) are handed to `flush(key, items)` together. flush returns one
+result per item, in order; an Exception in that list fails only its own
+caller. Used by embed() to turn concurrent embed_content calls into one
+request per (task_type, model).
+
+The window only applies while a flush for the key is in flight: an item
+arriving at an idle key is flushed on the next loop iteration (together
+with anything submitted in the same tick), so a lone call pays no wait.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+FlushFn = Callable[[Hashable, list[Any]], Awaitable[list[Any]]]
+
+
+class MicroBatcher:
+    def __init__(self, flush: FlushFn, max_items: int = 100, max_wait_s: float = 0.005):
+        self._flush_fn = flush
+        self.max_items = max_items
+        self.max_wait_s = max_wait_s
+        self._pending: dict[Hashable, list[tuple[Any, asyncio.Future]]] = {}
+        self._timers: dict[Hashable, asyncio.Task] = {}
+        # Strong references to running flushes (the loop only keeps weak ones)
+        self._tasks: set[asyncio.Task] = set()
+        self._in_flight: dict[Hashable, int] = {}
+        self.items = 0
+        self.batches = 0
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future))
+        self.items += 1
+        if len(batch) >= self.max_items:
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            # Detach the full batch now, so later submits start a new one
+            self._spawn(self._flush(key, self._pending.pop(key)))
+        elif key not in self._timers:
+            wait_s = self.max_wait_s if self._in_flight.get(key) else 0.0
+            self._timers[key] = self._spawn(self._flush_after(key, wait_s))
+        return await future
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_after(self, key: Hashable, wait_s: float) -> None:
+        await asyncio.sleep(wait_s)
+        self._timers.pop(key, None)
+        await self._flush(key, self._pending.pop(key, []))
+
+    async def _flush(self, key: Hashable, pending: list[tuple[Any, asyncio.Future]]) -> None:
+        batch = [(item, fut) for item, fut in pending if not fut.done()]
+        if not batch:
+            return
+        self.batches += 1
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        try:
+            results = await self._flush_fn(key, [item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        finally:
+            self._in_flight[key] -= 1
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "pending": sum(len(b) for b in self._pending.values()),
+        }
+
+    def reset(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._pending.clear()
+        self.items = 0
+        self.batches = 0
@@ -0,0 +1,236 @@
+"""Record/replay transport for Gemini calls — offline, reproducible benchmarks.
+
+A cassette stands in for the genai client returned by client._get_client(),
+so everything above the transport (caches, batching, rate governor,
+orchestration) runs exactly as in production:
+
+- record: forwards to the real client and appends each request, response
+  and measured latency to a JSON-lines cassette file.
+- replay: answers from the cassette with no network or API key, optionally
+  sleeping for the recorded latency (times a scale factor).
+
+Requests are matched on (method, model, contents, config). A request
+recorded more than once replays its responses in recorded order, then
+repeats the last one. Batched embed_content calls are recorded and matched
+per content item: how the micro-batcher splits concurrent embeds depends on
+timing, so a replay may batch the same texts differently than the
+recording did.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+_USAGE_FIELDS = (
+    "prompt_token_count",
+    "candidates_token_count",
+    "thoughts_token_count",
+    "total_token_count",
+)
+
+
+class CassetteMiss(KeyError):
+    """Replay found no recorded response for a request."""
+
+
+def _config_dict(config) -> dict:
+    if config is None:
+        return {}
+    if hasattr(config, "model_dump"):
+        return config.model_dump(exclude_none=True, mode="json")
+    return dict(config)
+
+
+def request_key(method: str, model: str, contents, config) -> str:
+    payload = json.dumps(
+        [method, model, contents, _config_dict(config)], sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _serialize_response(method: str, response) -> dict:
+    if method == "embed_content":
+        return {"embeddings": [list(e.values) for e in response.embeddings]}
+    usage = getattr(response, "usage_metadata", None)
+    return {
+        "text": response.text,
+        "usage": {f: getattr(usage, f, None) for f in _USAGE_FIELDS} if usage else None,
+    }
+
+
+def _build_response(method: str, data: dict):
+    if method == "embed_content":
+        return SimpleNamespace(
+            embeddings=[SimpleNamespace(values=values) for values in data["embeddings"]]
+        )
+    usage = SimpleNamespace(**data["usage"]) if data.get("usage") else None
+    return SimpleNamespace(text=data["text"], usage_metadata=usage)
+
+
+async def _single_chunk(response):
+    yield response
+
+
+class _Models:
+    def __init__(self, cassette: "Cassette"):
+        self._cassette = cassette
+
+    async def generate_content(self, *, model, contents, config=None):
+        return await self._cassette.call("generate_content", model, contents, config)
+
+    async def embed_content(self, *, model, contents, config=None):
+        return await self._cassette.call("embed_content", model, contents, config)
+
+    async def generate_content_stream(self, *, model, contents, config=None):
+        return await self._cassette.stream(model, contents, config)
+
+
+class Cassette:
+    """Drop-in for genai.Client on the `.aio.models` surface the client uses."""
+
+    def __init__(self, path: str | Path, mode: str, inner=None, latency_scale: float = 0.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}' (expected record or replay)")
+        if mode == "record" and inner is None:
+            raise ValueError("record mode needs the real client to forward to")
+        self.path = Path(path)
+        self.mode = mode
+        self.inner = inner
+        self.latency_scale = latency_scale
+        self.aio = SimpleNamespace(models=_Models(self), aclose=self.aclose)
+        self._recorded: dict[str, list[dict]] = {}
+        self._served: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _load(self) -> None:
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._recorded.setdefault(entry["key"], []).append(entry)
+
+    async def call(self, method: str, model: str, contents, config):
+        if method == "embed_content" and isinstance(contents, list):
+            return await self._embed_items(model, contents, config)
+        key = request_key(method, model, contents, config)
+        if self.mode == "replay":
+            return await self._replay(key, method, model)
+
+        start = time.monotonic()
+        response = await getattr(self.inner.aio.models, method)(
+            model=model, contents=contents, config=config
+        )
+        entry = {
+            "key": key,
+            "method": method,
+            "model": model,
+            "request": {"contents": contents, "config": _config_dict(config)},
+            "response": _serialize_response(method, response),
+            "latency_ms": (time.monotonic() - start) * 1000,
+        }
+        self._write(entry)
+        return response
+
+    async def _embed_items(self, model: str, contents: list, config):
+        """Batched embed_content, one cassette entry per item (same key as a
+        single-content request for that item)."""
+        method = "embed_content"
+        keys = [request_key(method, model, item, config) for item in contents]
+        if self.mode == "replay":
+            entries = [self._lookup(key, method, model) for key in keys]
+            await self._sleep(max(entry["latency_ms"] for entry in entries))
+            return SimpleNamespace(embeddings=[
+                SimpleNamespace(values=entry["response"]["embeddings"][0]) for entry in entries
+            ])
+
+        start = time.monotonic()
+        response = await self.inner.aio.models.embed_content(
+            model=model, contents=contents, config=config
+        )
+        latency_ms = (time.monotonic() - start) * 1000
+        for key, item, embedding in zip(keys, contents, response.embeddings):
+            self._write({
+                "key": key,
+                "method": method,
+                "model": model,
+                "request": {"contents": item, "config": _config_dict(config)},
+                "response": {"embeddings": [list(embedding.values)]},
+                "latency_ms": latency_ms,
+            })
+        return response
+
+    async def stream(self, model: str, contents, config):
+        """Streamed generate_content. Recorded as one joined response (latency
+        = until the last chunk); replayed as a single chunk."""
+        method = "generate_content_stream"
+        key = request_key(method, model, contents, config)
+        if self.mode == "replay":
+            return _single_chunk(await self._replay(key, method, model))
+        start = time.monotonic()
+        inner = await self.inner.aio.models.generate_content_stream(
+            model=model, contents=contents, config=config
+        )
+        return self._record_stream(inner, start, key, model, contents, config)
+
+    async def _record_stream(self, inner, start, key, model, contents, config):
+        texts, usage = [], None
+        async for chunk in inner:
+            texts.append(chunk.text or "")
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            yield chunk
+        self._write({
+            "key": key,
+            "method": "generate_content_stream",
+            "model": model,
+            "request": {"contents": contents, "config": _config_dict(config)},
+            "response": _serialize_response(
+                "generate_content_stream", SimpleNamespace(text="".join(texts), usage_metadata=usage)
+            ),
+            "latency_ms": (time.monotonic() - start) * 1000,
+        })
+
+    def _write(self, entry: dict) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.recorded += 1
+
+    def _lookup(self, key: str, method: str, model: str) -> dict:
+        entries = self._recorded.get(key)
+        if not entries:
+            self.misses += 1
+            raise CassetteMiss(f"No recorded {method} response for this {model} request in {self.path}")
+        i = self._served.get(key, 0)
+        self._served[key] = i + 1
+        self.hits += 1
+        return entries[min(i, len(entries) - 1)]
+
+    async def _sleep(self, latency_ms: float) -> None:
+        if self.latency_scale > 0:
+            await asyncio.sleep(latency_ms / 1000 * self.latency_scale)
+
+    async def _replay(self, key: str, method: str, model: str):
+        entry = self._lookup(key, method, model)
+        await self._sleep(entry["latency_ms"])
+        return _build_response(method, entry["response"])
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aio.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "path": str(self.path),
+            "recorded": self.recorded,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
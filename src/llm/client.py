@@ -1,46 +1,330 @@
+import asyncio
+import copy
 import json
 import math
 import os
+import threading
 
 from google import genai
 
+from src.llm.batcher import MicroBatcher
+from src.llm.cassette import Cassette
+from src.llm.dispatch import PriorityDispatcher, parse_weights
+from src.llm.embedders import Embedder, HashingEmbedder
+from src.llm.embedding_store import EmbeddingStore, store_key
+from src.llm.governor import RateGovernor, error_code
+from src.llm.hedging import Hedger
+from src.llm.json_stream import FieldCallback, StreamingJSONObjectParser
+from src.llm.response_cache import DiskResponseStore, ResponseCache, response_key
+from src.llm.telemetry import CallRecord, Telemetry, current_call, detach
+from src.utils.cache import LRUCache, normalize_text
+from src.utils.config import (
+    EMBED_BATCH_MAX,
+    EMBED_BATCH_WAIT_MS,
+    EMBED_CACHE_SIZE,
+    EMBED_CACHE_TTL_S,
+    EMBED_STORE_MAX_MB,
+    EMBED_STORE_PATH,
+    EMBEDDING_BACKEND,
+    EMBEDDING_DIM,
+    HEDGE_MAX_EXTRA_RATE,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    LLM_CASSETTE_LATENCY_SCALE,
+    LLM_CASSETTE_MODE,
+    LLM_CASSETTE_PATH,
+    LLM_DISPATCH_MAX_CONCURRENCY,
+    LLM_HEDGING,
+    LLM_LIMITS,
+    LLM_MAX_RETRIES,
+    LLM_PRICES,
+    LLM_PRIORITY_WEIGHTS,
+    LLM_READ_RESERVED_SHARE,
+    LLM_RETRY_BASE_MS,
+    LLM_RETRY_MAX_MS,
+    PRO_CACHE_MAX_MB,
+    PRO_CACHE_PATH,
+    PRO_CACHE_SIZE,
+    PRO_CACHE_TTL_S,
+)
+
 _client = None
+# Same double-checked construction as connection.get_driver (see _driver_lock)
+_client_lock = threading.Lock()
 
 FLASH_MODEL = os.getenv("GEMINI_FLASH_MODEL", "gemini-3-flash-preview")
 PRO_MODEL = os.getenv("GEMINI_PRO_MODEL", "gemini-3-pro-preview")
 EMBEDDING_MODEL = os.getenv("GEMINI_EMBEDDING_MODEL", "gemini-embedding-001")
 
+# Max contents per embed_content request (batchEmbedContents limit)
+EMBED_BATCH_LIMIT = 100
+
+# Keyed by (normalized text, task_type, model, dim) — a model or dimension
+# change can never serve a stale vector.
+_embedding_cache = LRUCache(maxsize=EMBED_CACHE_SIZE, ttl_s=EMBED_CACHE_TTL_S)
+# Optional second tier that survives restarts (see embedding_store.py)
+_embedding_store: EmbeddingStore | None = None
+# call_pro_json(cache=True) responses — memory + optional disk (see response_cache.py)
+_response_cache: ResponseCache | None = None
+
+# One latency profile per hedgeable call type (see hedging.py)
+_hedgers = {
+    name: Hedger(HEDGE_PERCENTILE, HEDGE_MAX_EXTRA_RATE, HEDGE_MIN_SAMPLES)
+    for name in ("flash", "embed")
+}
+
+
+# Concurrency / RPM / TPM limits and retries per model family (see governor.py)
+_governors = {
+    family: RateGovernor(
+        family,
+        *LLM_LIMITS[family],
+        max_retries=LLM_MAX_RETRIES,
+        retry_base_s=LLM_RETRY_BASE_MS / 1000,
+        retry_max_s=LLM_RETRY_MAX_MS / 1000,
+    )
+    for family in ("flash", "pro", "embed")
+}
+
+
+def _estimate_tokens(*texts: str) -> float:
+    # ~4 characters per token; only used to pace the tokens/min bucket
+    return sum(len(t) for t in texts) / 4
+
+
+# Shared slots across all families, read (search) traffic ahead of write
+# (learning) traffic — see dispatch.py
+_dispatcher = PriorityDispatcher(
+    LLM_DISPATCH_MAX_CONCURRENCY, parse_weights(LLM_PRIORITY_WEIGHTS), LLM_READ_RESERVED_SHARE
+)
+
+
+async def _governed(family: str, priority: str, call, tokens: float = 0):
+    """One API request under the family's rate governor, taking a shared
+    priority slot for each attempt."""
+    record = current_call()
+    if record is None:
+        attempt = call
+    else:
+        record.requests += 1
+
+        async def attempt():
+            record.attempts += 1
+            return await call()
+
+    return await _governors[family].run(
+        attempt, tokens=tokens, slot=lambda: _dispatcher.slot(priority)
+    )
+
+
+def _embed_priority(task_type: str) -> str:
+    # Query embeddings sit on the search path; document embeddings on create/update
+    return "read" if task_type == "RETRIEVAL_QUERY" else "write"
+
+
+def rate_governor_stats() -> dict:
+    return {
+        "dispatch": _dispatcher.stats(),
+        **{family: governor.stats() for family, governor in _governors.items()},
+    }
+
+
+# Wall time, retries, tokens and cost per call site (see telemetry.py)
+_telemetry = Telemetry(LLM_PRICES)
+
+
+def llm_call_stats() -> dict:
+    return _telemetry.snapshot()
+
+
+def reset_llm_call_stats() -> None:
+    _telemetry.reset()
+
+
+def reset_rate_governors() -> None:
+    _dispatcher.reset()
+    for governor in _governors.values():
+        governor.reset()
+
 
 def _get_client() -> genai.Client:
     global _client
     if _client is None:
-        _client = genai.Client(api_key=os.environ["GOOGLE_API_KEY"])
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
     return _client
 
 
-async def call_flash(prompt: str, temperature: float = 0.2) -> str:
+def _build_client():
+    if LLM_CASSETTE_MODE == "replay":
+        # Offline: no API key, no network (see cassette.py)
+        return Cassette(LLM_CASSETTE_PATH, "replay", latency_scale=LLM_CASSETTE_LATENCY_SCALE)
+    client = genai.Client(api_key=os.environ["GOOGLE_API_KEY"])
+    if LLM_CASSETTE_MODE != "off":
+        client = Cassette(LLM_CASSETTE_PATH, LLM_CASSETTE_MODE, inner=client)
+    return client
+
+
+def init_client() -> None:
+    """Build the Gemini client now (server startup) instead of on first call."""
+    _get_client()
+
+
+async def close_client() -> None:
+    """Close the client's HTTP connections; the next call builds a new one."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        await client.aio.aclose()
+
+
+def cassette_stats() -> dict | None:
+    """Record/replay counters, or None when LLM_CASSETTE_MODE is off."""
+    return _client.stats() if isinstance(_client, Cassette) else None
+
+
+async def call_flash(
+    prompt: str,
+    temperature: float = 0.2,
+    hedge: bool = False,
+    priority: str = "read",
+    site: str = "unlabeled",
+) -> str:
+    """Flash completion. hedge=True (idempotent read-path calls only) lets a
+    slow call be duplicated when LLM_HEDGING is on. site labels the call in
+    llm_call_stats()."""
+    with _telemetry.track(site, "flash", FLASH_MODEL):
+        if hedge and LLM_HEDGING:
+            return await _hedgers["flash"].run(
+                lambda: _flash_request(prompt, temperature, priority)
+            )
+        return await _flash_request(prompt, temperature, priority)
+
+
+async def _flash_request(prompt: str, temperature: float, priority: str) -> str:
     client = _get_client()
-    response = await client.aio.models.generate_content(
-        model=FLASH_MODEL,
-        contents=prompt,
-        config=genai.types.GenerateContentConfig(temperature=temperature),
+    response = await _governed(
+        "flash",
+        priority,
+        lambda: client.aio.models.generate_content(
+            model=FLASH_MODEL,
+            contents=prompt,
+            config=genai.types.GenerateContentConfig(temperature=temperature),
+        ),
+        tokens=_estimate_tokens(prompt),
     )
+    _note_usage(response)
     return response.text
 
 
-async def call_pro_json(prompt: str, temperature: float = 0.3) -> dict:
+async def call_pro_json(
+    prompt: str,
+    temperature: float = 0.3,
+    priority: str = "write",
+    cache: bool = False,
+    site: str = "unlabeled",
+) -> dict:
+    """Pro completion parsed as JSON. cache=True (opt-in per caller) serves a
+    byte-identical (model, prompt, temperature) from the response cache."""
+    with _telemetry.track(site, "pro", PRO_MODEL) as record:
+        if not cache:
+            return await _pro_request(prompt, temperature, priority)
+        key = response_key(PRO_MODEL, prompt, temperature)
+        cached = _get_response_cache().get(key)
+        if cached is not None:
+            record.cached = True
+            return copy.deepcopy(cached)
+        result = await _pro_request(prompt, temperature, priority)
+        _get_response_cache().set(key, copy.deepcopy(result))
+        return result
+
+
+async def _pro_request(prompt: str, temperature: float, priority: str) -> dict:
     client = _get_client()
-    response = await client.aio.models.generate_content(
-        model=PRO_MODEL,
-        contents=prompt,
-        config=genai.types.GenerateContentConfig(
-            temperature=temperature,
-            response_mime_type="application/json",
+    response = await _governed(
+        "pro",
+        priority,
+        lambda: client.aio.models.generate_content(
+            model=PRO_MODEL,
+            contents=prompt,
+            config=genai.types.GenerateContentConfig(
+                temperature=temperature,
+                response_mime_type="application/json",
+            ),
         ),
+        tokens=_estimate_tokens(prompt),
     )
+    _note_usage(response)
     return json.loads(response.text)
 
 
+def _note_usage(response) -> None:
+    if (record := current_call()) is not None:
+        record.add_usage(getattr(response, "usage_metadata", None))
+
+
+async def call_pro_json_stream(
+    prompt: str,
+    on_field: FieldCallback,
+    temperature: float = 0.3,
+    priority: str = "write",
+    cache: bool = False,
+    site: str = "unlabeled",
+) -> dict:
+    """call_pro_json, streamed: on_field(name, value) fires as each top-level
+    field of the JSON response completes, in generation order, and the full
+    object is returned at the end. Cancelling the awaiting task closes the
+    stream. A response-cache hit replays on_field for every field."""
+    with _telemetry.track(site, "pro", PRO_MODEL) as record:
+        key = response_key(PRO_MODEL, prompt, temperature) if cache else None
+        if key is not None and (cached := _get_response_cache().get(key)) is not None:
+            record.cached = True
+            result = copy.deepcopy(cached)
+            for name, value in result.items():
+                on_field(name, value)
+            return result
+        result = await _pro_stream_request(prompt, temperature, priority, on_field)
+        if key is not None:
+            _get_response_cache().set(key, copy.deepcopy(result))
+        return result
+
+
+async def _pro_stream_request(
+    prompt: str, temperature: float, priority: str, on_field: FieldCallback
+) -> dict:
+    client = _get_client()
+
+    async def attempt() -> dict:
+        parser = StreamingJSONObjectParser(on_field)
+        usage = None
+        stream = await client.aio.models.generate_content_stream(
+            model=PRO_MODEL,
+            contents=prompt,
+            config=genai.types.GenerateContentConfig(
+                temperature=temperature,
+                response_mime_type="application/json",
+            ),
+        )
+        try:
+            async for chunk in stream:
+                parser.feed(chunk.text or "")
+                # Usage is cumulative; the last chunk carries the totals
+                usage = getattr(chunk, "usage_metadata", None) or usage
+        except Exception as e:
+            if parser.result:
+                # The caller already acted on streamed fields — a retry could
+                # contradict them, so surface as a non-retryable failure
+                raise RuntimeError("Pro stream failed after partial output") from e
+            raise
+        if (record := current_call()) is not None:
+            record.add_usage(usage)
+        return parser.close()
+
+    return await _governed("pro", priority, attempt, tokens=_estimate_tokens(prompt))
+
+
 def _l2_normalize(vec: list[float]) -> list[float]:
     """L2 normalize vector. Required for gemini-embedding-001 at <3072 dimensions."""
     norm = math.sqrt(sum(x * x for x in vec))
@@ -49,17 +333,251 @@ def _l2_normalize(vec: list[float]) -> list[float]:
     return [x / norm for x in vec]
 
 
-async def embed(text: str, task_type: str = "RETRIEVAL_DOCUMENT") -> list[float]:
+def _get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        disk = None
+        if PRO_CACHE_PATH:
+            disk = DiskResponseStore(
+                PRO_CACHE_PATH, PRO_CACHE_TTL_S, int(PRO_CACHE_MAX_MB * 1024 * 1024)
+            )
+        _response_cache = ResponseCache(PRO_CACHE_SIZE, PRO_CACHE_TTL_S, disk)
+    return _response_cache
+
+
+def response_cache_stats() -> dict:
+    return _get_response_cache().stats()
+
+
+def clear_response_cache() -> None:
+    """Drop the in-process tier; the disk tier is meant to outlive the process."""
+    if _response_cache is not None:
+        _response_cache.clear()
+
+
+def _get_embedding_store() -> EmbeddingStore | None:
+    global _embedding_store
+    if _embedding_store is None and EMBED_STORE_PATH:
+        _embedding_store = EmbeddingStore(EMBED_STORE_PATH, int(EMBED_STORE_MAX_MB * 1024 * 1024))
+    return _embedding_store
+
+
+def embedding_cache_stats() -> dict:
+    store = _get_embedding_store()
+    return {**_embedding_cache.stats(), "disk": store.stats() if store is not None else None}
+
+
+def clear_embedding_cache() -> None:
+    _embedding_cache.clear()
+
+
+def hedging_stats() -> dict:
+    return {"enabled": LLM_HEDGING, **{name: h.stats() for name, h in _hedgers.items()}}
+
+
+def reset_hedging() -> None:
+    for hedger in _hedgers.values():
+        hedger.reset()
+
+
+class GeminiEmbedder(Embedder):
+    """gemini-embedding-001 through the micro-batcher, hedger and rate governor."""
+
+    @property
+    def model(self) -> str:
+        return EMBEDDING_MODEL
+
+    async def embed_one(self, text: str, task_type: str, hedge: bool = False) -> list[float]:
+        if hedge and LLM_HEDGING:
+            return await _hedgers["embed"].run(lambda: _embed_one(text, task_type))
+        return await _embed_one(text, task_type)
+
+    async def embed_many(self, texts: list[str], task_type: str) -> list[list[float]]:
+        # One embed_content request per EMBED_BATCH_LIMIT texts, sent concurrently
+        chunks = await asyncio.gather(*(
+            _embed_many(texts[i:i + EMBED_BATCH_LIMIT], task_type, EMBEDDING_MODEL)
+            for i in range(0, len(texts), EMBED_BATCH_LIMIT)
+        ))
+        return [vec for chunk in chunks for vec in chunk]
+
+
+_embedder: Embedder | None = None
+
+
+def get_embedder() -> Embedder:
+    """The EMBEDDING_BACKEND selected in config (see embedders.py)."""
+    global _embedder
+    if _embedder is None:
+        if EMBEDDING_BACKEND == "gemini":
+            _embedder = GeminiEmbedder()
+        elif EMBEDDING_BACKEND == "hashing":
+            _embedder = HashingEmbedder(EMBEDDING_DIM)
+        else:
+            raise ValueError(
+                f"Unknown EMBEDDING_BACKEND '{EMBEDDING_BACKEND}' (expected gemini or hashing)"
+            )
+    return _embedder
+
+
+async def embed(
+    text: str, task_type: str = "RETRIEVAL_DOCUMENT", hedge: bool = False, site: str = "unlabeled"
+) -> list[float]:
+    """Embed one text (cached). hedge=True is for latency-critical query
+    embeddings; it only takes effect when LLM_HEDGING is on."""
+    embedder = get_embedder()
+    with _telemetry.track(site, embedder.family, embedder.model) as record:
+        if not embedder.cacheable:
+            return await embedder.embed_one(text, task_type)
+        key = (normalize_text(text), task_type, embedder.model, EMBEDDING_DIM)
+        cached = _cached_embedding(key)
+        if cached is not None:
+            record.cached = True
+            return list(cached)
+
+        # embed_content returns no usage_metadata — estimate billed input
+        record.prompt_tokens += round(_estimate_tokens(text))
+        vec = await embedder.embed_one(text, task_type, hedge=hedge)
+        _remember_embedding(key, vec)
+        return vec
+
+
+def _cached_embedding(key: tuple) -> tuple | None:
+    """Memory LRU first, then the disk store (promoting hits into memory)."""
+    cached = _embedding_cache.get(key)
+    if cached is None and (store := _get_embedding_store()) is not None:
+        vec = store.get(store_key(*key))
+        if vec is not None:
+            cached = tuple(vec)
+            _embedding_cache.set(key, cached)
+    return cached
+
+
+def _remember_embedding(key: tuple, vec: list[float]) -> None:
+    _embedding_cache.set(key, tuple(vec))
+    if (store := _get_embedding_store()) is not None:
+        store.put(store_key(*key), vec)
+
+
+async def _embed_one(text: str, task_type: str) -> list[float]:
+    if EMBED_BATCH_WAIT_MS > 0:
+        return await _embed_batcher.submit((task_type, EMBEDDING_MODEL), text)
+    return await _embed_request(text, task_type, EMBEDDING_MODEL)
+
+
+async def _flush_embeds(key: tuple[str, str], texts: list[str]) -> list:
+    """Micro-batcher flush: one request for the window, or per-item if the
+    batch was rejected for its content."""
+    task_type, model = key
+    # The flush task inherited its first caller's context; the request serves
+    # every caller in the window, so don't charge retries to that one caller
+    detach()
+    if len(texts) == 1:
+        return [await _embed_request(texts[0], task_type, model)]
+    try:
+        return await _embed_many(texts, task_type, model)
+    except Exception as e:
+        # Throttling / outages (already retried by the governor) fail every
+        # caller: re-sending the window as N requests would only add load
+        if error_code(e) not in (400, 413):
+            raise
+        # Isolate the failure: one bad input must not fail its batch-mates
+        return await asyncio.gather(
+            *(_embed_request(text, task_type, model) for text in texts),
+            return_exceptions=True,
+        )
+
+
+_embed_batcher = MicroBatcher(
+    _flush_embeds,
+    max_items=min(EMBED_BATCH_MAX, EMBED_BATCH_LIMIT),
+    max_wait_s=EMBED_BATCH_WAIT_MS / 1000,
+)
+
+
+def embed_batcher_stats() -> dict:
+    return {"enabled": EMBED_BATCH_WAIT_MS > 0, **_embed_batcher.stats()}
+
+
+def reset_embed_batcher() -> None:
+    _embed_batcher.reset()
+
+
+async def _embed_request(text: str, task_type: str, model: str) -> list[float]:
     client = _get_client()
-    response = await client.aio.models.embed_content(
-        model=EMBEDDING_MODEL,
-        contents=text,
-        config=genai.types.EmbedContentConfig(
-            task_type=task_type,
-            output_dimensionality=768,
+    response = await _governed(
+        "embed",
+        _embed_priority(task_type),
+        lambda: client.aio.models.embed_content(
+            model=model,
+            contents=text,
+            config=genai.types.EmbedContentConfig(
+                task_type=task_type,
+                output_dimensionality=EMBEDDING_DIM,
+            ),
         ),
+        tokens=_estimate_tokens(text),
     )
     raw = response.embeddings[0].values
     # gemini-embedding-001 only pre-normalizes at 3072 dims
     # At 768 or 1536 dims, we must normalize manually
     return _l2_normalize(raw)
+
+
+async def embed_batch(
+    texts: list[str], task_type: str = "RETRIEVAL_DOCUMENT", site: str = "unlabeled"
+) -> list[list[float]]:
+    """Embed many texts; with Gemini, one embed_content request per
+    EMBED_BATCH_LIMIT misses.
+
+    Shares embed()'s cache; duplicate texts (after normalization) are sent once.
+    Results are in input order.
+    """
+    embedder = get_embedder()
+    with _telemetry.track(site, embedder.family, embedder.model) as record:
+        if not embedder.cacheable:
+            return await embedder.embed_many(texts, task_type)
+        return await _embed_batch_cached(embedder, texts, task_type, record)
+
+
+async def _embed_batch_cached(
+    embedder: Embedder, texts: list[str], task_type: str, record: CallRecord
+) -> list[list[float]]:
+    keys = [(normalize_text(t), task_type, embedder.model, EMBEDDING_DIM) for t in texts]
+    vectors: dict[tuple, tuple] = {}
+    missing: dict[tuple, str] = {}
+    for key, text in zip(keys, texts):
+        if key in vectors or key in missing:
+            continue
+        cached = _cached_embedding(key)
+        if cached is not None:
+            vectors[key] = cached
+        else:
+            missing[key] = text
+
+    record.cached = not missing
+    if missing:
+        record.prompt_tokens += round(_estimate_tokens(*missing.values()))
+        embedded = await embedder.embed_many(list(missing.values()), task_type)
+        for key, vec in zip(missing, embedded):
+            _remember_embedding(key, vec)
+            vectors[key] = tuple(vec)
+    return [list(vectors[key]) for key in keys]
+
+
+async def _embed_many(texts: list[str], task_type: str, model: str) -> list[list[float]]:
+    """One embed_content request for up to EMBED_BATCH_LIMIT texts, in order."""
+    client = _get_client()
+    response = await _governed(
+        "embed",
+        _embed_priority(task_type),
+        lambda: client.aio.models.embed_content(
+            model=model,
+            contents=texts,
+            config=genai.types.EmbedContentConfig(
+                task_type=task_type,
+                output_dimensionality=EMBEDDING_DIM,
+            ),
+        ),
+        tokens=_estimate_tokens(*texts),
+    )
+    return [_l2_normalize(embedding.values) for embedding in response.embeddings]
@@ -0,0 +1,166 @@
+"""Priority-aware dispatch of Gemini calls across the shared project quota.
+
+Every call takes a slot from one PriorityDispatcher before its model
+family's RateGovernor. Two classes compete for the slots:
+- "read": latency-critical search traffic (judge, query embeddings),
+- "write": background learning traffic (Pro extraction/refinement,
+  document embeddings).
+
+A share of the slots is reserved for reads, so writes can never fill the
+pool. When a slot frees up, queued reads go ahead of queued writes, split
+by class weight so writes still progress under sustained read load. The
+split is weighted fair queuing on a virtual clock: each dispatch advances
+its class's finish tag by 1/weight, the smallest next finish tag goes
+next, and a class that was idle restarts from the current virtual time —
+so past traffic is neither banked as credit nor held against a class.
+Queue depth and wait time are tracked per class.
+
+A slot covers one API request. Callers take it per attempt (see
+RateGovernor.run's `slot`), so token-bucket waits and retry backoff don't
+hold one.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+PRIORITIES = ("read", "write")
+
+
+def parse_weights(spec: str) -> dict[str, float]:
+    """Parse "read=8,write=1" into a weight per class (default 1)."""
+    weights = dict.fromkeys(PRIORITIES, 1.0)
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in weights:
+            raise ValueError(f"Unknown priority class '{name}' (expected one of {PRIORITIES})")
+        weights[name] = float(value)
+    return weights
+
+
+class PriorityDispatcher:
+    def __init__(
+        self,
+        max_concurrency: int = 0,
+        weights: dict[str, float] | None = None,
+        read_reserved_share: float = 0.25,
+    ):
+        self.max_concurrency = max_concurrency
+        self.weights = weights or dict.fromkeys(PRIORITIES, 1.0)
+        self.read_reserved_share = read_reserved_share
+        self.in_flight = dict.fromkeys(PRIORITIES, 0)
+        self._queues: dict[str, deque[asyncio.Future]] = {p: deque() for p in PRIORITIES}
+        self._served = dict.fromkeys(PRIORITIES, 0)
+        # Weighted fair queuing state: virtual time, and each class's last finish tag
+        self._vtime = 0.0
+        self._finish = dict.fromkeys(PRIORITIES, 0.0)
+        self._wait_s = dict.fromkeys(PRIORITIES, 0.0)
+        self._max_depth = dict.fromkeys(PRIORITIES, 0)
+
+    def _reserved(self) -> int:
+        # Always leave writes at least one slot
+        share = math.ceil(self.max_concurrency * self.read_reserved_share)
+        return min(share, self.max_concurrency - 1)
+
+    def _has_room(self, priority: str) -> bool:
+        if self.max_concurrency <= 0:
+            return True
+        total = sum(self.in_flight.values())
+        if priority == "write":
+            return total < self.max_concurrency - self._reserved()
+        return total < self.max_concurrency
+
+    def _next_class(self) -> str | None:
+        ready = [p for p in PRIORITIES if self._queues[p] and self._has_room(p)]
+        if not ready:
+            return None
+        return min(ready, key=lambda p: self._finish[p] + self._cost(p))
+
+    def _cost(self, priority: str) -> float:
+        return 1.0 / max(self.weights[priority], 1e-9)
+
+    def _grant(self, priority: str) -> None:
+        start = max(self._finish[priority], self._vtime)
+        self._finish[priority] = start + self._cost(priority)
+        self._vtime = start
+        self.in_flight[priority] += 1
+        self._served[priority] += 1
+
+    def _dispatch(self) -> None:
+        while (priority := self._next_class()) is not None:
+            waiter = self._queues[priority].popleft()
+            if waiter.done():  # cancelled while queued
+                continue
+            self._grant(priority)
+            waiter.set_result(None)
+
+    async def _acquire(self, priority: str) -> None:
+        if not any(self._queues.values()) and self._has_room(priority):
+            self._grant(priority)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._queues[priority]
+        if not queue:
+            # Newly backlogged: no credit or debt from before it went idle
+            self._finish[priority] = max(self._finish[priority], self._vtime)
+        queue.append(waiter)
+        self._max_depth[priority] = max(self._max_depth[priority], len(queue))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as we were cancelled — give it back
+                self._release(priority)
+            raise
+
+    def _release(self, priority: str) -> None:
+        self.in_flight[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str):
+        """Hold one slot of class `priority` for the enclosed request."""
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class '{priority}' (expected one of {PRIORITIES})")
+        start = time.monotonic()
+        await self._acquire(priority)
+        self._wait_s[priority] += time.monotonic() - start
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def run(self, priority: str, call: Callable[[], Awaitable[T]]) -> T:
+        async with self.slot(priority):
+            return await call()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "read_reserved": self._reserved() if self.max_concurrency > 0 else 0,
+            "weights": self.weights,
+            **{
+                p: {
+                    "in_flight": self.in_flight[p],
+                    "queue_depth": len(self._queues[p]),
+                    "max_queue_depth": self._max_depth[p],
+                    "dispatched": self._served[p],
+                    "avg_wait_ms": (
+                        self._wait_s[p] / self._served[p] * 1000 if self._served[p] else 0.0
+                    ),
+                }
+                for p in PRIORITIES
+            },
+        }
+
+    def reset(self) -> None:
+        self.__init__(self.max_concurrency, self.weights, self.read_reserved_share)
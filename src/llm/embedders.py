@@ -0,0 +1,83 @@
+"""Embedding backends behind client.embed() / client.embed_batch().
+
+EMBEDDING_BACKEND selects one:
+- "gemini" (default): gemini-embedding-001 via the governed, cached,
+  micro-batched request path in client.py (GeminiEmbedder).
+- "hashing": HashingEmbedder — a local CPU projection of word and
+  character n-grams into EMBEDDING_DIM buckets. No network, no quota,
+  deterministic across processes; for air-gapped installs, load tests and
+  dev boxes. Lexical similarity only, so it is no substitute for Gemini
+  on paraphrased queries, and vectors from the two backends must never
+  share an index (re-embed after switching).
+"""
+
+import math
+import re
+import zlib
+from abc import ABC, abstractmethod
+
+_WORD = re.compile(r"\w+")
+
+
+class Embedder(ABC):
+    # Identifies the vector space; part of every cache key
+    model: str
+    # Telemetry / pricing family (see telemetry.py)
+    family: str = "embed"
+    # Worth the embedding caches / disk store (False when recomputing is cheaper)
+    cacheable: bool = True
+
+    @abstractmethod
+    async def embed_one(self, text: str, task_type: str, hedge: bool = False) -> list[float]:
+        """One L2-normalized vector. hedge marks a latency-critical call."""
+
+    @abstractmethod
+    async def embed_many(self, texts: list[str], task_type: str) -> list[list[float]]:
+        """L2-normalized vectors in input order."""
+
+
+class HashingEmbedder(Embedder):
+    """Signed feature hashing of word 1-2-grams and char 3-5-grams.
+
+    Counts are dampened with log1p so long texts are not dominated by
+    repeated words, then the vector is L2-normalized — cosine similarity
+    then behaves like a TF-weighted n-gram overlap. task_type is ignored
+    (queries and documents share one space).
+    """
+
+    family = "local"
+    cacheable = False
+
+    def __init__(self, dim: int, char_ngrams: tuple[int, int] = (3, 5)):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.model = f"hashing-ngram-{char_ngrams[0]}-{char_ngrams[1]}"
+
+    def _features(self, text: str) -> list[str]:
+        words = _WORD.findall(text.lower())
+        features = [f"w:{w}" for w in words]
+        features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        lo, hi = self.char_ngrams
+        for word in words:
+            padded = f" {word} "
+            for n in range(lo, hi + 1):
+                features += [padded[i:i + n] for i in range(len(padded) - n + 1)]
+        return features
+
+    def vector(self, text: str) -> list[float]:
+        # Pure Python on purpose: the local backend must work on the default
+        # install, which has no numpy
+        counts = [0.0] * self.dim
+        for feature in self._features(text):
+            h = zlib.crc32(feature.encode())
+            # Low bits pick the bucket, bit 31 the sign (keeps collisions unbiased)
+            counts[h % self.dim] += -1.0 if h & (1 << 31) else 1.0
+        vec = [math.copysign(math.log1p(abs(c)), c) if c else 0.0 for c in counts]
+        norm = math.sqrt(sum(x * x for x in vec))
+        return [x / norm for x in vec] if norm else vec
+
+    async def embed_one(self, text: str, task_type: str, hedge: bool = False) -> list[float]:
+        return self.vector(text)
+
+    async def embed_many(self, texts: list[str], task_type: str) -> list[list[float]]:
+        return [self.vector(text) for text in texts]
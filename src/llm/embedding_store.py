@@ -0,0 +1,116 @@
+"""Persistent content-addressed embedding store — one SQLite file on local disk.
+
+Rows are keyed by sha256 of (normalized text, task_type, model, dim) and
+hold the vector as packed float32, so a 768-dim embedding costs ~3 KB.
+The database runs in WAL mode: any number of processes (server workers,
+the eval harness) can read while one writes. When the stored vectors
+exceed max_bytes, the least recently used tenth is evicted.
+
+Calls are synchronous — single-row lookups on local disk, well under a
+millisecond, which is noise next to an embed_content round trip.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from array import array
+from pathlib import Path
+
+# Don't rewrite a row's access time on every hit; readers stay read-only
+_TOUCH_INTERVAL_S = 60.0
+
+
+def store_key(text: str, task_type: str, model: str, dim: int) -> str:
+    payload = json.dumps([text, task_type, model, dim], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class EmbeddingStore:
+    def __init__(self, path: str | Path, max_bytes: int = 256 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vec BLOB NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings (accessed)")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Running total of stored vector bytes, re-read from disk on eviction
+        # (other processes may write to the same file)
+        self._size = self.size_bytes()
+
+    def get(self, key: str) -> list[float] | None:
+        row = self._conn.execute(
+            "SELECT vec, accessed FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        now = time.time()
+        if now - row[1] > _TOUCH_INTERVAL_S:
+            self._conn.execute("UPDATE embeddings SET accessed = ? WHERE key = ?", (now, key))
+        return array("f", row[0]).tolist()
+
+    def put(self, key: str, vec: list[float]) -> None:
+        blob = array("f", vec).tobytes()
+        old = self._conn.execute(
+            "SELECT LENGTH(vec) FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO embeddings (key, vec, accessed) VALUES (?, ?, ?)",
+            (key, blob, time.time()),
+        )
+        self._size += len(blob) - (old[0] if old else 0)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def size_bytes(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    def _evict(self) -> None:
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        n = max(1, count // 10)
+        self._conn.execute(
+            """
+            DELETE FROM embeddings WHERE key IN (
+                SELECT key FROM embeddings ORDER BY accessed LIMIT ?
+            )
+            """,
+            (n,),
+        )
+        self.evictions += n
+        self._size = self.size_bytes()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": len(self),
+            "size_bytes": self.size_bytes(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
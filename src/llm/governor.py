@@ -0,0 +1,192 @@
+"""Rate governor for Gemini calls — one per model family (flash, pro, embed).
+
+Each governor combines:
+- an adaptive concurrency limit (AIMD: +1/limit per success, halved on a
+  429/503, never above max_concurrency or below 1),
+- token buckets for requests/min and (estimated) tokens/min,
+- retries with full-jitter exponential backoff on 429/500/503/504.
+
+Limits of 0 mean unlimited. Not thread-safe — one asyncio event loop.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+RETRYABLE_CODES = frozenset({429, 500, 503, 504})
+THROTTLE_CODES = frozenset({429, 503})
+
+
+def error_code(exc: BaseException) -> int | None:
+    """HTTP status of a google-genai APIError (or anything with .code/.status_code)."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+class TokenBucket:
+    """Refills continuously at rate_per_min up to one minute's worth."""
+
+    def __init__(self, rate_per_min: float):
+        self.rate_per_min = rate_per_min
+        self.capacity = rate_per_min
+        self._level = rate_per_min
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(
+            self.capacity, self._level + (now - self._updated) * self.rate_per_min / 60
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Take `amount`, sleeping until it is available. Returns seconds waited."""
+        if self.rate_per_min <= 0:
+            return 0.0
+        # A request larger than the bucket would never fit — let it drain the bucket
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            self._refill()
+            if self._level >= amount:
+                self._level -= amount
+                return waited
+            delay = (amount - self._level) * 60 / self.rate_per_min
+            await asyncio.sleep(delay)
+            waited += delay
+
+    @property
+    def level(self) -> float:
+        self._refill()
+        return self._level
+
+
+class RateGovernor:
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 0,
+        rpm: float = 0,
+        tpm: float = 0,
+        max_retries: int = 3,
+        retry_base_s: float = 0.2,
+        retry_max_s: float = 5.0,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._waiters: list[asyncio.Future] = []
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_retries = max_retries
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self.wait_s = 0.0
+
+    async def _acquire_slot(self) -> None:
+        while self.max_concurrency > 0 and self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        # Wake everyone; losers of the race re-check the limit and wait again
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _on_success(self) -> None:
+        if self.max_concurrency > 0:
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def _on_throttle(self) -> None:
+        self.throttled += 1
+        if self.max_concurrency > 0:
+            self.limit = max(1.0, self.limit / 2)
+
+    def backoff_s(self, attempt: int) -> float:
+        return random.uniform(0, min(self.retry_max_s, self.retry_base_s * 2 ** attempt))
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        tokens: float = 0,
+        slot: Callable[[], AbstractAsyncContextManager] | None = None,
+    ) -> T:
+        """Await call() under this governor's limits, retrying transient errors.
+
+        `slot` (e.g. a PriorityDispatcher slot) is entered per attempt, after
+        the token buckets and before the concurrency slot, so neither bucket
+        waits nor retry backoff hold it.
+        """
+        self.calls += 1
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            await self.requests.acquire(1)
+            await self.tokens.acquire(tokens)
+            async with slot() if slot is not None else nullcontext():
+                await self._acquire_slot()
+                try:
+                    self.wait_s += time.monotonic() - start
+                    try:
+                        result = await call()
+                    except Exception as e:
+                        code = error_code(e)
+                        if code in THROTTLE_CODES:
+                            self._on_throttle()
+                        if code not in RETRYABLE_CODES or attempt >= self.max_retries:
+                            self.failures += 1
+                            raise
+                    else:
+                        self._on_success()
+                        return result
+                finally:
+                    self._release_slot()
+            await asyncio.sleep(self.backoff_s(attempt))
+            attempt += 1
+            self.retries += 1
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "concurrency_limit": self.limit,
+            "in_flight": self.in_flight,
+            "rpm": self.requests.rate_per_min,
+            "rpm_available": self.requests.level if self.requests.rate_per_min > 0 else None,
+            "tpm": self.tokens.rate_per_min,
+            "tpm_available": self.tokens.level if self.tokens.rate_per_min > 0 else None,
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "avg_wait_ms": self.wait_s / self.calls * 1000 if self.calls else 0.0,
+        }
+
+    def reset(self) -> None:
+        """Restore full limits and zero the counters."""
+        self.__init__(
+            self.name,
+            self.max_concurrency,
+            self.requests.rate_per_min,
+            self.tokens.rate_per_min,
+            self.max_retries,
+            self.retry_base_s,
+            self.retry_max_s,
+        )
@@ -0,0 +1,108 @@
+"""Request hedging for idempotent, latency-critical Gemini calls.
+
+A Hedger tracks the latency of recent calls through it. Once it has enough
+samples, a call still pending at the configured percentile of that latency
+gets a duplicate request, and whichever answers first wins; the loser is
+cancelled. Duplicates are capped at a fraction of recent calls so a
+slowdown across the board cannot double the request rate.
+
+Only wrap calls that are safe to issue twice (the Flash judge, query
+embeddings) — never Pro extraction.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class Hedger:
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_extra_rate: float = 0.05,
+        min_samples: int = 20,
+        window: int = 500,
+    ):
+        self.percentile = percentile
+        self.max_extra_rate = max_extra_rate
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._recent_hedged: deque[bool] = deque(maxlen=window)
+        self._recent_hedge_count = 0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay_s(self) -> float | None:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        rank = math.ceil(self.percentile / 100 * len(ordered)) - 1
+        return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+    def _note_call(self, hedged: bool) -> None:
+        if len(self._recent_hedged) == self._recent_hedged.maxlen and self._recent_hedged[0]:
+            self._recent_hedge_count -= 1
+        self._recent_hedged.append(hedged)
+        self._recent_hedge_count += hedged
+
+    def _within_budget(self) -> bool:
+        window = max(len(self._recent_hedged), 1)
+        return (self._recent_hedge_count + 1) / window <= self.max_extra_rate
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Await call(), issuing one duplicate if it runs past the hedge delay."""
+        self.calls += 1
+        start = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        delay = self.delay_s()
+        tasks = {primary}
+        hedge = None
+        try:
+            if delay is not None and self._within_budget():
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    hedge = asyncio.ensure_future(call())
+                    tasks.add(hedge)
+                    self.hedged += 1
+            self._note_call(hedge is not None)
+
+            error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._latencies.append(time.monotonic() - start)
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        delay = self.delay_s()
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedged / self.calls if self.calls else 0.0,
+            "win_rate": self.hedge_wins / self.hedged if self.hedged else 0.0,
+            "delay_ms": delay * 1000 if delay is not None else None,
+        }
+
+    def reset(self) -> None:
+        self._latencies.clear()
+        self._recent_hedged.clear()
+        self._recent_hedge_count = 0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
@@ -0,0 +1,76 @@
+"""Incremental parser for a streamed top-level JSON object.
+
+Feed it text chunks as they arrive; each top-level member is decoded and
+handed to `on_field(name, value)` as soon as its value is complete (the
+scanner sees the ',' or '}' that ends it), not when the whole object is.
+Only string/bracket nesting is tracked while scanning — each finished
+member goes through json.loads, so values are exactly what a full parse
+would produce.
+"""
+
+import json
+from typing import Any, Callable
+
+FieldCallback = Callable[[str, Any], None]
+
+
+class StreamingJSONObjectParser:
+    def __init__(self, on_field: FieldCallback | None = None):
+        self.on_field = on_field
+        self.result: dict[str, Any] = {}
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member: list[str] = []
+        self.done = False
+
+    def feed(self, chunk: str) -> None:
+        for ch in chunk:
+            if self.done:
+                if not ch.isspace():
+                    raise ValueError("Unexpected data after the top-level JSON object")
+                continue
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                elif not ch.isspace():
+                    raise ValueError(f"Expected a JSON object, got {ch!r}")
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_member()
+                    self.done = True
+                    continue
+            elif ch == "," and self._depth == 1:
+                self._finish_member()
+                continue
+            self._member.append(ch)
+
+    def _finish_member(self) -> None:
+        text = "".join(self._member).strip()
+        self._member = []
+        if not text:
+            return
+        (name, value), = json.loads("{" + text + "}").items()
+        self.result[name] = value
+        if self.on_field is not None:
+            self.on_field(name, value)
+
+    def close(self) -> dict[str, Any]:
+        """The parsed object; raises ValueError if the stream ended early."""
+        if not self.done:
+            raise ValueError("JSON stream ended before the top-level object closed")
+        return self.result
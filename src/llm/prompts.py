@@ -3,14 +3,14 @@ You are an expert at extracting reusable customer-service playbooks from convers
 
 Given the conversation below, extract a structured skill document that an AI agent can follow to resolve similar issues in the future. The playbook should use the Do/Check/Say pattern for each step.
 
-Return JSON with exactly these fields:
+Return JSON with exactly these fields, in this order:
 - title: short descriptive title (e.g. "Password Reset for Standard Users")
 - problem: one-paragraph description of the customer's issue
-- resolution: full markdown playbook using the format below
 - conditions: list of strings — when does this skill apply?
 - keywords: list of keyword tags for search
 - product_area: string (e.g. "billing", "authentication", "onboarding")
 - issue_type: string (e.g. "how-to", "bug", "feature-request", "escalation")
+- resolution: full markdown playbook using the format below
 
 The resolution markdown MUST follow this structure:
 
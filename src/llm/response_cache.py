@@ -0,0 +1,140 @@
+"""Content-addressed cache of Gemini Pro JSON responses.
+
+Keyed by sha256 of (model, prompt, temperature): a byte-identical
+extraction or refinement prompt is answered without a 10-30 s Pro call.
+Two tiers — an in-process LRU and an optional SQLite file (WAL, like the
+embedding store) that survives restarts and is shared by the server and the
+eval harness. Both tiers honour the TTL; the disk tier evicts least
+recently used rows past max_bytes.
+
+Caching is opt-in per call site (call_pro_json(cache=True)): only callers
+that are happy to get the same answer for the same prompt should use it.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from src.utils.cache import LRUCache
+
+
+def response_key(model: str, prompt: str, temperature: float) -> str:
+    payload = json.dumps([model, prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DiskResponseStore:
+    def __init__(self, path: str | Path, ttl_s: float = 0.0, max_bytes: int = 64 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        # Running total of stored body length, re-read from disk on eviction
+        # (other processes may write to the same file)
+        self._size = self.size_bytes()
+
+    def get(self, key: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT body, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if self.ttl_s > 0 and now - row[1] > self.ttl_s:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= len(row[0])
+            return None
+        self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, body: str) -> None:
+        now = time.time()
+        old = self._conn.execute(
+            "SELECT LENGTH(body) FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, created, accessed) VALUES (?, ?, ?, ?)",
+            (key, body, now, now),
+        )
+        self._size += len(body) - (old[0] if old else 0)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def size_bytes(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(body)), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _evict(self) -> None:
+        if self.ttl_s > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_s,)
+            )
+        self._size = self.size_bytes()
+        while self._size > self.max_bytes:
+            self._conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed
+                    LIMIT MAX(1, (SELECT COUNT(*) FROM responses) / 10)
+                )
+                """
+            )
+            self._size = self.size_bytes()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache:
+    """Memory tier in front of an optional disk tier; values are parsed JSON."""
+
+    def __init__(self, maxsize: int, ttl_s: float, disk: DiskResponseStore | None = None):
+        self.memory = LRUCache(maxsize=maxsize, ttl_s=ttl_s)
+        self.disk = disk
+        self.disk_hits = 0
+
+    def get(self, key: str) -> dict | None:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            body = self.disk.get(key)
+            if body is not None:
+                self.disk_hits += 1
+                value = json.loads(body)
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.put(key, json.dumps(value))
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk_hits = 0
+
+    def stats(self) -> dict:
+        return {
+            **self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "disk_entries": len(self.disk) if self.disk is not None else None,
+        }
@@ -0,0 +1,145 @@
+"""Per-call-site instrumentation of Gemini calls.
+
+call_flash / call_pro_json / embed / embed_batch each record one CallRecord
+per logical call, labelled with the caller's site ("search.judge",
+"create.extract", ...):
+- wall time, including cache lookups, queueing, retries and hedges,
+- retries (governor re-attempts across all requests made for the call),
+- prompt / output tokens from usage_metadata (thinking tokens count as
+  output; embeddings have no usage_metadata and use the chars/4 estimate),
+- estimated cost from the per-family prices in config.
+
+The active record travels in a ContextVar, so the request path
+(client._governed, the response handlers) can add to it without threading
+it through every signature. Aggregates are in-process: a fixed-bucket
+latency histogram and counters per (site, family). snapshot() is what
+/stats and the eval harness read.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from src.utils.histogram import Histogram
+
+# Latency bucket upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+@dataclass
+class CallRecord:
+    site: str
+    family: str
+    model: str
+    requests: int = 0
+    attempts: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cached: bool = False
+
+    def add_usage(self, usage) -> None:
+        """Add a google-genai usage_metadata (None-safe, fields may be None)."""
+        if usage is None:
+            return
+        self.prompt_tokens += getattr(usage, "prompt_token_count", None) or 0
+        self.output_tokens += (getattr(usage, "candidates_token_count", None) or 0) + (
+            getattr(usage, "thoughts_token_count", None) or 0
+        )
+
+
+_current: ContextVar[CallRecord | None] = ContextVar("llm_call_record", default=None)
+
+
+def current_call() -> CallRecord | None:
+    return _current.get()
+
+
+def detach() -> None:
+    """Stop attributing to the current record in this context (shared work,
+    e.g. a micro-batch flush serving several callers)."""
+    _current.set(None)
+
+
+class _SiteStats:
+    def __init__(self):
+        self.latency_ms = Histogram(BUCKETS_MS)
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.requests = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "requests": self.requests,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_ms": self.latency_ms.snapshot(),
+        }
+
+
+class Telemetry:
+    def __init__(self, prices: dict[str, tuple[float, float]] | None = None):
+        # family -> (USD per 1M prompt tokens, USD per 1M output tokens)
+        self.prices = prices or {}
+        self._sites: dict[tuple[str, str], _SiteStats] = {}
+
+    def cost(self, record: CallRecord) -> float:
+        price_in, price_out = self.prices.get(record.family, (0.0, 0.0))
+        return (record.prompt_tokens * price_in + record.output_tokens * price_out) / 1e6
+
+    @contextmanager
+    def track(self, site: str, family: str, model: str):
+        """Time the enclosed call and record it under (site, family)."""
+        record = CallRecord(site, family, model)
+        token = _current.set(record)
+        start = time.monotonic()
+        failed = False
+        try:
+            yield record
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            _current.reset(token)
+            self._record(record, (time.monotonic() - start) * 1000, failed)
+
+    def _record(self, record: CallRecord, wall_ms: float, failed: bool) -> None:
+        stats = self._sites.setdefault((record.site, record.family), _SiteStats())
+        stats.latency_ms.observe(wall_ms)
+        stats.calls += 1
+        stats.errors += failed
+        stats.cache_hits += record.cached
+        stats.requests += record.requests
+        stats.retries += max(0, record.attempts - record.requests)
+        stats.prompt_tokens += record.prompt_tokens
+        stats.output_tokens += record.output_tokens
+        stats.cost_usd += self.cost(record)
+
+    def snapshot(self) -> dict:
+        sites = {
+            f"{site}:{family}": stats.snapshot()
+            for (site, family), stats in sorted(self._sites.items())
+        }
+        return {
+            "sites": sites,
+            "total": {
+                key: sum(s[key] for s in sites.values())
+                for key in (
+                    "calls", "errors", "cache_hits", "requests", "retries",
+                    "prompt_tokens", "output_tokens", "cost_usd",
+                )
+            },
+        }
+
+    def reset(self) -> None:
+        self._sites.clear()
@@ -1,8 +1,59 @@
+import asyncio
+
 from src.db import queries as db
-from src.llm.client import call_pro_json, embed
+from src.llm.client import call_pro_json, call_pro_json_stream, embed
 from src.llm.prompts import EXTRACTION_PROMPT
 from src.server.models import CreateResponse
 from src.skills.models import Skill
+from src.utils.config import PRO_CACHE_EXTRACTION, PRO_STREAM_EXTRACTION
+
+# Extracted fields the dedup embedding is built from
+EMBED_FIELDS = ("problem", "conditions", "keywords")
+
+
+def _embed_text(extracted: dict) -> str:
+    return " ".join([
+        extracted["problem"],
+        " ".join(extracted.get("conditions", [])),
+        " ".join(extracted.get("keywords", [])),
+    ])
+
+
+async def _embed_and_check(embed_text: str):
+    embedding = await embed(embed_text, site="create.embed")
+    return embedding, await db.check_duplicate(embedding, threshold=0.95)
+
+
+async def _extract_streaming(prompt: str):
+    """Stream the extraction; embed + check_duplicate start as soon as
+    EMBED_FIELDS are in, while the resolution is still generating.
+
+    Returns (extracted, embedding, duplicate); extracted is None when a
+    duplicate was found early and the rest of the stream was cancelled.
+    """
+    fields: dict = {}
+    ready = asyncio.get_running_loop().create_future()
+
+    def on_field(name, value):
+        fields[name] = value
+        if not ready.done() and all(f in fields for f in EMBED_FIELDS):
+            ready.set_result(_embed_text(fields))
+
+    stream = asyncio.create_task(call_pro_json_stream(
+        prompt, on_field, cache=PRO_CACHE_EXTRACTION, site="create.extract"
+    ))
+    try:
+        await asyncio.wait({stream, ready}, return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            # Stream ended (or failed) before all EMBED_FIELDS showed up
+            extracted = await stream
+            return extracted, *await _embed_and_check(_embed_text(extracted))
+        embedding, duplicate = await _embed_and_check(ready.result())
+        if duplicate is not None:
+            return None, embedding, duplicate
+        return await stream, embedding, None
+    finally:
+        stream.cancel()
 
 
 async def create_skill_orchestration(
@@ -13,16 +64,12 @@ async def create_skill_orchestration(
     metadata = metadata or {}
 
     prompt = EXTRACTION_PROMPT.format(conversation=conversation)
-    extracted = await call_pro_json(prompt)
-
-    embed_text = " ".join([
-        extracted["problem"],
-        " ".join(extracted.get("conditions", [])),
-        " ".join(extracted.get("keywords", [])),
-    ])
-    embedding = await embed(embed_text)
+    if PRO_STREAM_EXTRACTION:
+        extracted, embedding, duplicate = await _extract_streaming(prompt)
+    else:
+        extracted = await call_pro_json(prompt, cache=PRO_CACHE_EXTRACTION, site="create.extract")
+        embedding, duplicate = await _embed_and_check(_embed_text(extracted))
 
-    duplicate = await db.check_duplicate(embedding, threshold=0.95)
     if duplicate is not None:
         return CreateResponse(
             skill_id=duplicate.skill_id,
@@ -0,0 +1,236 @@
+"""Judge-skip policy — accept the top hybrid candidate without calling Flash.
+
+The policy is a logistic model over four score features of the candidate
+list, with a probability threshold fitted offline (see
+scripts/calibrate_judge_skip.py) from logged judge decisions so that the
+false-accept rate on the log stays under a target. top_score and gap mean
+different things under linear and RRF fusion, so a calibration only applies
+to the SEARCH_FUSION / SEARCH_TOP_K it was fitted under. Without a matching
+calibration file (or with one that can't be read) the policy never skips.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from src.utils.config import SEARCH_FUSION, SEARCH_TOP_K
+
+logger = logging.getLogger(__name__)
+
+FEATURES = ("top_score", "gap", "agreement", "confidence")
+
+
+def extract_features(candidates: list[dict]) -> dict[str, float]:
+    """Score features of a ranked hybrid_search result list (best first)."""
+    top = candidates[0]
+    second_score = candidates[1]["score"] if len(candidates) > 1 else 0.0
+
+    # 1.0 when the fused winner is also the best candidate on each signal alone
+    top_vec = top.get("vector_score", top["score"])
+    top_kw = top.get("keyword_score", 0.0)
+    best_vec = max(c.get("vector_score", c["score"]) for c in candidates)
+    best_kw = max(c.get("keyword_score", 0.0) for c in candidates)
+    agreement = 1.0 if top_vec >= best_vec and top_kw >= best_kw and top_kw > 0 else 0.0
+
+    return {
+        "top_score": top["score"],
+        "gap": top["score"] - second_score,
+        "agreement": agreement,
+        "confidence": top["skill"].confidence,
+    }
+
+
+def _sigmoid(z: float) -> float:
+    if z < -60:
+        return 0.0
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+@dataclass
+class JudgeSkipPolicy:
+    weights: dict[str, float] = field(default_factory=dict)
+    bias: float = 0.0
+    threshold: float = 1.1  # > 1.0 means "never skip"
+    target_false_accept_rate: float = 0.0
+    expected_false_accept_rate: float = 0.0
+    expected_skip_rate: float = 0.0
+    samples: int = 0
+    # Search settings the decisions were logged under ("" / 0 = unknown)
+    search_fusion: str = ""
+    search_top_k: int = 0
+
+    def probability(self, features: dict[str, float]) -> float:
+        z = self.bias + sum(self.weights.get(f, 0.0) * features[f] for f in FEATURES)
+        return _sigmoid(z)
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold <= 1.0
+
+    def should_skip(self, features: dict[str, float]) -> bool:
+        return self.probability(features) >= self.threshold
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(asdict(self), indent=2))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "JudgeSkipPolicy":
+        return cls(**json.loads(Path(path).read_text()))
+
+
+def load_policy(
+    path: str | Path, search_fusion: str = SEARCH_FUSION, search_top_k: int = SEARCH_TOP_K
+) -> JudgeSkipPolicy:
+    """The calibrated policy at `path`, or a never-skip policy (with a
+    warning) if it is missing, malformed or fitted under other search
+    settings — a bad file must not stop search."""
+    try:
+        policy = JudgeSkipPolicy.load(path)
+    except (OSError, ValueError, TypeError):
+        logger.warning(
+            "Could not load judge-skip calibration %s; judge skipping disabled", path, exc_info=True
+        )
+        return JudgeSkipPolicy()
+    if (policy.search_fusion, policy.search_top_k) != (search_fusion, search_top_k):
+        logger.warning(
+            "Judge-skip calibration %s was fitted with SEARCH_FUSION=%r, SEARCH_TOP_K=%r "
+            "but search runs with %r, %r; judge skipping disabled",
+            path, policy.search_fusion, policy.search_top_k, search_fusion, search_top_k,
+        )
+        return JudgeSkipPolicy()
+    return policy
+
+
+def fit_policy(
+    records: list[dict],
+    target_false_accept_rate: float = 0.02,
+    min_accepts: int = 20,
+    epochs: int = 500,
+    learning_rate: float = 0.5,
+) -> JudgeSkipPolicy:
+    """Fit a skip policy from logged judge decisions.
+
+    Each record needs `features` (see extract_features) and `accepted_top`
+    (True when the judge picked the top-ranked candidate). The threshold is
+    the lowest predicted probability at which the accepted set still has a
+    false-accept rate <= target and at least `min_accepts` members. All
+    records must share one `search_fusion` / `search_top_k`, which the
+    policy records.
+    """
+    if not records:
+        return JudgeSkipPolicy(target_false_accept_rate=target_false_accept_rate)
+
+    settings = {(r.get("search_fusion", ""), r.get("search_top_k", 0)) for r in records}
+    if len(settings) > 1:
+        raise ValueError(
+            f"Decision log mixes search settings {sorted(settings)}; "
+            "calibrate on decisions from one SEARCH_FUSION / SEARCH_TOP_K"
+        )
+    search_fusion, search_top_k = settings.pop()
+
+    xs = [[r["features"][f] for f in FEATURES] for r in records]
+    ys = [1.0 if r["accepted_top"] else 0.0 for r in records]
+    n = len(records)
+
+    # Plain batch gradient descent on log-loss — a handful of features, offline only
+    w = [0.0] * len(FEATURES)
+    b = 0.0
+    for _ in range(epochs):
+        grad_w = [0.0] * len(FEATURES)
+        grad_b = 0.0
+        for x, y in zip(xs, ys):
+            p = _sigmoid(b + sum(wi * xi for wi, xi in zip(w, x)))
+            err = p - y
+            grad_b += err
+            for i, xi in enumerate(x):
+                grad_w[i] += err * xi
+        b -= learning_rate * grad_b / n
+        w = [wi - learning_rate * gi / n for wi, gi in zip(w, grad_w)]
+
+    policy = JudgeSkipPolicy(
+        weights=dict(zip(FEATURES, w)),
+        bias=b,
+        target_false_accept_rate=target_false_accept_rate,
+        samples=n,
+        search_fusion=search_fusion,
+        search_top_k=search_top_k,
+    )
+
+    scored = sorted(
+        ((policy.probability(r["features"]), y) for r, y in zip(records, ys)),
+        reverse=True,
+    )
+    false_accepts = 0
+    for i, (p, y) in enumerate(scored):
+        false_accepts += 1 - int(y)
+        # Only cut between distinct probabilities — ties are all-in or all-out
+        if i + 1 < n and scored[i + 1][0] == p:
+            continue
+        accepted = i + 1
+        rate = false_accepts / accepted
+        if accepted >= min_accepts and rate <= target_false_accept_rate:
+            policy.threshold = p
+            policy.expected_false_accept_rate = rate
+            policy.expected_skip_rate = accepted / n
+
+    return policy
+
+
+def load_decision_log(path: str | Path) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _decision_record(query: str, candidates: list[dict], chosen_id: str) -> dict:
+    return {
+        "ts": time.time(),
+        "query": query,
+        "top_skill_id": candidates[0]["skill"].skill_id,
+        "chosen_skill_id": chosen_id,
+        "accepted_top": chosen_id == candidates[0]["skill"].skill_id,
+        "features": extract_features(candidates),
+        "search_fusion": SEARCH_FUSION,
+        "search_top_k": SEARCH_TOP_K,
+    }
+
+
+def _append_records(path: str | Path, records: list[dict]) -> None:
+    with open(path, "a") as f:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+
+
+def log_decision(path: str | Path, query: str, candidates: list[dict], chosen_id: str) -> None:
+    """Append one judge decision as a calibration record (JSON lines)."""
+    _append_records(path, [_decision_record(query, candidates, chosen_id)])
+
+
+class DecisionLog:
+    """Buffered, in-order decision log for the event loop: append() only
+    queues the record; one writer task drains the buffer in a worker thread."""
+
+    def __init__(self, path: str | Path):
+        self.path = path
+        self._buffer: list[dict] = []
+        self._writer: asyncio.Task | None = None
+
+    def append(self, query: str, candidates: list[dict], chosen_id: str) -> None:
+        self._buffer.append(_decision_record(query, candidates, chosen_id))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._drain())
+
+    async def _drain(self) -> None:
+        while self._buffer:
+            records, self._buffer = self._buffer, []
+            try:
+                await asyncio.to_thread(_append_records, self.path, records)
+            except OSError:
+                logger.warning("Dropped %d judge decision records", len(records), exc_info=True)
+
+    async def flush(self) -> None:
+        """Wait until every appended record is written."""
+        if self._writer is not None:
+            await self._writer
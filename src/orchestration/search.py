@@ -1,10 +1,43 @@
+import asyncio
 import json
+import logging
 import re
 import time
 
 from src.db import queries as db
-from src.llm.client import call_flash, embed
-from src.server.models import SearchResponse, SkillMatch
+from src.llm.client import call_flash, embed, embed_batch
+from src.orchestration.judge_policy import (
+    DecisionLog,
+    JudgeSkipPolicy,
+    extract_features,
+    load_policy,
+)
+from src.server.models import BatchSearchResponse, SearchResponse, SkillMatch
+from src.skills.models import Skill, SkillCard
+from src.utils.cache import LRUCache, normalize_text
+from src.utils.config import (
+    JUDGE_BATCH_CONCURRENCY,
+    JUDGE_BATCH_SIZE,
+    JUDGE_CACHE_SIZE,
+    JUDGE_CACHE_TTL_S,
+    JUDGE_DECISION_LOG,
+    JUDGE_SKIP_CALIBRATION,
+    SEARCH_DEADLINE_MS,
+    SEARCH_EMBED_BUDGET_SHARE,
+    SEARCH_FUSION,
+    SEARCH_TOP_K,
+)
+
+logger = logging.getLogger(__name__)
+
+# Caches the judge's raw decision, including "none". update_skill bumps
+# version, so an edited candidate changes the key and misses naturally.
+_judge_cache = LRUCache(maxsize=JUDGE_CACHE_SIZE, ttl_s=JUDGE_CACHE_TTL_S)
+
+# Loaded on first use, so a bad calibration file can't break the import
+_skip_policy: JudgeSkipPolicy | None = None
+_judge_counts = {"called": 0, "skipped": 0}
+_decision_log: DecisionLog | None = None
 
 JUDGE_PROMPT = """\
 You are a routing judge for a customer support system. Given a customer query and a list of candidate skill playbooks, decide which ONE skill best matches the query — or return "none" if no skill is a good fit.
@@ -27,6 +60,24 @@ Return JSON with exactly one field:
 Return ONLY valid JSON, no markdown fences.
 """
 
+BATCH_JUDGE_PROMPT = """\
+You are a routing judge for a customer support system. Below are several independent customer queries, each with its own list of candidate skill playbooks. For EACH query, decide which ONE of its candidates best matches — or return "none" if no candidate is a good fit.
+
+{items}
+
+Rules:
+- Judge each query on its own. Only choose among that query's candidates.
+- Pick the single best match per query. Do not pick multiple.
+- A skill is a match if it addresses the customer's core issue AND the conditions are compatible.
+- If no skill is a good fit, return "none". Do not force a match.
+- Consider the confidence score — a skill with very low confidence (<0.3) should be treated skeptically.
+
+Return JSON with exactly one field, mapping every query id to its decision:
+{{"decisions": {{"<query id>": "<the chosen skill_id, or \\"none\\">"}}}}
+
+Return ONLY valid JSON, no markdown fences.
+"""
+
 
 def _format_candidates(candidates: list[dict]) -> str:
     lines = []
@@ -42,29 +93,239 @@ def _format_candidates(candidates: list[dict]) -> str:
     return "\n".join(lines)
 
 
-async def search_skills_orchestration(query: str) -> SearchResponse:
-    start = time.monotonic()
+def _judge_cache_key(query: str, candidates: list[dict]) -> tuple:
+    return (
+        normalize_text(query),
+        tuple((c["skill"].skill_id, c["skill"].version) for c in candidates),
+    )
 
-    query_embedding = await embed(query, task_type="RETRIEVAL_QUERY")
-    candidates = await db.hybrid_search(query_embedding, query, top_k=5)
 
-    if not candidates:
-        elapsed = (time.monotonic() - start) * 1000
-        return SearchResponse(skill=None, query=query, search_time_ms=elapsed)
+def judge_cache_stats() -> dict:
+    return _judge_cache.stats()
+
+
+def clear_judge_cache() -> None:
+    _judge_cache.clear()
+
+
+def _get_skip_policy() -> JudgeSkipPolicy:
+    global _skip_policy
+    if _skip_policy is None:
+        _skip_policy = (
+            load_policy(JUDGE_SKIP_CALIBRATION, SEARCH_FUSION, SEARCH_TOP_K)
+            if JUDGE_SKIP_CALIBRATION
+            else JudgeSkipPolicy()
+        )
+    return _skip_policy
+
+
+def _should_skip_judge(candidates: list[dict]) -> bool:
+    policy = _get_skip_policy()
+    return policy.enabled and policy.should_skip(extract_features(candidates))
+
+
+def judge_skip_stats() -> dict:
+    decided = _judge_counts["called"] + _judge_counts["skipped"]
+    return {
+        "enabled": _get_skip_policy().enabled,
+        "judge_called": _judge_counts["called"],
+        "judge_skipped": _judge_counts["skipped"],
+        "skip_rate": _judge_counts["skipped"] / decided if decided else 0.0,
+    }
+
+
+def reset_judge_skip_stats() -> None:
+    _judge_counts.update(called=0, skipped=0)
+
+
+async def flush_decision_log() -> None:
+    """Wait for queued JUDGE_DECISION_LOG writes (shutdown, tests)."""
+    if _decision_log is not None:
+        await _decision_log.flush()
+
+
+async def _judge(query: str, candidates: list[dict]) -> str:
+    """Return the judge's chosen skill_id (or "none"), served from cache when possible."""
+    key = _judge_cache_key(query, candidates)
+    cached = _judge_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if _should_skip_judge(candidates):
+        _judge_counts["skipped"] += 1
+        return candidates[0]["skill"].skill_id
 
     formatted = _format_candidates(candidates)
     judge_prompt = JUDGE_PROMPT.format(query=query, candidates=formatted)
-    judge_response = await call_flash(judge_prompt)
+    result = _parse_judge_json(await call_flash(judge_prompt, hedge=True, site="search.judge"))
+
+    chosen_id = result.get("skill_id", "none")
+    _record_decision(query, candidates, chosen_id)
+    return chosen_id
+
+
+def _parse_judge_json(response: str) -> dict:
     # Strip markdown fences if the model wraps the JSON
-    cleaned = re.sub(r"^```(?:json)?\s*", "", judge_response.strip())
+    cleaned = re.sub(r"^```(?:json)?\s*", "", response.strip())
     cleaned = re.sub(r"\s*```$", "", cleaned)
-    result = json.loads(cleaned)
+    return json.loads(cleaned)
 
-    chosen_id = result.get("skill_id", "none")
 
-    if chosen_id == "none":
+def _record_decision(query: str, candidates: list[dict], chosen_id: str) -> None:
+    global _decision_log
+    _judge_counts["called"] += 1
+    _judge_cache.set(_judge_cache_key(query, candidates), chosen_id)
+    if JUDGE_DECISION_LOG:
+        if _decision_log is None or _decision_log.path != JUDGE_DECISION_LOG:
+            _decision_log = DecisionLog(JUDGE_DECISION_LOG)
+        # Queued, not written here: no file I/O on the event loop
+        _decision_log.append(query, candidates, chosen_id)
+
+
+async def _judge_batch(items: list[tuple[str, list[dict]]]) -> list[str | None]:
+    """Judge many (query, candidates) pairs, JUDGE_BATCH_SIZE per Flash prompt.
+
+    Cache hits and policy skips never reach a prompt. A group whose response
+    cannot be parsed (or has no decisions object) is re-judged one query at
+    a time, concurrently. A failed
+    Flash call (already retried by the governor) fails only its own group:
+    those queries get None, the rest of the batch is unaffected.
+    """
+    decisions: list[str | None] = [None] * len(items)
+    pending = []
+    for i, (query, candidates) in enumerate(items):
+        cached = _judge_cache.get(_judge_cache_key(query, candidates))
+        if cached is not None:
+            decisions[i] = cached
+        elif _should_skip_judge(candidates):
+            _judge_counts["skipped"] += 1
+            decisions[i] = candidates[0]["skill"].skill_id
+        else:
+            pending.append(i)
+
+    semaphore = asyncio.Semaphore(max(1, JUDGE_BATCH_CONCURRENCY))
+
+    async def _judge_group(group: list[int]) -> None:
+        blocks = [
+            f"QUERY q{n}:\n{items[i][0]}\n\nCANDIDATES FOR q{n}:\n{_format_candidates(items[i][1])}"
+            for n, i in enumerate(group)
+        ]
+        try:
+            async with semaphore:
+                response = await call_flash(
+                    BATCH_JUDGE_PROMPT.format(items="\n\n".join(blocks)), site="search.judge_batch"
+                )
+        except Exception:
+            logger.warning("Batch judge call failed for %d queries", len(group), exc_info=True)
+            return
+        try:
+            chosen = _parse_judge_json(response)["decisions"]
+            if not isinstance(chosen, dict):
+                raise TypeError(f"decisions is a {type(chosen).__name__}, not an object")
+        except (ValueError, KeyError, TypeError):
+            results = await asyncio.gather(
+                *(_judge(*items[i]) for i in group), return_exceptions=True
+            )
+            for i, result in zip(group, results):
+                if isinstance(result, Exception):
+                    logger.warning("Judge call failed", exc_info=result)
+                else:
+                    decisions[i] = result
+            return
+        for n, i in enumerate(group):
+            query, candidates = items[i]
+            decisions[i] = str(chosen.get(f"q{n}", "none"))
+            _record_decision(query, candidates, decisions[i])
+
+    size = max(1, JUDGE_BATCH_SIZE)
+    await asyncio.gather(*(
+        _judge_group(pending[g:g + size]) for g in range(0, len(pending), size)
+    ))
+    return decisions
+
+
+async def _hydrate_resolution(skill: Skill | SkillCard) -> str | None:
+    """Cards carry no body — fetch only the winner's, by id. Full Skills already have it."""
+    if isinstance(skill, Skill):
+        return skill.resolution_md
+    return await db.get_skill_resolution(skill.skill_id, skill.version)
+
+
+def _remaining_s(deadline: float | None) -> float | None:
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+async def _embed_by(
+    query: str, deadline: float | None, fallbacks: list[str]
+) -> list[float] | None:
+    """Query embedding, or None (noting "keyword_only") if it misses the deadline."""
+    try:
+        return await asyncio.wait_for(
+            embed(query, task_type="RETRIEVAL_QUERY", hedge=True, site="search.embed"),
+            _remaining_s(deadline),
+        )
+    except asyncio.TimeoutError:
+        fallbacks.append("keyword_only")
+        return None
+
+
+async def search_skills_orchestration(
+    query: str,
+    filters: dict[str, str] | None = None,
+    deadline_ms: float | None = None,
+) -> SearchResponse:
+    """Embed, retrieve, judge and hydrate one query within a time budget.
+
+    deadline_ms (default SEARCH_DEADLINE_MS; <= 0 disables it) bounds the
+    whole search. Rather than wait past it the search degrades, recording
+    each step in the response's `fallbacks`: an embedding still pending
+    after SEARCH_EMBED_BUDGET_SHARE of the budget → keyword-only retrieval;
+    a judge still pending at the deadline → the top hybrid candidate;
+    retrieval itself still pending → no match. Hydrating the winner's body
+    (one lookup by id) runs after the deadline checks and is not bounded by
+    it, so a chosen skill is never dropped at the last step.
+    """
+    start = time.monotonic()
+    budget_ms = SEARCH_DEADLINE_MS if deadline_ms is None else deadline_ms
+    deadline = start + budget_ms / 1000 if budget_ms > 0 else None
+    embed_deadline = (
+        start + budget_ms * SEARCH_EMBED_BUDGET_SHARE / 1000 if deadline is not None else None
+    )
+    fallbacks: list[str] = []
+
+    def _respond(match: SkillMatch | None) -> SearchResponse:
         elapsed = (time.monotonic() - start) * 1000
-        return SearchResponse(skill=None, query=query, search_time_ms=elapsed)
+        return SearchResponse(
+            skill=match, query=query, search_time_ms=elapsed, fallbacks=fallbacks
+        )
+
+    # Start embedding now; hybrid_search overlaps it with the fulltext query
+    query_embedding = asyncio.ensure_future(_embed_by(query, embed_deadline, fallbacks))
+    try:
+        candidates = await asyncio.wait_for(
+            db.hybrid_search(query_embedding, query, top_k=SEARCH_TOP_K, filters=filters),
+            _remaining_s(deadline),
+        )
+    except asyncio.TimeoutError:
+        fallbacks.append("retrieval_timeout")
+        return _respond(None)
+    finally:
+        if not query_embedding.done():
+            query_embedding.cancel()
+
+    if not candidates:
+        return _respond(None)
+
+    try:
+        chosen_id = await asyncio.wait_for(_judge(query, candidates), _remaining_s(deadline))
+    except asyncio.TimeoutError:
+        fallbacks.append("top_candidate")
+        chosen_id = candidates[0]["skill"].skill_id
+
+    if chosen_id == "none":
+        return _respond(None)
 
     chosen_skill = None
     for c in candidates:
@@ -73,16 +334,63 @@ async def search_skills_orchestration(query: str) -> SearchResponse:
             break
 
     if chosen_skill is None:
-        elapsed = (time.monotonic() - start) * 1000
-        return SearchResponse(skill=None, query=query, search_time_ms=elapsed)
+        return _respond(None)
+
+    resolution_md = await _hydrate_resolution(chosen_skill)
+    if resolution_md is None:
+        # Deleted between retrieval and hydration
+        return _respond(None)
 
-    match = SkillMatch(
+    return _respond(SkillMatch(
         skill_id=chosen_skill.skill_id,
         title=chosen_skill.title,
         confidence=chosen_skill.confidence,
-        resolution_md=chosen_skill.resolution_md,
+        resolution_md=resolution_md,
         conditions=chosen_skill.conditions,
+    ))
+
+
+async def search_skills_batch_orchestration(queries: list[str]) -> BatchSearchResponse:
+    """search_skills for many queries: one batched embed, one retrieval
+    transaction, grouped judge prompts and one body fetch for the winners."""
+    start = time.monotonic()
+
+    embeddings = await embed_batch(queries, task_type="RETRIEVAL_QUERY", site="search.embed_batch")
+    all_candidates = await db.hybrid_search_batch(embeddings, queries, top_k=SEARCH_TOP_K)
+
+    to_judge = [i for i, candidates in enumerate(all_candidates) if candidates]
+    decisions = await _judge_batch([(queries[i], all_candidates[i]) for i in to_judge])
+
+    winners: dict[int, SkillCard | Skill] = {}
+    judge_failed = {i for i, chosen_id in zip(to_judge, decisions) if chosen_id is None}
+    for i, chosen_id in zip(to_judge, decisions):
+        for c in all_candidates[i]:
+            if c["skill"].skill_id == chosen_id:
+                winners[i] = c["skill"]
+                break
+
+    bodies = await db.get_skill_resolutions(
+        [(skill.skill_id, skill.version) for skill in winners.values()]
     )
 
     elapsed = (time.monotonic() - start) * 1000
-    return SearchResponse(skill=match, query=query, search_time_ms=elapsed)
+    results = []
+    for i, query in enumerate(queries):
+        skill = winners.get(i)
+        resolution_md = bodies.get(skill.skill_id) if skill is not None else None
+        match = None
+        if resolution_md is not None:
+            match = SkillMatch(
+                skill_id=skill.skill_id,
+                title=skill.title,
+                confidence=skill.confidence,
+                resolution_md=resolution_md,
+                conditions=skill.conditions,
+            )
+        results.append(SearchResponse(
+            skill=match,
+            query=query,
+            search_time_ms=elapsed,
+            fallbacks=["judge_error"] if i in judge_failed else [],
+        ))
+    return BatchSearchResponse(results=results, search_time_ms=elapsed)
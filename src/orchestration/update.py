@@ -3,6 +3,7 @@ from src.llm.client import call_pro_json, embed
 from src.llm.prompts import REFINEMENT_PROMPT
 from src.server.models import UpdateResponse
 from src.skills.models import SkillUpdate
+from src.utils.config import PRO_CACHE_REFINEMENT
 
 
 async def update_skill_orchestration(
@@ -25,14 +26,14 @@ async def update_skill_orchestration(
         conversation=conversation,
         feedback=feedback,
     )
-    refined = await call_pro_json(prompt)
+    refined = await call_pro_json(prompt, cache=PRO_CACHE_REFINEMENT, site="update.refine")
 
     embed_text = " ".join([
         refined["problem"],
         " ".join(refined.get("conditions", [])),
         " ".join(refined.get("keywords", [])),
     ])
-    new_embedding = await embed(embed_text)
+    new_embedding = await embed(embed_text, site="update.embed")
 
     updates = SkillUpdate(
         title=refined.get("title"),
@@ -19,6 +19,15 @@ class SearchResponse(BaseModel):
     skill: SkillMatch | None  # Best match, or None if no playbook fits
     query: str
     search_time_ms: float
+    # Degradations taken to meet the search deadline, in order:
+    # "keyword_only", "top_candidate", "retrieval_timeout"; in batch search,
+    # "judge_error" when the judge call for this query failed
+    fallbacks: list[str] = Field(default_factory=list)
+
+
+class BatchSearchResponse(BaseModel):
+    results: list[SearchResponse]  # One per query, in request order
+    search_time_ms: float
 
 
 # --- Create Skill ---
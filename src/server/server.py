@@ -1,5 +1,7 @@
+import asyncio
+import logging
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from dotenv import load_dotenv
 from fastmcp import FastMCP
@@ -7,18 +9,90 @@ from fastmcp.exceptions import ToolError
 from starlette.responses import JSONResponse
 
 from src.db import ensure_indexes
-from src.orchestration.search import search_skills_orchestration
+from src.db.connection import close_driver, pool_stats, warm_pool
+from src.db.keyword_index import get_keyword_index, init_keyword_index, parse_boosts
+from src.db.queries import hybrid_search
+from src.db.replica import run_sync_loop
+from src.db.vector_index import get_vector_index, init_vector_index
+from src.llm.client import (
+    cassette_stats,
+    close_client,
+    embed,
+    embed_batcher_stats,
+    embedding_cache_stats,
+    hedging_stats,
+    init_client,
+    llm_call_stats,
+    rate_governor_stats,
+    response_cache_stats,
+)
+from src.orchestration.search import (
+    flush_decision_log,
+    judge_cache_stats,
+    judge_skip_stats,
+    search_skills_batch_orchestration,
+    search_skills_orchestration,
+)
 from src.orchestration.create import create_skill_orchestration
 from src.orchestration.update import update_skill_orchestration
+from src.utils.config import (
+    KEYWORD_FIELD_BOOSTS,
+    KEYWORD_INDEX_BACKEND,
+    LOCAL_INDEX_SYNC_INTERVAL_S,
+    LOCAL_VECTOR_INDEX,
+    NEO4J_WARM_CONNECTIONS,
+    SEARCH_BATCH_MAX,
+    STARTUP_WARMUP,
+    validate_search_settings,
+)
 
 # Load .env for local development (Render sets env vars via dashboard)
 load_dotenv()
 
 
+logger = logging.getLogger(__name__)
+
+
+async def _warm_up():
+    """One query embedding + hybrid search, so the first real search finds the
+    embed path, both Neo4j indexes and any local replicas already hot."""
+    embedding = await embed("warm up", task_type="RETRIEVAL_QUERY", site="startup.warmup")
+    await hybrid_search(embedding, "warm up", top_k=1)
+
+
 @asynccontextmanager
 async def lifespan(server):
-    await ensure_indexes()
-    yield
+    # Build the driver and Gemini client before serving, with the pool's
+    # connections already open — cold starts don't pay for them on a request
+    validate_search_settings()
+    sync_task = None
+    try:
+        await warm_pool(NEO4J_WARM_CONNECTIONS)
+        init_client()
+        await ensure_indexes()
+        replicas = []
+        if LOCAL_VECTOR_INDEX:
+            replicas.append(await init_vector_index())
+        if KEYWORD_INDEX_BACKEND == "local":
+            replicas.append(await init_keyword_index(parse_boosts(KEYWORD_FIELD_BOOSTS)))
+        if replicas:
+            sync_task = asyncio.create_task(run_sync_loop(replicas, LOCAL_INDEX_SYNC_INTERVAL_S))
+        if STARTUP_WARMUP:
+            try:
+                await _warm_up()
+            except Exception:
+                logger.warning("Startup warm-up failed; serving anyway", exc_info=True)
+        yield
+    finally:
+        # Also runs when startup fails part-way; stop the sync loop before
+        # the driver it reads through is closed
+        if sync_task is not None:
+            sync_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await sync_task
+        await flush_decision_log()
+        await close_client()
+        await close_driver()
 
 
 mcp = FastMCP(
@@ -38,13 +112,59 @@ async def health(request):
     return JSONResponse({"status": "ok"})
 
 
+@mcp.custom_route("/stats", methods=["GET"])
+async def stats(request):
+    return JSONResponse({
+        "embedding_cache": embedding_cache_stats(),
+        "judge_cache": judge_cache_stats(),
+        "pro_response_cache": response_cache_stats(),
+        "judge_skip": judge_skip_stats(),
+        "hedging": hedging_stats(),
+        "embed_batcher": embed_batcher_stats(),
+        "rate_governor": rate_governor_stats(),
+        "cassette": cassette_stats(),
+        "llm_calls": llm_call_stats(),
+        "neo4j_pool": pool_stats(),
+        "vector_index": index.stats() if (index := get_vector_index()) else None,
+        "keyword_index": kw.stats() if (kw := get_keyword_index()) else None,
+    })
+
+
 @mcp.tool()
-async def search_skills(query: str) -> dict:
-    """Query existing resolution patterns via hybrid search."""
+async def search_skills(
+    query: str,
+    filters: dict | None = None,
+    deadline_ms: float | None = None,
+) -> dict:
+    """Query existing resolution patterns via hybrid search.
+
+    filters optionally restricts results by exact product_area / issue_type.
+    deadline_ms overrides the server's search time budget; the response's
+    fallbacks lists any degradation taken to meet it.
+    """
     if not query or not query.strip():
         raise ToolError("query is required")
     try:
-        response = await search_skills_orchestration(query.strip())
+        response = await search_skills_orchestration(
+            query.strip(), filters=filters or None, deadline_ms=deadline_ms
+        )
+        return response.model_dump()
+    except Exception as e:
+        raise ToolError(str(e)) from e
+
+
+@mcp.tool()
+async def search_skills_batch(queries: list[str]) -> dict:
+    """Run search_skills for many queries at once (bulk triage)."""
+    if not queries:
+        raise ToolError("queries is required")
+    if len(queries) > SEARCH_BATCH_MAX:
+        raise ToolError(f"At most {SEARCH_BATCH_MAX} queries per batch")
+    stripped = [q.strip() if q else "" for q in queries]
+    if not all(stripped):
+        raise ToolError("queries must not contain empty strings")
+    try:
+        response = await search_skills_batch_orchestration(stripped)
         return response.model_dump()
     except Exception as e:
         raise ToolError(str(e)) from e
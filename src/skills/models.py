@@ -1,10 +1,14 @@
 import uuid
 from datetime import datetime, timezone
+from typing import ClassVar
 
 from pydantic import BaseModel, Field, model_validator
 
 from src.utils.config import EMBEDDING_DIM, validate_embedding
 
+# Skill properties search can be restricted on (exact match)
+FILTER_FIELDS = ("product_area", "issue_type")
+
 
 class Skill(BaseModel):
     # Identity
@@ -80,6 +84,37 @@ class Skill(BaseModel):
         return cls(**node)
 
 
+class SkillCard(BaseModel):
+    """What ranking and the judge need from a Skill — no embedding, no resolution_md.
+
+    Search hydrates only the chosen skill's body (see queries.get_skill_resolution).
+    """
+
+    skill_id: str
+    title: str
+    version: int = 1
+    problem: str = ""
+    conditions: list[str] = Field(default_factory=list)
+    confidence: float = 0.5
+    product_area: str = ""
+    issue_type: str = ""
+
+    # Node properties a search query projects to build a card
+    FIELDS: ClassVar[tuple[str, ...]] = (
+        "skill_id", "title", "version", "problem", "conditions", "confidence",
+        *FILTER_FIELDS,
+    )
+
+    @classmethod
+    def from_neo4j_node(cls, node: dict) -> "SkillCard":
+        # Projected properties missing on the node come back as null
+        return cls(**{k: v for k, v in node.items() if v is not None})
+
+
+# Cypher map projection of SkillCard.FIELDS, e.g. `node {.skill_id, .title, ...}`
+CARD_PROJECTION = ", ".join(f".{f}" for f in SkillCard.FIELDS)
+
+
 class SkillUpdate(BaseModel):
     title: str | None = None
     problem: str | None = None
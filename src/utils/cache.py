@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace so trivially different strings share a cache key."""
+    return " ".join(text.split())
+
+
+class LRUCache:
+    """Size-bounded LRU cache with optional per-entry TTL and hit/miss counters.
+
+    Not thread-safe — intended for use from a single asyncio event loop.
+    `ttl_s <= 0` disables expiry; `maxsize <= 0` disables the cache entirely.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_s: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry: tuple[float, Any]) -> bool:
+        return self.ttl_s > 0 and time.monotonic() - entry[0] > self.ttl_s
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if self._expired(entry):
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,6 +1,177 @@
 import os
 
 EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "768"))
+# "gemini" (default) or "hashing" — a local CPU n-gram projection, no API
+# calls. Vectors from different backends are not comparable: re-embed after
+# switching.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "gemini").strip().lower()
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name, "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes", "on")
+
+
+def _llm_limits(family: str, concurrency: int) -> tuple[int, float, float]:
+    prefix = f"LLM_{family.upper()}"
+    return (
+        int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(concurrency))),
+        float(os.getenv(f"{prefix}_RPM", "0")),
+        float(os.getenv(f"{prefix}_TPM", "0")),
+    )
+
+
+def _llm_prices(family: str, price_in: float, price_out: float) -> tuple[float, float]:
+    prefix = f"LLM_{family.upper()}"
+    return (
+        float(os.getenv(f"{prefix}_PRICE_IN", str(price_in))),
+        float(os.getenv(f"{prefix}_PRICE_OUT", str(price_out))),
+    )
+
+
+# In-process query embedding cache (0 entries disables it)
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "2048"))
+EMBED_CACHE_TTL_S = float(os.getenv("EMBED_CACHE_TTL_S", "3600"))
+
+# Persistent embedding store behind the in-process cache: one SQLite file,
+# shared across restarts and processes (empty path disables it)
+EMBED_STORE_PATH = os.getenv("EMBED_STORE_PATH", "")
+EMBED_STORE_MAX_MB = float(os.getenv("EMBED_STORE_MAX_MB", "256"))
+
+# embed() micro-batching: concurrent calls within EMBED_BATCH_WAIT_MS (0
+# disables) are sent as one request of up to EMBED_BATCH_MAX contents. The
+# window only applies while an embed request is already in flight, so a
+# lone call is sent at once
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+EMBED_BATCH_MAX = int(os.getenv("EMBED_BATCH_MAX", "100"))
+
+# Judge decision cache — keyed by query + (skill_id, version) of every candidate
+JUDGE_CACHE_SIZE = int(os.getenv("JUDGE_CACHE_SIZE", "4096"))
+JUDGE_CACHE_TTL_S = float(os.getenv("JUDGE_CACHE_TTL_S", "3600"))
+
+# Judge-skip policy: calibration file written by scripts/calibrate_judge_skip.py,
+# and an optional JSONL log of live judge decisions to calibrate from
+JUDGE_SKIP_CALIBRATION = os.getenv("JUDGE_SKIP_CALIBRATION", "")
+JUDGE_DECISION_LOG = os.getenv("JUDGE_DECISION_LOG", "")
+
+# hybrid_search strategy: "split" runs vector + fulltext as two overlapped
+# queries; "single" fuses both server-side in one Cypher round trip
+HYBRID_SEARCH_MODE = os.getenv("HYBRID_SEARCH_MODE", "split")
+
+# Resolution bodies hydrated after the judge picks, keyed by (skill_id, version)
+SKILL_BODY_CACHE_SIZE = int(os.getenv("SKILL_BODY_CACHE_SIZE", "1024"))
+SKILL_BODY_CACHE_TTL_S = float(os.getenv("SKILL_BODY_CACHE_TTL_S", "3600"))
+
+# In-process NumPy replica of the vector index (needs the local-index extra);
+# Neo4j remains the fallback until it has loaded
+LOCAL_VECTOR_INDEX = _env_flag("LOCAL_VECTOR_INDEX")
+LOCAL_INDEX_SYNC_INTERVAL_S = float(os.getenv("LOCAL_INDEX_SYNC_INTERVAL_S", "30"))
+
+# Keyword half of hybrid search: "neo4j" (skill_keywords fulltext index) or
+# "local" (in-process BM25 replica). Boosts look like "title=2,keywords=2".
+KEYWORD_INDEX_BACKEND = os.getenv("KEYWORD_INDEX_BACKEND", "neo4j")
+KEYWORD_FIELD_BOOSTS = os.getenv("KEYWORD_FIELD_BOOSTS", "")
+
+# Score fusion for hybrid search: "linear" (0.7 vector / 0.3 keyword) or "rrf"
+# (reciprocal rank fusion, constant RRF_K). Each index is asked for
+# top_k * SEARCH_FETCH_FACTOR rows; search hands SEARCH_TOP_K to the judge.
+SEARCH_FUSION = os.getenv("SEARCH_FUSION", "linear")
+RRF_K = int(os.getenv("RRF_K", "60"))
+SEARCH_FETCH_FACTOR = int(os.getenv("SEARCH_FETCH_FACTOR", "2"))
+SEARCH_TOP_K = int(os.getenv("SEARCH_TOP_K", "5"))
+
+# Filtered search (product_area / issue_type). With NEO4J_VECTOR_FILTERING the
+# vector index stores the filter properties and filters natively (Neo4j
+# 2026.01+); otherwise the vector query oversamples, doubling k up to
+# FILTER_OVERSAMPLE_MAX until enough rows pass the filter.
+NEO4J_VECTOR_FILTERING = _env_flag("NEO4J_VECTOR_FILTERING")
+FILTER_OVERSAMPLE_MAX = int(os.getenv("FILTER_OVERSAMPLE_MAX", "1000"))
+
+# search_skills_batch: max queries per call, queries judged per Flash prompt,
+# and how many judge prompts run at once
+SEARCH_BATCH_MAX = int(os.getenv("SEARCH_BATCH_MAX", "500"))
+JUDGE_BATCH_SIZE = int(os.getenv("JUDGE_BATCH_SIZE", "8"))
+JUDGE_BATCH_CONCURRENCY = int(os.getenv("JUDGE_BATCH_CONCURRENCY", "4"))
+
+# Per-request search budget (0 disables — opt-in, since answering with an
+# unjudged candidate changes what search returns). Past
+# SEARCH_EMBED_BUDGET_SHARE of it a pending query embedding is dropped for
+# keyword-only retrieval; at the deadline a pending judge call is dropped for
+# the top hybrid candidate. Fetching the winner's body afterwards is not
+# covered by the budget.
+SEARCH_DEADLINE_MS = float(os.getenv("SEARCH_DEADLINE_MS", "0"))
+SEARCH_EMBED_BUDGET_SHARE = float(os.getenv("SEARCH_EMBED_BUDGET_SHARE", "0.4"))
+
+# Hedged requests for the judge and query embeddings: a call still pending at
+# HEDGE_PERCENTILE of recent latency gets one duplicate, capped at
+# HEDGE_MAX_EXTRA_RATE of recent calls. Needs HEDGE_MIN_SAMPLES to start.
+LLM_HEDGING = _env_flag("LLM_HEDGING")
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MAX_EXTRA_RATE = float(os.getenv("HEDGE_MAX_EXTRA_RATE", "0.05"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+
+# Gemini rate governor, per model family: max concurrent calls (adapted down
+# on 429/503, AIMD), requests/min and estimated tokens/min. 0 = unlimited.
+LLM_LIMITS = {
+    "flash": _llm_limits("flash", 32),
+    "pro": _llm_limits("pro", 8),
+    "embed": _llm_limits("embed", 32),
+}
+# Shared Gemini call slots across all families (0 = unlimited), split between
+# "read" (search) and "write" (create/update) traffic: reads get a reserved
+# share and go first by weight when slots are contended
+LLM_DISPATCH_MAX_CONCURRENCY = int(os.getenv("LLM_DISPATCH_MAX_CONCURRENCY", "48"))
+LLM_PRIORITY_WEIGHTS = os.getenv("LLM_PRIORITY_WEIGHTS", "read=8,write=1")
+LLM_READ_RESERVED_SHARE = float(os.getenv("LLM_READ_RESERVED_SHARE", "0.25"))
+# Retries on 429/500/503/504 with full-jitter exponential backoff
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_MS = float(os.getenv("LLM_RETRY_BASE_MS", "200"))
+LLM_RETRY_MAX_MS = float(os.getenv("LLM_RETRY_MAX_MS", "5000"))
+
+# USD per 1M prompt / output tokens per model family, for the cost estimates
+# in LLM call telemetry (list prices; override for your contract or model)
+LLM_PRICES = {
+    "flash": _llm_prices("flash", 0.50, 3.00),
+    "pro": _llm_prices("pro", 2.00, 12.00),
+    "embed": _llm_prices("embed", 0.15, 0.0),
+}
+
+# Opt-in cache of call_pro_json responses keyed by (model, prompt, temperature):
+# in-process LRU plus an optional SQLite file (empty path = memory only).
+# PRO_CACHE_EXTRACTION / PRO_CACHE_REFINEMENT turn it on for create / update.
+PRO_CACHE_EXTRACTION = _env_flag("PRO_CACHE_EXTRACTION")
+PRO_CACHE_REFINEMENT = _env_flag("PRO_CACHE_REFINEMENT")
+PRO_CACHE_SIZE = int(os.getenv("PRO_CACHE_SIZE", "256"))
+PRO_CACHE_TTL_S = float(os.getenv("PRO_CACHE_TTL_S", "604800"))
+PRO_CACHE_PATH = os.getenv("PRO_CACHE_PATH", "")
+PRO_CACHE_MAX_MB = float(os.getenv("PRO_CACHE_MAX_MB", "64"))
+
+# Stream the create extraction: embed + duplicate check start as soon as
+# problem/conditions/keywords are generated, and a duplicate cancels the rest
+PRO_STREAM_EXTRACTION = _env_flag("PRO_STREAM_EXTRACTION")
+
+# Record/replay of Gemini calls for offline, reproducible benchmarks:
+# "record" appends every request/response/latency to LLM_CASSETTE_PATH,
+# "replay" serves them without network or API key. Replay sleeps for the
+# recorded latency times LLM_CASSETTE_LATENCY_SCALE (0 = answer instantly).
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", ".cache/llm_cassette.jsonl")
+LLM_CASSETTE_LATENCY_SCALE = float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "0"))
+
+# Neo4j driver connection pool. Liveness check: connections idle longer than
+# this many seconds are pinged before reuse (empty = never, 0 = always).
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))
+NEO4J_ACQUISITION_TIMEOUT_S = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT_S", "60"))
+NEO4J_LIVENESS_CHECK_S = os.getenv("NEO4J_LIVENESS_CHECK_S", "")
+NEO4J_MAX_CONNECTION_LIFETIME_S = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME_S", "3600"))
+NEO4J_FETCH_SIZE = int(os.getenv("NEO4J_FETCH_SIZE", "1000"))
+
+# Server startup: pre-open this many pooled Neo4j connections, then (with
+# STARTUP_WARMUP) run one query embedding + hybrid search before serving
+NEO4J_WARM_CONNECTIONS = int(os.getenv("NEO4J_WARM_CONNECTIONS", "4"))
+STARTUP_WARMUP = _env_flag("STARTUP_WARMUP", default=True)
 
 
 def validate_embedding(embedding: list[float], context: str = "") -> None:
@@ -10,3 +181,15 @@ def validate_embedding(embedding: list[float], context: str = "") -> None:
             f"Expected embedding dim {EMBEDDING_DIM}, got {len(embedding)}"
             + (f" ({context})" if context else "")
         )
+
+
+def validate_search_settings() -> None:
+    """Fail fast on a misspelled search mode instead of failing every search
+    (SEARCH_FUSION) or silently falling back to the default (the others)."""
+    for name, value, allowed in (
+        ("SEARCH_FUSION", SEARCH_FUSION, ("linear", "rrf")),
+        ("KEYWORD_INDEX_BACKEND", KEYWORD_INDEX_BACKEND, ("neo4j", "local")),
+        ("HYBRID_SEARCH_MODE", HYBRID_SEARCH_MODE, ("split", "single")),
+    ):
+        if value not in allowed:
+            raise ValueError(f"Unknown {name} {value!r}; expected one of {', '.join(allowed)}")
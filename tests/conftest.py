@@ -1,4 +1,33 @@
+import pytest
 from dotenv import load_dotenv
 
 # Load .env before any test module's skipif markers evaluate os.getenv.
 load_dotenv()
+
+
+@pytest.fixture(autouse=True)
+def _reset_llm_caches():
+    """Module-level caches must not leak results between tests."""
+    from src.db import queries
+    from src.llm import client
+    from src.orchestration import search
+
+    client.clear_embedding_cache()
+    client.clear_response_cache()
+    client.reset_hedging()
+    client.reset_embed_batcher()
+    client.reset_rate_governors()
+    client.reset_llm_call_stats()
+    search.clear_judge_cache()
+    search.reset_judge_skip_stats()
+    queries.clear_skill_body_cache()
+    yield
+    client.clear_embedding_cache()
+    client.clear_response_cache()
+    client.reset_hedging()
+    client.reset_embed_batcher()
+    client.reset_rate_governors()
+    client.reset_llm_call_stats()
+    search.clear_judge_cache()
+    search.reset_judge_skip_stats()
+    queries.clear_skill_body_cache()
@@ -0,0 +1,280 @@
+"""Unit tests for search-path query control flow — Neo4j access is mocked."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.utils.config import EMBEDDING_DIM
+
+_EMBED = [1.0] + [0.0] * (EMBEDDING_DIM - 1)
+
+
+def _props(skill_id: str) -> dict:
+    return dict(
+        skill_id=skill_id,
+        title=f"Skill {skill_id}",
+        problem="test problem",
+        resolution_md="test resolution",
+        embedding=_EMBED,
+        created_at="2025-01-01T00:00:00+00:00",
+        updated_at="2025-01-01T00:00:00+00:00",
+    )
+
+
+async def test_keyword_query_overlaps_pending_embedding():
+    """The fulltext query runs while the embedding is still in flight."""
+    from src.db import queries
+
+    embedding = asyncio.get_running_loop().create_future()
+    events = []
+
+    async def _keyword_query(query_text, fetch_count, filters=None):
+        events.append("keyword")
+        embedding.set_result(_EMBED)
+        return [(_props("a"), 2.0)]
+
+    async def _vector_query(query_embedding, fetch_count, filters=None):
+        events.append("vector")
+        return [(_props("a"), 0.8)]
+
+    with patch.object(queries, "_keyword_query", side_effect=_keyword_query), \
+         patch.object(queries, "_vector_query", side_effect=_vector_query):
+        results = await queries.hybrid_search(embedding, "password reset", top_k=5)
+
+    assert events == ["keyword", "vector"]
+    assert results[0]["skill"].skill_id == "a"
+    assert results[0]["score"] == pytest.approx(0.86)
+
+
+async def test_empty_query_text_skips_keyword_query():
+    from src.db import queries
+
+    with patch.object(queries, "_keyword_query", new_callable=AsyncMock) as kw, \
+         patch.object(queries, "_vector_query", AsyncMock(return_value=[(_props("a"), 0.9)])):
+        results = await queries.hybrid_search(_EMBED, "   ", top_k=5)
+
+    kw.assert_not_called()
+    assert results[0]["score"] == pytest.approx(0.9)
+
+
+async def test_embedding_failure_cancels_keyword_query():
+    from src.db import queries
+
+    started = asyncio.Event()
+    cancelled = False
+
+    async def _keyword_query(query_text, fetch_count, filters=None):
+        nonlocal cancelled
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def _failing_embedding():
+        await started.wait()
+        raise RuntimeError("embedding failed")
+
+    with patch.object(queries, "_keyword_query", side_effect=_keyword_query), \
+         patch.object(queries, "_vector_query", new_callable=AsyncMock):
+        with pytest.raises(RuntimeError, match="embedding failed"):
+            await queries.hybrid_search(_failing_embedding(), "password", top_k=5)
+        await asyncio.sleep(0)
+
+    assert cancelled
+
+
+async def test_missing_embedding_searches_keywords_only():
+    from src.db import queries
+
+    async def _no_embedding():
+        return None
+
+    with patch.object(queries, "HYBRID_SEARCH_MODE", "single"), \
+         patch.object(queries, "_hybrid_query", new_callable=AsyncMock) as hybrid, \
+         patch.object(queries, "_vector_query", new_callable=AsyncMock) as vec, \
+         patch.object(queries, "_keyword_query", AsyncMock(return_value=[(_props("a"), 2.0)])):
+        results = await queries.hybrid_search(_no_embedding(), "password", top_k=5)
+
+    hybrid.assert_not_called()
+    vec.assert_not_called()
+    assert results[0]["skill"].skill_id == "a"
+    assert results[0]["vector_score"] == 0.0
+
+
+async def test_single_mode_uses_one_query_and_returns_cards():
+    from src.db import queries
+    from src.skills.models import SkillCard
+
+    card_props = {
+        "skill_id": "a", "title": "Skill a", "version": 3, "problem": "p",
+        "conditions": None, "confidence": 0.7,
+    }
+    hybrid = AsyncMock(return_value=[(card_props, 0.86, 0.8, 1.0)])
+
+    with patch.object(queries, "HYBRID_SEARCH_MODE", "single"), \
+         patch.object(queries, "_hybrid_query", hybrid), \
+         patch.object(queries, "_vector_query", new_callable=AsyncMock) as vec, \
+         patch.object(queries, "_keyword_query", new_callable=AsyncMock) as kw:
+        results = await queries.hybrid_search(_EMBED, " password reset ", top_k=3, min_score=0.1)
+
+    vec.assert_not_called()
+    kw.assert_not_called()
+    hybrid.assert_awaited_once_with(_EMBED, "password reset", 6, 3, 0.1)
+    card = results[0]["skill"]
+    assert isinstance(card, SkillCard)
+    assert card.version == 3
+    assert card.conditions == []
+    assert results[0]["score"] == 0.86
+    assert results[0]["vector_score"] == 0.8
+    assert results[0]["keyword_score"] == 1.0
+
+
+async def test_unknown_filter_rejected():
+    from src.db import queries
+
+    with pytest.raises(ValueError, match="Unsupported search filter"):
+        await queries.hybrid_search(_EMBED, "password", filters={"team": "x"})
+
+
+async def test_filters_skip_single_mode_and_reach_both_indexes():
+    from src.db import queries
+
+    filters = {"product_area": "billing", "issue_type": ""}
+    with patch.object(queries, "HYBRID_SEARCH_MODE", "single"), \
+         patch.object(queries, "_hybrid_query", new_callable=AsyncMock) as hybrid, \
+         patch.object(queries, "_vector_query", AsyncMock(return_value=[])) as vec, \
+         patch.object(queries, "_keyword_query", AsyncMock(return_value=[])) as kw:
+        await queries.hybrid_search(_EMBED, "refund", top_k=2, filters=filters)
+
+    hybrid.assert_not_called()
+    vec.assert_awaited_once_with(_EMBED, 4, {"product_area": "billing"})
+    kw.assert_awaited_once_with("refund", 4, {"product_area": "billing"})
+
+
+async def test_filtered_keyword_query_sends_text_unchanged():
+    from src.db import queries
+
+    tx = MagicMock()
+    tx.run = AsyncMock(return_value=MagicMock(values=AsyncMock(return_value=[])))
+    with patch.object(queries, "execute_read", _managed(tx)):
+        await queries._keyword_query("reset (pw)", 4, {"product_area": "auth:sso"})
+        await queries._keyword_query("reset (pw)", 4)
+
+    filtered, unfiltered = tx.run.await_args_list
+    # Same Lucene text with or without filters; the filter is a Cypher predicate
+    assert filtered.kwargs["query_text"] == unfiltered.kwargs["query_text"] == "reset (pw)"
+    assert filtered.kwargs["f_product_area"] == "auth:sso"
+    assert "node.product_area = $f_product_area" in filtered.args[0]
+
+
+def _managed(tx, attempts=1):
+    """Stand-in for execute_read: runs work against tx, `attempts` times like a
+    driver retrying a transient failure, and returns the last result."""
+
+    async def _execute(work, *args, **kwargs):
+        for _ in range(attempts):
+            result = await work(tx, *args, **kwargs)
+        return result
+
+    return _execute
+
+
+async def test_filtered_vector_query_oversamples_until_enough_hits():
+    from src.db import queries
+
+    pages = [
+        {"scanned": 8, "hits": [[{"skill_id": "a"}, 0.9]]},
+        {"scanned": 16, "hits": [[{"skill_id": "a"}, 0.9], [{"skill_id": "b"}, 0.8]]},
+    ]
+    session = MagicMock()
+    session.run = AsyncMock(side_effect=[
+        MagicMock(single=AsyncMock(return_value=page)) for page in pages
+    ])
+
+    with patch.object(queries, "execute_read", _managed(session)):
+        rows = await queries._vector_query(_EMBED, 2, {"product_area": "billing"})
+
+    assert rows == [({"skill_id": "a"}, 0.9), ({"skill_id": "b"}, 0.8)]
+    assert [c.kwargs["k"] for c in session.run.await_args_list] == [8, 16]
+    assert session.run.await_args.kwargs["f_product_area"] == "billing"
+
+
+async def test_filtered_vector_query_stops_when_index_exhausted():
+    from src.db import queries
+
+    session = MagicMock()
+    session.run = AsyncMock(return_value=MagicMock(
+        single=AsyncMock(return_value={"scanned": 3, "hits": []})
+    ))
+
+    with patch.object(queries, "execute_read", _managed(session)):
+        assert await queries._vector_query(_EMBED, 2, {"issue_type": "bug"}) == []
+
+    session.run.assert_awaited_once()
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for row in self._rows:
+            yield row
+
+
+async def test_batch_search_unwinds_in_one_transaction():
+    from src.db import queries
+
+    def _pages():
+        return [
+            _Rows([
+                {"i": 0, "props": {"skill_id": "a", "title": "A"}, "score": 0.9},
+                {"i": 1, "props": {"skill_id": "b", "title": "B"}, "score": 0.8},
+            ]),
+            _Rows([{"i": 1, "props": {"skill_id": "b", "title": "B"}, "score": 3.0}]),
+        ]
+
+    tx = MagicMock()
+    # Second attempt = driver retry: rows must not be collected twice
+    tx.run = AsyncMock(side_effect=_pages() + _pages())
+
+    with patch.object(queries, "execute_read", _managed(tx, attempts=2)):
+        results = await queries.hybrid_search_batch([_EMBED, _EMBED], ["", "login"], top_k=2)
+
+    assert tx.run.await_count == 4
+    assert tx.run.await_args_list[1].kwargs["texts"] == ["", "login"]
+    assert [r["skill"].skill_id for r in results[0]] == ["a"]
+    assert results[0][0]["keyword_score"] == 0.0
+    assert len(results[1]) == 1
+    assert results[1][0]["score"] == pytest.approx(0.7 * 0.8 + 0.3)
+
+
+async def test_batch_skill_resolutions_fetch_only_misses():
+    from src.db import queries
+
+    queries._body_cache.set(("a", 2), "# A")
+    session = MagicMock()
+    session.run = AsyncMock(return_value=_Rows([
+        {"skill_id": "b", "resolution_md": "# B", "version": 1},
+    ]))
+
+    with patch.object(queries, "execute_read", _managed(session)):
+        bodies = await queries.get_skill_resolutions([("a", 2), ("b", 1), ("gone", 1)])
+
+    assert bodies == {"a": "# A", "b": "# B"}
+    assert session.run.await_args.kwargs["skill_ids"] == ["b", "gone"]
+
+
+async def test_skill_resolution_served_from_cache():
+    from src.db import queries
+
+    queries._body_cache.set(("a", 2), "# Cached body")
+
+    with patch.object(queries, "execute_read", AsyncMock(side_effect=AssertionError("no DB"))):
+        assert await queries.get_skill_resolution("a", 2) == "# Cached body"
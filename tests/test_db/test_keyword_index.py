@@ -0,0 +1,154 @@
+"""Unit tests for the in-process BM25 keyword index — no Neo4j required."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.db.keyword_index import LocalKeywordIndex, parse_boosts, tokenize
+
+
+def _card(skill_id: str) -> dict:
+    return {"skill_id": skill_id, "title": f"Skill {skill_id}", "version": 1}
+
+
+def _index(**kwargs) -> LocalKeywordIndex:
+    index = LocalKeywordIndex(**kwargs)
+    index.upsert("pw", {
+        "title": "Password Reset",
+        "problem": "Customer cannot log in after password change",
+        "resolution_md": "## Steps\nSend a reset link",
+        "keywords": ["password", "login"],
+    }, _card("pw"))
+    index.upsert("refund", {
+        "title": "Refund Request",
+        "problem": "Customer wants a refund for a duplicate charge",
+        "resolution_md": "## Steps\nIssue the refund",
+        "keywords": ["billing", "refund"],
+    }, _card("refund"))
+    index.upsert("cancel", {
+        "title": "Cancel Subscription",
+        "problem": "Customer wants to cancel and get a refund",
+        "resolution_md": "## Steps\nCancel the plan",
+        "keywords": ["subscription"],
+    }, _card("cancel"))
+    index.ready = True
+    return index
+
+
+def test_tokenize_lowercases_and_splits():
+    assert tokenize("Can't LOG-in!") == ["can", "t", "log", "in"]
+
+
+def test_search_ranks_matching_skill_first():
+    hits = _index().search("forgot my password", k=3)
+
+    assert [c["skill_id"] for c, _ in hits] == ["pw"]
+    assert hits[0][1] > 0
+
+
+def test_title_boost_outranks_body_mention():
+    """"refund" is in refund's title + keywords but only cancel's problem."""
+    hits = _index().search("refund", k=3)
+
+    assert [c["skill_id"] for c, _ in hits] == ["refund", "cancel"]
+
+
+def test_field_boosts_change_ranking():
+    boosts = parse_boosts("title=0,keywords=0,problem=5")
+    scores = dict(
+        (c["skill_id"], s) for c, s in _index(boosts=boosts).search("refund", k=3)
+    )
+    default = dict((c["skill_id"], s) for c, s in _index().search("refund", k=3))
+
+    assert scores["cancel"] / scores["refund"] > default["cancel"] / default["refund"]
+
+
+def test_upsert_replaces_previous_terms():
+    index = _index()
+    index.upsert("pw", {"title": "Two-factor setup"}, _card("pw"))
+
+    assert index.search("password", k=3) == []
+    assert index.search("factor", k=3)[0][0]["skill_id"] == "pw"
+    assert len(index) == 3
+
+
+def test_remove_drops_postings():
+    index = _index()
+    index.remove("refund")
+
+    assert [c["skill_id"] for c, _ in index.search("refund", k=3)] == ["cancel"]
+    assert "duplicate" not in index._postings
+
+
+def test_search_filters_on_card_fields():
+    index = _index()
+    index._cards["cancel"]["issue_type"] = "billing"
+
+    hits = index.search("refund", k=5, filters={"issue_type": "billing"})
+
+    assert [c["skill_id"] for c, _ in hits] == ["cancel"]
+
+
+def test_parse_boosts_rejects_unknown_field():
+    with pytest.raises(ValueError, match="Unknown"):
+        parse_boosts("body=2")
+
+
+async def test_hybrid_search_uses_loaded_keyword_index():
+    from src.db import queries
+    from src.utils.config import EMBEDDING_DIM
+
+    index = _index()
+    with patch.object(queries, "get_keyword_index", return_value=index), \
+         patch.object(queries, "_vector_query", AsyncMock(return_value=[])):
+        results = await queries.hybrid_search([1.0] * EMBEDDING_DIM, "password", top_k=2)
+
+    assert results[0]["skill"].skill_id == "pw"
+    assert results[0]["keyword_score"] == pytest.approx(1.0)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for row in self._rows:
+            yield row
+
+    async def single(self):
+        return self._rows[0]
+
+
+async def test_sync_reads_through_managed_read_transactions():
+    from src.db import keyword_index
+
+    index = _index()
+    index.ready = True
+    row = {
+        "skill_id": "pw",
+        "updated_at": "2026-02-01T00:00:00+00:00",
+        "fields": {"title": "Password Reset", "keywords": ["sso"]},
+        "card": _card("pw"),
+    }
+
+    class _Tx:
+        async def run(self, query, **params):
+            return _Result([{"n": 3}] if "count(s)" in query else [row])
+
+    calls = []
+
+    async def _execute_read(work, *args, **kwargs):
+        calls.append(work)
+        # A driver retry re-runs the work; rows must only be applied once
+        await work(_Tx())
+        return await work(_Tx())
+
+    with patch.object(keyword_index, "execute_read", _execute_read):
+        assert await index.sync() == 1
+
+    assert len(calls) == 2  # the pull and the count check
+    assert index.synced_at == row["updated_at"]
+    assert index.search("sso", 3)[0][0]["skill_id"] == "pw"
@@ -0,0 +1,160 @@
+"""Unit tests for driver lifecycle and pool warm-up — no Neo4j needed."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    from src.db import connection
+
+    monkeypatch.setattr(connection, "_driver", None)
+    monkeypatch.setenv("NEO4J_URI", "bolt://localhost:7687")
+    monkeypatch.setenv("NEO4J_USERNAME", "neo4j")
+    monkeypatch.setenv("NEO4J_PASSWORD", "secret")
+    return connection
+
+
+class _FakeSession:
+    """Counts sessions holding a connection at the same time."""
+
+    open_now = 0
+    max_open = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        _FakeSession.open_now -= 1
+        return False
+
+    async def run(self, query):
+        _FakeSession.open_now += 1
+        _FakeSession.max_open = max(_FakeSession.max_open, _FakeSession.open_now)
+        await asyncio.sleep(0)
+        return MagicMock(consume=AsyncMock())
+
+
+def test_get_driver_builds_one_driver_across_threads(connection):
+    with patch.object(connection.AsyncGraphDatabase, "driver", side_effect=lambda *a, **k: object()) as build:
+        with ThreadPoolExecutor(8) as pool:
+            drivers = list(pool.map(lambda _: asyncio.run(connection.get_driver()), range(16)))
+
+    assert build.call_count == 1
+    assert all(d is drivers[0] for d in drivers)
+
+
+async def test_warm_pool_holds_sessions_until_all_connections_open(connection):
+    _FakeSession.open_now = _FakeSession.max_open = 0
+    driver = MagicMock(verify_connectivity=AsyncMock())
+    driver.session.side_effect = lambda **_: _FakeSession()
+    with patch.object(connection, "get_driver", AsyncMock(return_value=driver)):
+        await connection.warm_pool(5)
+
+    driver.verify_connectivity.assert_awaited_once()
+    # Warm the connections search reads will use, not the leader's
+    assert {c.kwargs["default_access_mode"] for c in driver.session.call_args_list} == {"READ"}
+    assert _FakeSession.max_open == 5
+    assert _FakeSession.open_now == 0
+
+
+async def test_close_driver_resets_singleton(connection):
+    driver = MagicMock(close=AsyncMock())
+    connection._driver = driver
+
+    await connection.close_driver()
+    await connection.close_driver()
+
+    driver.close.assert_awaited_once()
+    assert connection._driver is None
+
+
+def test_pool_config_from_settings(connection, monkeypatch):
+    monkeypatch.setattr(connection, "NEO4J_MAX_POOL_SIZE", 20)
+    monkeypatch.setattr(connection, "NEO4J_LIVENESS_CHECK_S", "")
+    assert "liveness_check_timeout" not in connection.pool_config()
+
+    monkeypatch.setattr(connection, "NEO4J_LIVENESS_CHECK_S", "30")
+    config = connection.pool_config()
+    assert config["max_connection_pool_size"] == 20
+    assert config["liveness_check_timeout"] == 30.0
+
+
+async def test_pool_metrics_time_acquisitions_and_count_connections():
+    from src.db.connection import PoolMetrics
+
+    busy, free = MagicMock(in_use=True), MagicMock(in_use=False)
+
+    async def _acquire(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return busy
+
+    pool = MagicMock(connections={"a": [busy, free], "b": [MagicMock(in_use=False)]})
+    pool.acquire = _acquire
+    metrics = PoolMetrics()
+    metrics.instrument(MagicMock(_pool=pool))
+
+    assert await pool.acquire("access_mode") is busy
+    stats = metrics.stats()
+    assert (stats["in_use"], stats["idle"]) == (1, 2)
+    assert stats["acquisition_wait_ms"]["count"] == 1
+    assert stats["acquisition_wait_ms"]["max"] >= 10
+
+
+async def test_pool_metrics_degrade_without_driver_internals():
+    from src.db.connection import PoolMetrics
+
+    metrics = PoolMetrics()
+    metrics.instrument(object())
+    assert metrics.stats()["in_use"] is None
+
+
+@pytest.mark.parametrize("method, mode", [("execute_read", "READ"), ("execute_write", "WRITE")])
+async def test_managed_transactions_set_access_mode_and_share_bookmarks(connection, monkeypatch, method, mode):
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    setattr(session, method, AsyncMock(return_value="rows"))
+    driver = MagicMock()
+    driver.session.return_value = session
+    bookmarks = object()
+    monkeypatch.setattr(connection, "_bookmarks", bookmarks)
+
+    async def work(tx, skill_id):
+        return skill_id
+
+    with patch.object(connection, "get_driver", AsyncMock(return_value=driver)):
+        assert await getattr(connection, method)(work, "sk-1") == "rows"
+
+    session_kwargs = driver.session.call_args.kwargs
+    assert session_kwargs["default_access_mode"] == mode
+    assert session_kwargs["bookmark_manager"] is bookmarks
+    getattr(session, method).assert_awaited_once_with(work, "sk-1")
+
+
+@pytest.mark.parametrize("properties, ok", [
+    (["embedding", "product_area", "issue_type"], True),
+    (["embedding"], False),
+])
+async def test_vector_filtering_requires_filter_properties_in_index(connection, monkeypatch, properties, ok):
+    async def _run(query, **kwargs):
+        result = MagicMock(consume=AsyncMock())
+        result.single = AsyncMock(return_value={"properties": properties})
+        return result
+
+    session = MagicMock(run=AsyncMock(side_effect=_run))
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    driver = MagicMock()
+    driver.session.return_value = session
+    monkeypatch.setattr(connection, "NEO4J_VECTOR_FILTERING", True)
+
+    with patch.object(connection, "get_driver", AsyncMock(return_value=driver)):
+        if ok:
+            await connection.initialize_indexes()
+        else:
+            with pytest.raises(RuntimeError, match="DROP INDEX skill_embedding"):
+                await connection.initialize_indexes()
@@ -142,6 +142,15 @@ async def test_hybrid_search(created_skill):
     assert 0.0 <= results[0]["score"] <= 1.0
 
 
+@pytest.mark.integration
+async def test_get_skill_resolution(created_skill):
+    from src.db.queries import get_skill_resolution
+
+    body = await get_skill_resolution(created_skill.skill_id, created_skill.version)
+    assert body == created_skill.resolution_md
+    assert await get_skill_resolution("nonexistent-id") is None
+
+
 @pytest.mark.integration
 async def test_hybrid_search_vector_only(created_skill):
     from src.db.queries import hybrid_search
@@ -170,3 +179,21 @@ async def test_hybrid_search_min_score_filter(created_skill):
     # (may or may not return results depending on DB state, but scores must be >= 0.99)
     for r in results:
         assert r["score"] >= 0.99
+
+
+@pytest.mark.integration
+async def test_hybrid_search_single_mode(created_skill):
+    from unittest.mock import patch
+
+    from src.db import queries
+
+    with patch.object(queries, "HYBRID_SEARCH_MODE", "single"):
+        results = await queries.hybrid_search(
+            query_embedding=_TEST_EMBEDDING,
+            query_text="password reset",
+            top_k=5,
+        )
+    assert len(results) >= 1
+    assert results[0]["skill"].skill_id == created_skill.skill_id
+    assert not hasattr(results[0]["skill"], "embedding")
+    assert 0.0 <= results[0]["score"] <= 1.0
@@ -6,7 +6,7 @@ These test _merge_scores directly — no Neo4j required.
 import pytest
 
 from src.db.queries import _merge_scores
-from src.skills.models import Skill
+from src.skills.models import SkillCard
 from src.utils.config import EMBEDDING_DIM
 
 _EMBED = [1.0] + [0.0] * (EMBEDDING_DIM - 1)
@@ -175,9 +175,56 @@ class TestEdgeCases:
         scores = [r["score"] for r in result]
         assert scores == sorted(scores, reverse=True)
 
-    def test_returns_skill_objects(self):
-        """Each result contains a proper Skill instance."""
+    def test_returns_skill_cards(self):
+        """Each result contains a lightweight SkillCard, not a full Skill."""
         vec = [(_props("a"), 0.8)]
         result = _merge_scores(vec, [], min_score=0.0, top_k=5)
-        assert isinstance(result[0]["skill"], Skill)
+        assert isinstance(result[0]["skill"], SkillCard)
         assert result[0]["skill"].skill_id == "a"
+        assert not hasattr(result[0]["skill"], "embedding")
+
+
+class TestReciprocalRankFusion:
+    def test_top_of_both_lists_scores_one(self):
+        props_a, props_b = _props("a"), _props("b")
+        vec = [(props_a, 0.9), (props_b, 0.8)]
+        kw = [(props_a, 7.0), (props_b, 1.0)]
+        result = _merge_scores(vec, kw, min_score=0.0, top_k=5, fusion="rrf")
+        assert result[0]["skill"].skill_id == "a"
+        assert result[0]["score"] == pytest.approx(1.0)
+
+    def test_uses_ranks_not_score_spread(self):
+        """A huge BM25 gap doesn't outweigh the vector ranking the way min-max does."""
+        props_a, props_b = _props("a"), _props("b")
+        vec = [(props_a, 0.90), (props_b, 0.60)]
+        kw = [(props_b, 50.0), (props_a, 1.0)]
+        rrf = _merge_scores(vec, kw, min_score=0.0, top_k=5, fusion="rrf")
+        # Each is #1 on one signal and #2 on the other → tie
+        assert rrf[0]["score"] == pytest.approx(rrf[1]["score"])
+
+    def test_vector_only_normalizes_against_single_list(self):
+        vec = [(_props("a"), 0.4), (_props("b"), 0.3)]
+        result = _merge_scores(vec, [], min_score=0.0, top_k=5, fusion="rrf")
+        assert result[0]["score"] == pytest.approx(1.0)
+        assert result[1]["score"] == pytest.approx(61 / 62)
+
+    def test_components_still_reported(self):
+        props = _props("a")
+        result = _merge_scores([(props, 0.8)], [(props, 3.0)], 0.0, 5, fusion="rrf")
+        assert result[0]["vector_score"] == pytest.approx(0.8)
+        assert result[0]["keyword_score"] == pytest.approx(1.0)
+
+    def test_unknown_fusion_raises(self):
+        with pytest.raises(ValueError, match="Unknown fusion"):
+            _merge_scores([(_props("a"), 0.8)], [], 0.0, 5, fusion="borda")
+
+
+class TestLazyTopK:
+    def test_only_survivors_become_cards(self):
+        from unittest.mock import patch
+
+        vec = [(_props(f"s{i}"), 0.9 - i * 0.05) for i in range(10)]
+        with patch.object(SkillCard, "from_neo4j_node", wraps=SkillCard.from_neo4j_node) as build:
+            result = _merge_scores(vec, [], min_score=0.0, top_k=3)
+        assert [r["skill"].skill_id for r in result] == ["s0", "s1", "s2"]
+        assert build.call_count == 3
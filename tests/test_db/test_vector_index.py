@@ -0,0 +1,125 @@
+"""Unit tests for the in-process vector index replica — no Neo4j required."""
+
+import math
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.db.vector_index import LocalVectorIndex  # noqa: E402
+from src.utils.config import EMBEDDING_DIM  # noqa: E402
+
+
+def _axis(i: int, scale: float = 1.0) -> list[float]:
+    vec = [0.0] * EMBEDDING_DIM
+    vec[i] = scale
+    return vec
+
+
+def _card(skill_id: str) -> dict:
+    return {"skill_id": skill_id, "title": f"Skill {skill_id}", "version": 1}
+
+
+def _index(*ids: str) -> LocalVectorIndex:
+    index = LocalVectorIndex(capacity=2)
+    for i, sid in enumerate(ids):
+        index.upsert(sid, _axis(i), _card(sid))
+    index.ready = True
+    return index
+
+
+def test_search_exact_match_scores_one():
+    index = _index("a", "b", "c")
+    hits = index.search(_axis(1), k=1)
+
+    assert hits[0][0]["skill_id"] == "b"
+    assert hits[0][1] == pytest.approx(1.0)
+
+
+def test_search_uses_neo4j_cosine_scale():
+    """Orthogonal → 0.5, opposite → 0.0, matching Neo4j's (1 + cos) / 2."""
+    index = _index("a", "b")
+    index.upsert("neg", _axis(0, -1.0), _card("neg"))
+
+    scores = {card["skill_id"]: score for card, score in index.search(_axis(0), k=3)}
+
+    assert scores == pytest.approx({"a": 1.0, "b": 0.5, "neg": 0.0})
+
+
+def test_search_normalizes_and_orders_results():
+    index = _index("a", "b")
+    query = _axis(0, 3.0)
+    query[1] = 1.0
+
+    hits = index.search(query, k=5)
+
+    assert [c["skill_id"] for c, _ in hits] == ["a", "b"]
+    assert hits[0][1] == pytest.approx((1 + 3 / math.sqrt(10)) / 2, rel=1e-5)
+
+
+def test_upsert_grows_and_replaces():
+    index = _index("a", "b", "c", "d", "e")  # capacity 2 → grown twice
+    index.upsert("a", _axis(4), _card("a"))
+
+    assert len(index) == 5
+    top = [c["skill_id"] for c, _ in index.search(_axis(4), k=2)]
+    assert set(top) == {"a", "e"}
+
+
+def test_remove_keeps_rows_consistent():
+    index = _index("a", "b", "c")
+    index.remove("a")
+
+    assert "a" not in index
+    assert len(index) == 2
+    assert index.search(_axis(2), k=1)[0][0]["skill_id"] == "c"
+    assert index.search(_axis(1), k=1)[0][0]["skill_id"] == "b"
+
+
+def test_search_filters_walk_past_nonmatching_rows():
+    index = _index("a", "b", "c")
+    index._cards["c"]["product_area"] = "billing"
+
+    hits = index.search(_axis(0), k=2, filters={"product_area": "billing"})
+
+    assert [c["skill_id"] for c, _ in hits] == ["c"]
+    assert hits[0][1] == pytest.approx(0.5)
+
+
+def test_upsert_rejects_wrong_dimension():
+    index = LocalVectorIndex()
+    with pytest.raises(ValueError, match="dim"):
+        index.upsert("a", [1.0, 0.0], _card("a"))
+
+
+async def test_hybrid_search_uses_loaded_local_index():
+    from src.db import queries
+
+    index = _index("a", "b")
+    with patch.object(queries, "get_vector_index", return_value=index), \
+         patch.object(queries, "execute_read", AsyncMock(side_effect=AssertionError("no DB"))):
+        results = await queries.hybrid_search(_axis(0), "", top_k=1)
+
+    assert results[0]["skill"].skill_id == "a"
+    assert results[0]["score"] == pytest.approx(1.0)
+
+
+async def test_check_duplicate_below_threshold_skips_db():
+    from src.db import queries
+
+    index = _index("a")
+    with patch.object(queries, "get_vector_index", return_value=index), \
+         patch.object(queries, "execute_read", AsyncMock(side_effect=AssertionError("no DB"))):
+        assert await queries.check_duplicate(_axis(1), threshold=0.95) is None
+
+
+async def test_check_duplicate_hit_hydrates_full_skill():
+    from src.db import queries
+
+    index = _index("a")
+    with patch.object(queries, "get_vector_index", return_value=index), \
+         patch.object(queries, "get_skill", AsyncMock(return_value="full-skill")) as get_skill:
+        assert await queries.check_duplicate(_axis(0), threshold=0.95) == "full-skill"
+
+    get_skill.assert_awaited_once_with("a")
@@ -0,0 +1,161 @@
+"""Unit tests for the embed() micro-batcher — no API calls."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.llm.batcher import MicroBatcher
+
+
+async def test_concurrent_submits_share_one_flush():
+    flushed = []
+
+    async def flush(key, items):
+        flushed.append((key, items))
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(flush, max_items=10, max_wait_s=0.01)
+    results = await asyncio.gather(
+        batcher.submit("k", "a"), batcher.submit("k", "b"), batcher.submit("other", "c")
+    )
+
+    assert results == ["A", "B", "C"]
+    assert sorted(flushed) == [("k", ["a", "b"]), ("other", ["c"])]
+    assert batcher.stats()["avg_batch_size"] == 1.5
+
+
+async def test_full_batch_flushes_without_waiting():
+    batcher = MicroBatcher(AsyncMock(side_effect=lambda key, items: items), max_items=2, max_wait_s=10)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2)), timeout=1
+    )
+
+    assert results == [1, 2]
+
+
+async def test_full_batch_is_capped_at_max_items():
+    flushed = []
+
+    async def flush(key, items):
+        flushed.append(len(items))
+        return items
+
+    batcher = MicroBatcher(flush, max_items=100, max_wait_s=0.01)
+    results = await asyncio.gather(*(batcher.submit("k", i) for i in range(150)))
+
+    assert results == list(range(150))
+    assert flushed == [100, 50]
+
+
+async def test_lone_submit_skips_the_window():
+    batcher = MicroBatcher(AsyncMock(side_effect=lambda key, items: items), max_wait_s=10)
+
+    assert await asyncio.wait_for(batcher.submit("k", 1), timeout=1) == 1
+
+
+async def test_window_applies_while_a_flush_is_in_flight():
+    release = asyncio.Event()
+    flushed = []
+
+    async def flush(key, items):
+        flushed.append(items)
+        await release.wait()
+        return items
+
+    batcher = MicroBatcher(flush, max_wait_s=0.01)
+    first = asyncio.ensure_future(batcher.submit("k", 1))
+    await asyncio.sleep(0.001)
+    later = [asyncio.ensure_future(batcher.submit("k", i)) for i in (2, 3)]
+    await asyncio.sleep(0.02)
+    release.set()
+
+    assert await asyncio.gather(first, *later) == [1, 2, 3]
+    assert flushed == [[1], [2, 3]]
+
+
+async def test_per_item_errors_are_isolated():
+    async def flush(key, items):
+        return [ValueError(item) if item == "bad" else item for item in items]
+
+    batcher = MicroBatcher(flush, max_wait_s=0.001)
+    good, bad = await asyncio.gather(
+        batcher.submit("k", "good"), batcher.submit("k", "bad"), return_exceptions=True
+    )
+
+    assert good == "good"
+    assert isinstance(bad, ValueError)
+
+
+async def test_flush_failure_fails_whole_batch():
+    batcher = MicroBatcher(AsyncMock(side_effect=RuntimeError("down")), max_wait_s=0.001)
+
+    with pytest.raises(RuntimeError, match="down"):
+        await batcher.submit("k", "a")
+
+
+def _embedding(value):
+    embedding = MagicMock()
+    embedding.values = [value] + [0.0] * 767
+    return embedding
+
+
+async def test_concurrent_embeds_sent_as_one_request():
+    from src.llm import client
+
+    mock_client = MagicMock()
+    mock_client.aio.models.embed_content = AsyncMock(
+        return_value=MagicMock(embeddings=[_embedding(1.0), _embedding(-1.0)])
+    )
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        first, second = await asyncio.gather(
+            client.embed("refund", task_type="RETRIEVAL_QUERY"),
+            client.embed("login", task_type="RETRIEVAL_QUERY"),
+        )
+
+    mock_client.aio.models.embed_content.assert_awaited_once()
+    assert mock_client.aio.models.embed_content.call_args.kwargs["contents"] == ["refund", "login"]
+    assert (first[0], second[0]) == (1.0, -1.0)
+
+
+class _APIError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+async def test_rejected_batch_retried_per_item():
+    from src.llm import client
+
+    async def embed_content(model, contents, config):
+        if isinstance(contents, list) or contents == "bad":
+            raise _APIError(400)
+        return MagicMock(embeddings=[_embedding(1.0)])
+
+    mock_client = MagicMock()
+    mock_client.aio.models.embed_content = AsyncMock(side_effect=embed_content)
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        good, bad = await asyncio.gather(
+            client.embed("good"), client.embed("bad"), return_exceptions=True
+        )
+
+    assert good[0] == 1.0
+    assert isinstance(bad, _APIError)
+
+
+async def test_throttled_batch_not_fanned_out():
+    from src.llm import client
+
+    mock_client = MagicMock()
+    mock_client.aio.models.embed_content = AsyncMock(side_effect=_APIError(429))
+    with patch("src.llm.client._get_client", return_value=mock_client), \
+         patch.object(client._governors["embed"], "backoff_s", return_value=0):
+        results = await asyncio.gather(
+            client.embed("refund"), client.embed("login"), return_exceptions=True
+        )
+
+    assert all(isinstance(r, _APIError) and r.code == 429 for r in results)
+    # One batched request plus the governor's retries — never one per item
+    calls = mock_client.aio.models.embed_content.call_args_list
+    assert all(isinstance(c.kwargs["contents"], list) for c in calls)
@@ -0,0 +1,138 @@
+"""Unit tests for the record/replay cassette — no API calls."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.genai import types
+
+from src.llm.cassette import Cassette, CassetteMiss, request_key
+
+
+def _inner_client(text="hello", vectors=([0.1, 0.2],)):
+    inner = MagicMock()
+    inner.aio.models.generate_content = AsyncMock(
+        return_value=SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=3, candidates_token_count=1, total_token_count=4
+            ),
+        )
+    )
+    inner.aio.models.embed_content = AsyncMock(
+        return_value=SimpleNamespace(embeddings=[SimpleNamespace(values=v) for v in vectors])
+    )
+    return inner
+
+
+def test_key_covers_method_model_contents_and_config():
+    config = types.GenerateContentConfig(temperature=0.2)
+    base = request_key("generate_content", "flash", "p", config)
+    assert base == request_key("generate_content", "flash", "p", types.GenerateContentConfig(temperature=0.2))
+    assert base != request_key("generate_content", "flash", "p", types.GenerateContentConfig(temperature=0.3))
+    assert base != request_key("generate_content", "pro", "p", config)
+    assert base != request_key("embed_content", "flash", "p", config)
+
+
+async def test_record_then_replay_offline(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    config = types.GenerateContentConfig(temperature=0.2)
+    recorder = Cassette(path, "record", inner=_inner_client())
+    await recorder.aio.models.generate_content(model="flash", contents="p", config=config)
+    await recorder.aio.models.embed_content(model="embed", contents=["a"], config=None)
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["method"] for e in entries] == ["generate_content", "embed_content"]
+    assert all(e["latency_ms"] >= 0 for e in entries)
+
+    replay = Cassette(path, "replay")
+    response = await replay.aio.models.generate_content(model="flash", contents="p", config=config)
+    assert response.text == "hello"
+    assert response.usage_metadata.total_token_count == 4
+    embedded = await replay.aio.models.embed_content(model="embed", contents=["a"])
+    assert [e.values for e in embedded.embeddings] == [[0.1, 0.2]]
+
+    with pytest.raises(CassetteMiss):
+        await replay.aio.models.generate_content(model="flash", contents="other", config=config)
+    assert replay.stats()["hits"] == 2
+    assert replay.stats()["misses"] == 1
+
+
+async def test_repeated_request_replays_in_recorded_order(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    inner = _inner_client()
+    inner.aio.models.generate_content.side_effect = [
+        SimpleNamespace(text="first", usage_metadata=None),
+        SimpleNamespace(text="second", usage_metadata=None),
+    ]
+    recorder = Cassette(path, "record", inner=inner)
+    for _ in range(2):
+        await recorder.aio.models.generate_content(model="flash", contents="p")
+
+    replay = Cassette(path, "replay")
+    texts = [
+        (await replay.aio.models.generate_content(model="flash", contents="p")).text
+        for _ in range(3)
+    ]
+    assert texts == ["first", "second", "second"]
+
+
+async def test_replay_simulates_recorded_latency(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    entry = {
+        "key": request_key("generate_content", "flash", "p", None),
+        "method": "generate_content",
+        "model": "flash",
+        "request": {"contents": "p", "config": {}},
+        "response": {"text": "ok", "usage": None},
+        "latency_ms": 400.0,
+    }
+    path.write_text(json.dumps(entry) + "\n")
+
+    with patch("src.llm.cassette.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        await Cassette(path, "replay", latency_scale=0.5).aio.models.generate_content(
+            model="flash", contents="p"
+        )
+        await Cassette(path, "replay").aio.models.generate_content(model="flash", contents="p")
+
+    sleep.assert_awaited_once_with(pytest.approx(0.2))
+
+
+async def test_call_flash_replays_without_api_key(tmp_path, monkeypatch):
+    from src.llm import client
+
+    path = tmp_path / "cassette.jsonl"
+    monkeypatch.setattr(client, "_client", Cassette(path, "record", inner=_inner_client("judged")))
+    assert await client.call_flash("pick one") == "judged"
+
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.setattr(client, "_client", None)
+    monkeypatch.setattr(client, "LLM_CASSETTE_MODE", "replay")
+    monkeypatch.setattr(client, "LLM_CASSETTE_PATH", str(path))
+    assert await client.call_flash("pick one") == "judged"
+    assert client.cassette_stats()["hits"] == 1
+
+
+async def test_concurrent_embeds_replay_under_a_different_batch_split(tmp_path, monkeypatch):
+    import asyncio
+
+    from src.llm import client
+
+    path = tmp_path / "cassette.jsonl"
+    inner = _inner_client(vectors=([1.0, 0.0], [0.0, 1.0], [0.6, 0.8]))
+    monkeypatch.setattr(client, "_client", Cassette(path, "record", inner=inner))
+    texts = ["refund", "login", "invoice"]
+    recorded = await asyncio.gather(*(client.embed(t, task_type="RETRIEVAL_QUERY") for t in texts))
+    assert isinstance(inner.aio.models.embed_content.call_args.kwargs["contents"], list)
+
+    client.clear_embedding_cache()
+    monkeypatch.setattr(client, "_client", Cassette(path, "replay"))
+    # A lone call, then a batch of the other two
+    first = await client.embed("refund", task_type="RETRIEVAL_QUERY")
+    rest = await asyncio.gather(
+        client.embed("invoice", task_type="RETRIEVAL_QUERY"),
+        client.embed("login", task_type="RETRIEVAL_QUERY"),
+    )
+    assert [first, rest[1], rest[0]] == recorded
+    assert client.cassette_stats()["misses"] == 0
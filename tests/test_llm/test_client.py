@@ -167,6 +167,81 @@ async def test_embed_passes_task_type_and_dimensionality():
     assert config.output_dimensionality == 768
 
 
+def _mock_embed_client(values=None):
+    mock_embedding = MagicMock()
+    mock_embedding.values = values or [0.1] * 768
+    mock_response = MagicMock()
+    mock_response.embeddings = [mock_embedding]
+    mock_client = MagicMock()
+    mock_client.aio.models.embed_content = AsyncMock(return_value=mock_response)
+    return mock_client
+
+
+async def test_embed_cache_hit_skips_api_call():
+    from src.llm import client
+
+    mock_client = _mock_embed_client()
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        first = await client.embed("cancel my subscription", task_type="RETRIEVAL_QUERY")
+        second = await client.embed("  cancel my   subscription ", task_type="RETRIEVAL_QUERY")
+
+    assert first == second
+    mock_client.aio.models.embed_content.assert_awaited_once()
+    stats = client.embedding_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+async def test_embed_cache_keyed_by_task_type_and_model():
+    from src.llm import client
+
+    mock_client = _mock_embed_client()
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        await client.embed("refund", task_type="RETRIEVAL_QUERY")
+        await client.embed("refund", task_type="RETRIEVAL_DOCUMENT")
+        with patch("src.llm.client.EMBEDDING_MODEL", "other-embedding-model"):
+            await client.embed("refund", task_type="RETRIEVAL_QUERY")
+
+    assert mock_client.aio.models.embed_content.await_count == 3
+
+
+async def test_embed_cache_returns_copy():
+    from src.llm import client
+
+    mock_client = _mock_embed_client()
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        first = await client.embed("refund")
+        first[0] = 99.0
+        second = await client.embed("refund")
+
+    assert second[0] != 99.0
+
+
+async def test_embed_batch_one_request_dedupes_and_uses_cache():
+    from src.llm import client
+
+    def _embedding(value):
+        embedding = MagicMock()
+        embedding.values = [value] + [0.0] * 767
+        return embedding
+
+    mock_client = MagicMock()
+    mock_client.aio.models.embed_content = AsyncMock(
+        return_value=MagicMock(embeddings=[_embedding(2.0), _embedding(3.0)])
+    )
+    with patch("src.llm.client._get_client", return_value=_mock_embed_client([1.0] + [0.0] * 767)):
+        await client.embed("cached", task_type="RETRIEVAL_QUERY")
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        vectors = await client.embed_batch(
+            ["refund", "cached", "login", " refund "], task_type="RETRIEVAL_QUERY"
+        )
+
+    mock_client.aio.models.embed_content.assert_awaited_once()
+    assert mock_client.aio.models.embed_content.call_args.kwargs["contents"] == ["refund", "login"]
+    assert [v[0] for v in vectors] == [1.0, 1.0, 1.0, 1.0]  # all L2-normalized
+    assert vectors[0] is not vectors[3]
+
+
 # --- Integration tests (need GOOGLE_API_KEY) ---
 
 pytestmark_integration = pytest.mark.skipif(
@@ -0,0 +1,168 @@
+"""Unit tests for priority dispatch of Gemini calls — no API calls."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.llm.dispatch import PriorityDispatcher, parse_weights
+
+
+def _gate():
+    """call() factory that blocks until the returned event is set, logging start order."""
+    started = []
+    release = asyncio.Event()
+
+    def make(label):
+        async def call():
+            started.append(label)
+            await release.wait()
+            return label
+        return call
+
+    return make, started, release
+
+
+async def test_writes_cannot_take_reserved_read_slots():
+    dispatcher = PriorityDispatcher(max_concurrency=4, read_reserved_share=0.5)
+    make, started, release = _gate()
+
+    tasks = [asyncio.ensure_future(dispatcher.run("write", make(f"w{i}"))) for i in range(4)]
+    await asyncio.sleep(0)
+    assert started == ["w0", "w1"]
+
+    reads = [asyncio.ensure_future(dispatcher.run("read", make(f"r{i}"))) for i in range(2)]
+    await asyncio.sleep(0)
+    assert started == ["w0", "w1", "r0", "r1"]
+
+    release.set()
+    await asyncio.gather(*tasks, *reads)
+    assert dispatcher.stats()["write"]["max_queue_depth"] == 2
+
+
+async def test_queued_reads_jump_queued_writes():
+    dispatcher = PriorityDispatcher(
+        max_concurrency=1, weights={"read": 10, "write": 1}, read_reserved_share=0
+    )
+    make, started, release = _gate()
+
+    first = asyncio.ensure_future(dispatcher.run("write", make("w0")))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.ensure_future(dispatcher.run("write", make("w1"))),
+        asyncio.ensure_future(dispatcher.run("read", make("r0"))),
+        asyncio.ensure_future(dispatcher.run("read", make("r1"))),
+    ]
+    await asyncio.sleep(0)
+    assert dispatcher.stats()["read"]["queue_depth"] == 2
+
+    release.set()
+    await asyncio.gather(first, *queued)
+    assert started == ["w0", "r0", "r1", "w1"]
+
+
+async def test_weights_keep_writes_progressing():
+    dispatcher = PriorityDispatcher(
+        max_concurrency=1, weights={"read": 2, "write": 1}, read_reserved_share=0
+    )
+    order = []
+
+    def make(label):
+        async def call():
+            order.append(label)
+            await asyncio.sleep(0)
+        return call
+
+    tasks = [asyncio.ensure_future(dispatcher.run("read", make("r"))) for _ in range(6)]
+    tasks += [asyncio.ensure_future(dispatcher.run("write", make("w"))) for _ in range(3)]
+    await asyncio.gather(*tasks)
+
+    # First read runs immediately; after that writes get ~1 of every 3 slots
+    assert "w" in order[:4]
+
+
+async def test_long_read_history_does_not_let_writes_jump_reads():
+    dispatcher = PriorityDispatcher(
+        max_concurrency=1, weights={"read": 4, "write": 1}, read_reserved_share=0
+    )
+    for _ in range(1000):
+        await dispatcher.run("read", AsyncMock())
+    make, started, release = _gate()
+
+    first = asyncio.ensure_future(dispatcher.run("read", make("r0")))
+    await asyncio.sleep(0)
+    queued = [asyncio.ensure_future(dispatcher.run("write", make(f"w{i}"))) for i in range(3)]
+    queued += [asyncio.ensure_future(dispatcher.run("read", make(f"r{i}"))) for i in range(1, 5)]
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(first, *queued)
+    # The 4:1 split from a fresh start (r0 included) — not a burst of writes
+    # catching up on the read history
+    assert started == ["r0", "r1", "r2", "r3", "w0", "r4", "w1", "w2"]
+
+
+async def test_retry_backoff_does_not_hold_a_slot():
+    from src.llm.governor import RateGovernor
+
+    class _Throttled(Exception):
+        code = 429
+
+    dispatcher = PriorityDispatcher(max_concurrency=1, read_reserved_share=0)
+    governor = RateGovernor("test")
+
+    async def read():
+        return dispatcher.in_flight["write"]
+
+    with patch.object(governor, "backoff_s", return_value=0.05):
+        call = AsyncMock(side_effect=[_Throttled(), "ok"])
+        write = asyncio.ensure_future(governor.run(call, slot=lambda: dispatcher.slot("write")))
+        await asyncio.sleep(0.01)
+        # The write is sleeping between attempts; a read gets the only slot at once
+        assert await asyncio.wait_for(dispatcher.run("read", read), 0.02) == 0
+        assert await write == "ok"
+
+
+async def test_cancelled_waiter_does_not_leak_slot():
+    dispatcher = PriorityDispatcher(max_concurrency=1, read_reserved_share=0)
+    make, _, release = _gate()
+
+    running = asyncio.ensure_future(dispatcher.run("read", make("a")))
+    await asyncio.sleep(0)
+    waiting = asyncio.ensure_future(dispatcher.run("read", make("b")))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    release.set()
+    await running
+
+    assert await dispatcher.run("read", AsyncMock(return_value="c")) == "c"
+    assert dispatcher.in_flight == {"read": 0, "write": 0}
+
+
+def test_parse_weights():
+    assert parse_weights("read=8") == {"read": 8.0, "write": 1.0}
+    with pytest.raises(ValueError, match="Unknown priority class"):
+        parse_weights("batch=2")
+
+
+async def test_unknown_priority_rejected():
+    with pytest.raises(ValueError):
+        await PriorityDispatcher().run("urgent", AsyncMock())
+
+
+async def test_embed_priority_follows_task_type():
+    from src.llm import client
+
+    mock_embedding = MagicMock()
+    mock_embedding.values = [0.1] * 768
+    mock_client = MagicMock()
+    mock_client.aio.models.embed_content = AsyncMock(
+        return_value=MagicMock(embeddings=[mock_embedding])
+    )
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        await client.embed("refund", task_type="RETRIEVAL_QUERY")
+        await client.embed("refund playbook")
+
+    dispatch = client.rate_governor_stats()["dispatch"]
+    assert dispatch["read"]["dispatched"] == 1
+    assert dispatch["write"]["dispatched"] == 1
@@ -0,0 +1,77 @@
+"""Unit tests for the embedding backends — no API calls."""
+
+import math
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.llm.embedders import HashingEmbedder
+
+
+def _cos(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def test_hashing_vectors_are_normalized_and_deterministic():
+    embedder = HashingEmbedder(768)
+    vec = embedder.vector("Customer cannot reset their password")
+
+    assert len(vec) == 768
+    assert math.isclose(math.sqrt(sum(x * x for x in vec)), 1.0, rel_tol=1e-9)
+    assert vec == HashingEmbedder(768).vector("Customer cannot reset their password")
+
+
+def test_hashing_similarity_follows_ngram_overlap():
+    embedder = HashingEmbedder(768)
+    query = embedder.vector("refund for a double charge")
+
+    close = embedder.vector("Customer was charged twice and wants a refund")
+    far = embedder.vector("Shipping address change after dispatch")
+    assert _cos(query, close) > _cos(query, far)
+    # Case and whitespace don't matter
+    assert _cos(query, embedder.vector("  REFUND for a   double charge")) == pytest.approx(1.0)
+
+
+def test_hashing_empty_text_is_zero_vector():
+    assert HashingEmbedder(16).vector("  ") == [0.0] * 16
+
+
+async def test_embed_uses_configured_local_backend(monkeypatch):
+    from src.llm import client
+
+    def _no_api():
+        raise AssertionError("local backend must not touch the Gemini client")
+
+    monkeypatch.setattr(client, "EMBEDDING_BACKEND", "hashing")
+    monkeypatch.setattr(client, "_embedder", None)
+    monkeypatch.setattr(client, "_get_client", _no_api)
+
+    single = await client.embed("login loop on mobile", task_type="RETRIEVAL_QUERY")
+    batch = await client.embed_batch(["login loop on mobile", "refund"])
+
+    assert len(single) == client.EMBEDDING_DIM
+    assert batch[0] == single
+    assert client.get_embedder().model.startswith("hashing")
+    # Recomputing is cheaper than caching
+    assert client.embedding_cache_stats()["size"] == 0
+
+
+def test_unknown_backend_rejected(monkeypatch):
+    from src.llm import client
+
+    monkeypatch.setattr(client, "EMBEDDING_BACKEND", "word2vec")
+    monkeypatch.setattr(client, "_embedder", None)
+    with pytest.raises(ValueError, match="EMBEDDING_BACKEND"):
+        client.get_embedder()
+
+
+def test_client_imports_without_numpy():
+    # numpy is only in the local-index extra; the default install must start
+    code = "import sys; sys.modules['numpy'] = None; import src.llm.client"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,68 @@
+"""Unit tests for the persistent embedding store — local SQLite only."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.llm.embedding_store import EmbeddingStore, store_key
+
+
+def test_round_trip_is_float32(tmp_path):
+    store = EmbeddingStore(tmp_path / "emb.sqlite")
+    key = store_key("refund", "RETRIEVAL_QUERY", "model", 3)
+    store.put(key, [0.1, 0.2, 0.3])
+
+    assert store.get(key) == pytest.approx([0.1, 0.2, 0.3], rel=1e-6)
+    assert store.size_bytes() == 12
+    assert store.get(store_key("refund", "RETRIEVAL_DOCUMENT", "model", 3)) is None
+
+
+def test_second_connection_reads_same_file(tmp_path):
+    writer = EmbeddingStore(tmp_path / "emb.sqlite")
+    reader = EmbeddingStore(tmp_path / "emb.sqlite")
+    writer.put("k", [1.0, 2.0])
+
+    assert reader.get("k") == [1.0, 2.0]
+
+
+def test_evicts_least_recently_used_over_size_limit(tmp_path):
+    store = EmbeddingStore(tmp_path / "emb.sqlite", max_bytes=10 * 8)
+    for i in range(10):
+        store.put(f"k{i}", [float(i), 0.0])
+    store._conn.execute("UPDATE embeddings SET accessed = 0 WHERE key = 'k5'")
+
+    store.put("k10", [10.0, 0.0])
+
+    assert store.get("k5") is None
+    assert store.get("k10") == [10.0, 0.0]
+    assert store.size_bytes() <= store.max_bytes
+    assert store.stats()["evictions"] == 1
+
+
+def test_key_covers_all_inputs():
+    base = store_key("a", "RETRIEVAL_QUERY", "m", 768)
+    assert base != store_key("a", "RETRIEVAL_QUERY", "m", 1536)
+    assert base != store_key("a", "RETRIEVAL_QUERY", "m2", 768)
+    assert base == store_key("a", "RETRIEVAL_QUERY", "m", 768)
+
+
+async def test_embed_reads_through_disk_store(tmp_path):
+    from src.llm import client
+
+    mock_embedding = MagicMock()
+    mock_embedding.values = [1.0] + [0.0] * 767
+    mock_client = MagicMock()
+    mock_client.aio.models.embed_content = AsyncMock(
+        return_value=MagicMock(embeddings=[mock_embedding])
+    )
+    store = EmbeddingStore(tmp_path / "emb.sqlite")
+
+    with patch("src.llm.client._embedding_store", store), \
+         patch("src.llm.client._get_client", return_value=mock_client):
+        first = await client.embed("refund", task_type="RETRIEVAL_QUERY")
+        client.clear_embedding_cache()  # simulate a restart
+        second = await client.embed(" refund ", task_type="RETRIEVAL_QUERY")
+
+    mock_client.aio.models.embed_content.assert_awaited_once()
+    assert second == first
+    assert len(store) == 1
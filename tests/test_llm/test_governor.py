@@ -0,0 +1,116 @@
+"""Unit tests for the Gemini rate governor — no API calls."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.llm.governor import RateGovernor, TokenBucket
+
+
+class _APIError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def _governor(**kwargs) -> RateGovernor:
+    kwargs.setdefault("retry_base_s", 0.0)
+    return RateGovernor("test", **kwargs)
+
+
+async def test_concurrency_capped():
+    governor = _governor(max_concurrency=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        peak = max(peak, governor.in_flight)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    results = await asyncio.gather(*(governor.run(call) for _ in range(6)))
+
+    assert results == ["ok"] * 6
+    assert peak == 2
+    assert governor.in_flight == 0
+
+
+async def test_throttle_halves_limit_and_retries():
+    governor = _governor(max_concurrency=8)
+    call = AsyncMock(side_effect=[_APIError(429), "ok"])
+
+    assert await governor.run(call) == "ok"
+    stats = governor.stats()
+    assert stats["throttled"] == 1
+    assert stats["retries"] == 1
+    # Halved to 4, then one success adds 1/4
+    assert stats["concurrency_limit"] == pytest.approx(4.25)
+
+
+async def test_limit_never_drops_below_one():
+    governor = _governor(max_concurrency=2, max_retries=5)
+    call = AsyncMock(side_effect=[_APIError(503)] * 4 + ["ok"])
+
+    assert await governor.run(call) == "ok"
+    assert governor.limit >= 1.0
+
+
+async def test_non_retryable_error_raises_immediately():
+    governor = _governor(max_concurrency=4)
+    call = AsyncMock(side_effect=_APIError(400))
+
+    with pytest.raises(_APIError):
+        await governor.run(call)
+    call.assert_awaited_once()
+    assert governor.stats()["failures"] == 1
+
+
+async def test_retries_exhausted_raises():
+    governor = _governor(max_retries=2)
+    call = AsyncMock(side_effect=_APIError(500))
+
+    with pytest.raises(_APIError):
+        await governor.run(call)
+    assert call.await_count == 3
+
+
+def test_backoff_is_jittered_and_capped():
+    governor = RateGovernor("test", retry_base_s=1.0, retry_max_s=3.0)
+    with patch("src.llm.governor.random.uniform", side_effect=lambda lo, hi: hi) as uniform:
+        assert governor.backoff_s(0) == 1.0
+        assert governor.backoff_s(5) == 3.0
+    assert uniform.call_args.args[0] == 0
+
+
+async def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate_per_min=6000)  # 100 per second
+    bucket._level = 0.0
+
+    waited = await bucket.acquire(2)
+
+    assert 0.0 < waited <= 0.02
+    assert bucket.level < 1.0
+
+
+async def test_unlimited_bucket_never_waits():
+    assert await TokenBucket(0).acquire(1e9) == 0.0
+
+
+async def test_call_pro_json_goes_through_pro_governor():
+    from src.llm import client
+
+    mock_response = MagicMock()
+    mock_response.text = '{"ok": true}'
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(
+        side_effect=[_APIError(429), mock_response]
+    )
+
+    with patch("src.llm.client._get_client", return_value=mock_client), \
+         patch.object(client._governors["pro"], "retry_base_s", 0.0):
+        assert await client.call_pro_json("extract") == {"ok": True}
+
+    stats = client.rate_governor_stats()["pro"]
+    assert stats["calls"] == 1
+    assert stats["throttled"] == 1
@@ -0,0 +1,111 @@
+"""Unit tests for request hedging — no API calls."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.llm.hedging import Hedger
+
+
+def _warm(hedger: Hedger, latency_s: float = 0.01, n: int = 20) -> None:
+    hedger._latencies.extend([latency_s] * n)
+    for _ in range(n):
+        hedger._note_call(False)
+
+
+def _call(results: list, delays: list[float]):
+    """call() factory: the i-th invocation sleeps delays[i] then returns results[i]."""
+    calls = []
+
+    async def call():
+        i = len(calls)
+        calls.append(i)
+        await asyncio.sleep(delays[i])
+        if isinstance(results[i], Exception):
+            raise results[i]
+        return results[i]
+
+    return call, calls
+
+
+async def test_no_hedge_until_enough_samples():
+    hedger = Hedger(min_samples=5)
+    call, calls = _call(["a"], [0.05])
+
+    assert hedger.delay_s() is None
+    assert await hedger.run(call) == "a"
+    assert calls == [0]
+
+
+async def test_slow_primary_is_hedged_and_hedge_wins():
+    hedger = Hedger(percentile=95, max_extra_rate=0.5, min_samples=20)
+    _warm(hedger)
+    call, calls = _call(["slow", "fast"], [1.0, 0.0])
+
+    assert await hedger.run(call) == "fast"
+    assert calls == [0, 1]
+    stats = hedger.stats()
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+    assert stats["win_rate"] == 1.0
+
+
+async def test_fast_primary_not_hedged():
+    hedger = Hedger(max_extra_rate=0.5)
+    _warm(hedger, latency_s=0.5)
+    call, calls = _call(["a"], [0.0])
+
+    assert await hedger.run(call) == "a"
+    assert calls == [0]
+    assert hedger.stats()["hedged"] == 0
+
+
+async def test_extra_rate_cap_blocks_hedging():
+    hedger = Hedger(max_extra_rate=0.0)
+    _warm(hedger)
+    call, calls = _call(["slow"], [0.05])
+
+    assert await hedger.run(call) == "slow"
+    assert calls == [0]
+
+
+async def test_failed_hedge_falls_back_to_primary():
+    hedger = Hedger(max_extra_rate=0.5)
+    _warm(hedger)
+    call, _ = _call(["primary", RuntimeError("boom")], [0.05, 0.0])
+
+    assert await hedger.run(call) == "primary"
+    assert hedger.stats()["hedge_wins"] == 0
+
+
+async def test_both_failing_raises():
+    hedger = Hedger(max_extra_rate=0.5)
+    _warm(hedger)
+    call, _ = _call([RuntimeError("first"), RuntimeError("second")], [0.05, 0.0])
+
+    with pytest.raises(RuntimeError):
+        await hedger.run(call)
+
+
+def test_delay_is_latency_percentile():
+    hedger = Hedger(percentile=90, min_samples=1)
+    hedger._latencies.extend(i / 100 for i in range(1, 11))
+
+    assert hedger.delay_s() == pytest.approx(0.09)
+
+
+async def test_call_flash_hedges_only_when_enabled_and_requested():
+    from src.llm import client
+
+    mock_response = MagicMock()
+    mock_response.text = "ok"
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+
+    with patch("src.llm.client._get_client", return_value=mock_client), \
+         patch("src.llm.client.LLM_HEDGING", True):
+        await client.call_flash("judge this", hedge=True)
+        await client.call_flash("not hedged")
+
+    assert client.hedging_stats()["flash"]["calls"] == 1
@@ -0,0 +1,95 @@
+"""Unit tests for the incremental JSON object parser and streamed Pro calls."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.llm.json_stream import StreamingJSONObjectParser
+
+DOC = {
+    "title": "Refund, \"double\" charge",
+    "problem": "Charged twice {oops}",
+    "conditions": ["card payment", "within 30 days"],
+    "keywords": [],
+    "meta": {"nested": [1, {"a": "]"}]},
+    "resolution": "# Steps\n**Do:** Refund\\",
+}
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_fields_fire_in_order_regardless_of_chunking(size):
+    seen = []
+    parser = StreamingJSONObjectParser(lambda name, value: seen.append((name, value)))
+    for chunk in _chunks(json.dumps(DOC, indent=2), size):
+        parser.feed(chunk)
+
+    assert seen == list(DOC.items())
+    assert parser.close() == DOC
+
+
+def test_field_fires_before_object_closes():
+    seen = []
+    parser = StreamingJSONObjectParser(lambda name, value: seen.append(name))
+    parser.feed('{"problem": "x", "keywords": ["a", "b"], "resolution": "# long')
+    assert seen == ["problem", "keywords"]
+    with pytest.raises(ValueError, match="ended before"):
+        parser.close()
+
+
+def test_rejects_non_object_and_trailing_data():
+    with pytest.raises(ValueError):
+        StreamingJSONObjectParser().feed("[1, 2]")
+    parser = StreamingJSONObjectParser()
+    parser.feed('{"a": 1} ')
+    with pytest.raises(ValueError, match="after"):
+        parser.feed("{")
+
+
+async def test_call_pro_json_stream_parses_chunks_and_usage():
+    from src.llm import client
+
+    async def _stream():
+        for i, text in enumerate(_chunks(json.dumps(DOC), 5)):
+            yield SimpleNamespace(
+                text=text,
+                usage_metadata=SimpleNamespace(prompt_token_count=50, candidates_token_count=i),
+            )
+
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content_stream = AsyncMock(return_value=_stream())
+    seen = []
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        result = await client.call_pro_json_stream(
+            "extract", lambda name, value: seen.append(name), site="create.extract"
+        )
+
+    assert result == DOC
+    assert seen == list(DOC)
+    site = client.llm_call_stats()["sites"]["create.extract:pro"]
+    assert site["prompt_tokens"] == 50
+    assert site["output_tokens"] == len(_chunks(json.dumps(DOC), 5)) - 1
+
+
+async def test_stream_failure_after_partial_output_is_not_retried():
+    from src.llm import client
+
+    class _Unavailable(Exception):
+        code = 503
+
+    async def _broken():
+        yield SimpleNamespace(text='{"problem": "x",', usage_metadata=None)
+        raise _Unavailable()
+
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content_stream = AsyncMock(side_effect=lambda **_: _broken())
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        with pytest.raises(RuntimeError, match="partial output"):
+            await client.call_pro_json_stream("extract", lambda name, value: None)
+
+    assert mock_client.aio.models.generate_content_stream.await_count == 1
@@ -0,0 +1,94 @@
+"""Unit tests for the call_pro_json response cache — no API calls."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.llm.response_cache import DiskResponseStore, ResponseCache, response_key
+
+
+def _pro_client(*texts):
+    responses = []
+    for text in texts:
+        response = MagicMock()
+        response.text = text
+        responses.append(response)
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(side_effect=responses)
+    return mock_client
+
+
+def test_key_covers_model_prompt_and_temperature():
+    base = response_key("pro", "prompt", 0.3)
+    assert base == response_key("pro", "prompt", 0.3)
+    assert base != response_key("pro", "prompt ", 0.3)
+    assert base != response_key("pro", "prompt", 0.4)
+    assert base != response_key("other", "prompt", 0.3)
+
+
+def test_disk_tier_expires_after_ttl(tmp_path):
+    store = DiskResponseStore(tmp_path / "pro.sqlite", ttl_s=60)
+    store.put("k", '{"a": 1}')
+    assert store.get("k") == '{"a": 1}'
+
+    store._conn.execute("UPDATE responses SET created = created - 120")
+    assert store.get("k") is None
+    assert len(store) == 0
+
+
+def test_disk_tier_evicts_over_size_limit(tmp_path):
+    store = DiskResponseStore(tmp_path / "pro.sqlite", max_bytes=30)
+    for i in range(5):
+        store.put(f"k{i}", "x" * 10)
+
+    assert store.size_bytes() <= 30
+    assert store.get("k4") == "x" * 10
+    assert store.get("k0") is None
+
+
+def test_disk_tier_tracks_size_without_scanning(tmp_path):
+    store = DiskResponseStore(tmp_path / "pro.sqlite", max_bytes=1000)
+    store.put("k", "x" * 10)
+    store.put("k", "x" * 4)  # replacing a row swaps its size
+    store.put("j", "y" * 6)
+
+    with patch.object(store, "size_bytes", side_effect=AssertionError("full scan")):
+        store.put("i", "z" * 5)
+    assert store._size == store.size_bytes() == 15
+
+
+def test_disk_hit_promoted_to_memory(tmp_path):
+    disk = DiskResponseStore(tmp_path / "pro.sqlite")
+    ResponseCache(8, 0, disk).set("k", {"title": "Refund"})
+
+    fresh = ResponseCache(8, 0, disk)  # new process, same file
+    assert fresh.get("k") == {"title": "Refund"}
+    assert fresh.get("k") == {"title": "Refund"}
+    assert fresh.disk_hits == 1
+
+
+async def test_call_pro_json_cache_is_opt_in():
+    from src.llm import client
+
+    mock_client = _pro_client('{"n": 1}', '{"n": 2}', '{"n": 3}')
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        first = await client.call_pro_json("extract this", cache=True)
+        first["n"] = 99  # callers may mutate their copy
+        second = await client.call_pro_json("extract this", cache=True)
+        uncached = await client.call_pro_json("extract this")
+
+    assert second == {"n": 1}
+    assert uncached == {"n": 2}
+    assert mock_client.aio.models.generate_content.await_count == 2
+    assert client.response_cache_stats()["hits"] == 1
+
+
+async def test_create_passes_extraction_cache_setting():
+    from src.orchestration import create
+
+    with patch.object(create, "PRO_CACHE_EXTRACTION", True), \
+         patch.object(create, "call_pro_json", AsyncMock(side_effect=RuntimeError("stop"))) as pro:
+        with pytest.raises(RuntimeError, match="stop"):
+            await create.create_skill_orchestration("conversation")
+
+    assert pro.call_args.kwargs == {"cache": True, "site": "create.extract"}
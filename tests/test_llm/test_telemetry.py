@@ -0,0 +1,81 @@
+"""Unit tests for LLM call telemetry — no API calls."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.llm.telemetry import Telemetry
+from src.utils.histogram import Histogram
+
+
+class _Throttled(Exception):
+    code = 429
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    hist = Histogram((10, 100, 1000))
+    for value in [5] * 90 + [50] * 9 + [3000]:
+        hist.observe(value)
+
+    snap = hist.snapshot()
+    assert snap["count"] == 100
+    assert snap["p50"] == 10
+    assert snap["p95"] == 100
+    assert snap["max"] == 3000
+    assert snap["buckets"] == {"le_10": 90, "le_100": 9, "le_1000": 0, "inf": 1}
+
+
+def test_track_records_errors_and_cost():
+    telemetry = Telemetry({"pro": (2.0, 12.0)})
+    with telemetry.track("create.extract", "pro", "pro-model") as record:
+        record.prompt_tokens, record.output_tokens = 1000, 500
+    with pytest.raises(RuntimeError):
+        with telemetry.track("create.extract", "pro", "pro-model"):
+            raise RuntimeError("boom")
+
+    site = telemetry.snapshot()["sites"]["create.extract:pro"]
+    assert site["calls"] == 2
+    assert site["errors"] == 1
+    assert site["cost_usd"] == pytest.approx((1000 * 2.0 + 500 * 12.0) / 1e6)
+
+
+async def test_call_flash_records_usage_and_retries_per_site():
+    from src.llm import client
+
+    response = SimpleNamespace(
+        text="ok",
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=120, candidates_token_count=8, thoughts_token_count=30
+        ),
+    )
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(side_effect=[_Throttled(), response])
+    with patch("src.llm.client._get_client", return_value=mock_client), \
+         patch.object(client._governors["flash"], "backoff_s", return_value=0):
+        await client.call_flash("judge this", site="search.judge")
+
+    site = client.llm_call_stats()["sites"]["search.judge:flash"]
+    assert site["calls"] == 1
+    assert site["requests"] == 1
+    assert site["retries"] == 1
+    assert site["prompt_tokens"] == 120
+    assert site["output_tokens"] == 38
+    assert site["latency_ms"]["count"] == 1
+
+
+async def test_embed_cache_hits_are_counted_not_billed():
+    from src.llm import client
+
+    embedding = MagicMock()
+    embedding.values = [1.0] + [0.0] * 767
+    mock_client = MagicMock()
+    mock_client.aio.models.embed_content = AsyncMock(return_value=MagicMock(embeddings=[embedding]))
+    with patch("src.llm.client._get_client", return_value=mock_client):
+        await client.embed("refund please", site="create.embed")
+        await client.embed("refund please", site="create.embed")
+
+    site = client.llm_call_stats()["sites"]["create.embed:embed"]
+    assert site["calls"] == 2
+    assert site["cache_hits"] == 1
+    assert site["prompt_tokens"] == round(len("refund please") / 4)
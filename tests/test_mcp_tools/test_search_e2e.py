@@ -33,6 +33,12 @@ def _make_skill(**overrides) -> Skill:
     return Skill(**defaults)
 
 
+async def _consume_embedding(query_embedding, query_text, **kwargs):
+    """hybrid_search stub that, like the real one, awaits the in-flight embedding."""
+    await query_embedding
+    return []
+
+
 # --- Happy path: full pipeline ---
 
 
@@ -146,13 +152,15 @@ async def test_search_full_pipeline_multiple_candidates(mock_embed, mock_flash,
 async def test_search_embeds_with_retrieval_query(mock_embed, mock_flash, mock_db):
     """Embedding uses RETRIEVAL_QUERY task type (asymmetric search)."""
     mock_embed.return_value = [0.1] * 768
-    mock_db.hybrid_search = AsyncMock(return_value=[])
+    mock_db.hybrid_search = AsyncMock(side_effect=_consume_embedding)
 
     from src.server.server import search_skills
 
     await search_skills.fn(query="test query")
 
-    mock_embed.assert_awaited_once_with("test query", task_type="RETRIEVAL_QUERY")
+    mock_embed.assert_called_once_with(
+        "test query", task_type="RETRIEVAL_QUERY", hedge=True, site="search.embed"
+    )
 
 
 @patch("src.orchestration.search.db")
@@ -161,17 +169,21 @@ async def test_search_embeds_with_retrieval_query(mock_embed, mock_flash, mock_d
 async def test_search_passes_embedding_and_query_to_hybrid_search(
     mock_embed, mock_flash, mock_db
 ):
-    """hybrid_search receives the embedding vector and raw query text."""
+    """hybrid_search receives the (in-flight) embedding and raw query text."""
     mock_embed.return_value = [0.5] * 768
-    mock_db.hybrid_search = AsyncMock(return_value=[])
+    seen = []
+
+    async def _hybrid_search(query_embedding, query_text, **kwargs):
+        seen.append((await query_embedding, query_text, kwargs))
+        return []
+
+    mock_db.hybrid_search = AsyncMock(side_effect=_hybrid_search)
 
     from src.server.server import search_skills
 
     await search_skills.fn(query="password reset help")
 
-    mock_db.hybrid_search.assert_awaited_once_with(
-        [0.5] * 768, "password reset help", top_k=5
-    )
+    assert seen == [([0.5] * 768, "password reset help", {"top_k": 5, "filters": None})]
 
 
 @patch("src.orchestration.search.db")
@@ -204,13 +216,15 @@ async def test_search_judge_prompt_contains_query_and_candidates(
 async def test_search_strips_query_before_orchestration(mock_embed, mock_flash, mock_db):
     """Whitespace-padded query is stripped before embedding and search."""
     mock_embed.return_value = [0.1] * 768
-    mock_db.hybrid_search = AsyncMock(return_value=[])
+    mock_db.hybrid_search = AsyncMock(side_effect=_consume_embedding)
 
     from src.server.server import search_skills
 
     await search_skills.fn(query="  test query  ")
 
-    mock_embed.assert_awaited_once_with("test query", task_type="RETRIEVAL_QUERY")
+    mock_embed.assert_called_once_with(
+        "test query", task_type="RETRIEVAL_QUERY", hedge=True, site="search.embed"
+    )
 
 
 # --- Response structure ---
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -166,3 +167,71 @@ async def test_create_skill_response_contains_full_skill_dict(mock_pro, mock_emb
     for field in ["skill_id", "title", "problem", "resolution_md", "conditions",
                   "keywords", "embedding", "confidence", "created_at", "updated_at"]:
         assert field in skill_dict, f"Missing field: {field}"
+
+
+def _streaming_pro(extracted, gate=None, closed=None):
+    """Fake call_pro_json_stream: fires fields in order, optionally parking
+    before "resolution" until gate is set."""
+
+    async def _stream(prompt, on_field, **kwargs):
+        try:
+            for name, value in extracted.items():
+                if name == "resolution" and gate is not None:
+                    await gate.wait()
+                on_field(name, value)
+            return extracted
+        except asyncio.CancelledError:
+            if closed is not None:
+                closed.append(True)
+            raise
+
+    return _stream
+
+
+@patch("src.orchestration.create.PRO_STREAM_EXTRACTION", True)
+@patch("src.orchestration.create.db")
+@patch("src.orchestration.create.embed", new_callable=AsyncMock)
+async def test_create_streaming_checks_duplicate_before_resolution(mock_embed, mock_db):
+    existing = _make_skill()
+    mock_embed.return_value = [0.1] * 768
+    mock_db.check_duplicate = AsyncMock(return_value=existing)
+    closed = []
+    # resolution never arrives: only the early duplicate check can finish this
+    stream = _streaming_pro(
+        {k: EXTRACTED[k] for k in ("title", "problem", "conditions", "keywords", "resolution")},
+        gate=asyncio.Event(),
+        closed=closed,
+    )
+
+    from src.orchestration.create import create_skill_orchestration
+
+    with patch("src.orchestration.create.call_pro_json_stream", stream):
+        result = await asyncio.wait_for(create_skill_orchestration("conversation"), 1.0)
+        await asyncio.sleep(0)
+
+    assert result.created is False
+    assert result.skill_id == "skill-001"
+    assert closed == [True]
+    assert "**Do:**" not in mock_embed.call_args.args[0]
+    mock_db.create_skill.assert_not_called()
+
+
+@patch("src.orchestration.create.PRO_STREAM_EXTRACTION", True)
+@patch("src.orchestration.create.db")
+@patch("src.orchestration.create.embed", new_callable=AsyncMock)
+async def test_create_streaming_new_skill_uses_full_extraction(mock_embed, mock_db):
+    mock_embed.return_value = [0.1] * 768
+    mock_db.check_duplicate = AsyncMock(return_value=None)
+    mock_db.create_skill = AsyncMock(side_effect=lambda s: s)
+    ordered = {k: EXTRACTED[k] for k in (
+        "title", "problem", "conditions", "keywords", "product_area", "issue_type", "resolution"
+    )}
+
+    from src.orchestration.create import create_skill_orchestration
+
+    with patch("src.orchestration.create.call_pro_json_stream", _streaming_pro(ordered)):
+        result = await create_skill_orchestration("conversation")
+
+    assert result.created is True
+    assert result.skill["resolution_md"] == EXTRACTED["resolution"]
+    mock_embed.assert_awaited_once()
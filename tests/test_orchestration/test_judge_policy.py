@@ -0,0 +1,227 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.orchestration.judge_policy import (
+    DecisionLog,
+    JudgeSkipPolicy,
+    extract_features,
+    fit_policy,
+    load_decision_log,
+    load_policy,
+    log_decision,
+)
+from src.utils.config import SEARCH_FUSION, SEARCH_TOP_K
+
+
+def _make_skill(**overrides):
+    from src.skills.models import Skill
+
+    defaults = dict(
+        skill_id="skill-001",
+        title="Password Reset",
+        problem="Customer cannot log in",
+        resolution_md="# Steps",
+        embedding=[0.1] * 768,
+        confidence=0.8,
+        created_at="2026-01-01T00:00:00+00:00",
+        updated_at="2026-01-01T00:00:00+00:00",
+    )
+    defaults.update(overrides)
+    return Skill(**defaults)
+
+
+def _candidates():
+    return [
+        {"skill": _make_skill(skill_id="a"), "score": 0.9, "vector_score": 0.86, "keyword_score": 1.0},
+        {"skill": _make_skill(skill_id="b"), "score": 0.5, "vector_score": 0.9, "keyword_score": 0.0},
+    ]
+
+
+def test_extract_features():
+    features = extract_features(_candidates())
+
+    assert features["top_score"] == 0.9
+    assert abs(features["gap"] - 0.4) < 1e-9
+    assert features["agreement"] == 0.0  # "b" has the better vector score
+    assert features["confidence"] == 0.8
+
+
+def test_extract_features_single_candidate_agreement():
+    features = extract_features(_candidates()[:1])
+
+    assert features["gap"] == 0.9
+    assert features["agreement"] == 1.0
+
+
+def test_default_policy_never_skips():
+    policy = JudgeSkipPolicy()
+    assert not policy.should_skip(extract_features(_candidates()))
+
+
+def test_fit_policy_respects_target_false_accept_rate():
+    confident = {"top_score": 0.95, "gap": 0.5, "agreement": 1.0, "confidence": 0.9}
+    ambiguous = {"top_score": 0.6, "gap": 0.02, "agreement": 0.0, "confidence": 0.5}
+    records = (
+        [{"features": confident, "accepted_top": True}] * 50
+        + [{"features": ambiguous, "accepted_top": True}] * 25
+        + [{"features": ambiguous, "accepted_top": False}] * 25
+    )
+
+    policy = fit_policy(records, target_false_accept_rate=0.05, min_accepts=10)
+
+    assert policy.should_skip(confident)
+    assert not policy.should_skip(ambiguous)
+    assert policy.expected_false_accept_rate <= 0.05
+    assert policy.expected_skip_rate == 0.5
+
+
+def test_fit_policy_without_safe_threshold_never_skips():
+    features = {"top_score": 0.6, "gap": 0.1, "agreement": 0.0, "confidence": 0.5}
+    records = [
+        {"features": features, "accepted_top": i % 2 == 0} for i in range(40)
+    ]
+
+    policy = fit_policy(records, target_false_accept_rate=0.01, min_accepts=10)
+
+    assert policy.threshold > 1.0
+    assert not policy.should_skip(features)
+
+
+def test_policy_round_trip(tmp_path):
+    policy = JudgeSkipPolicy(weights={"gap": 3.0}, bias=-1.0, threshold=0.7, samples=12)
+    path = tmp_path / "judge_skip.json"
+    policy.save(path)
+
+    assert JudgeSkipPolicy.load(path) == policy
+
+
+def test_log_decision_appends_calibration_record(tmp_path):
+    path = tmp_path / "decisions.jsonl"
+    log_decision(path, "can't log in", _candidates(), "a")
+    log_decision(path, "can't log in", _candidates(), "none")
+
+    records = load_decision_log(path)
+    assert [r["accepted_top"] for r in records] == [True, False]
+    assert set(records[0]["features"]) == {"top_score", "gap", "agreement", "confidence"}
+    assert (records[0]["search_fusion"], records[0]["search_top_k"]) == (SEARCH_FUSION, SEARCH_TOP_K)
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_skips_judge_when_policy_accepts(mock_embed, mock_flash, mock_db):
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(return_value=_candidates())
+    policy = JudgeSkipPolicy(weights={"gap": 10.0}, bias=-2.0, threshold=0.5)
+
+    from src.orchestration import search
+
+    with patch.object(search, "_skip_policy", policy):
+        result = await search.search_skills_orchestration("can't log in")
+        stats = search.judge_skip_stats()
+
+    assert result.skill.skill_id == "a"
+    mock_flash.assert_not_awaited()
+    assert stats["judge_skipped"] == 1
+    assert stats["skip_rate"] == 1.0
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_logs_judge_decision(mock_embed, mock_flash, mock_db, tmp_path):
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(return_value=_candidates())
+    mock_flash.return_value = json.dumps({"skill_id": "b"})
+    log_path = tmp_path / "decisions.jsonl"
+
+    from src.orchestration import search
+
+    with patch.object(search, "JUDGE_DECISION_LOG", str(log_path)):
+        await search.search_skills_orchestration("can't log in")
+        await search.flush_decision_log()
+
+    records = load_decision_log(log_path)
+    assert len(records) == 1
+    assert records[0]["chosen_skill_id"] == "b"
+    assert records[0]["accepted_top"] is False
+
+
+def test_unreadable_calibration_disables_skipping(tmp_path, caplog):
+    bad = tmp_path / "judge_skip.json"
+    bad.write_text("{not json")
+
+    for path in (bad, tmp_path / "missing.json"):
+        policy = load_policy(path)
+        assert not policy.enabled
+        assert not policy.should_skip({"top_score": 1.0, "gap": 1.0, "agreement": 1.0, "confidence": 1.0})
+    assert "judge skipping disabled" in caplog.text
+
+
+def test_fit_policy_records_search_settings():
+    records = [
+        {"features": {"top_score": 0.9, "gap": 0.4, "agreement": 1.0, "confidence": 0.9},
+         "accepted_top": True, "search_fusion": "rrf", "search_top_k": 5}
+    ] * 30
+
+    policy = fit_policy(records, min_accepts=10)
+
+    assert (policy.search_fusion, policy.search_top_k) == ("rrf", 5)
+
+
+def test_fit_policy_rejects_mixed_search_settings():
+    features = {"top_score": 0.9, "gap": 0.4, "agreement": 1.0, "confidence": 0.9}
+    records = [
+        {"features": features, "accepted_top": True, "search_fusion": fusion, "search_top_k": 5}
+        for fusion in ("linear", "rrf")
+    ]
+
+    with pytest.raises(ValueError, match="mixes search settings"):
+        fit_policy(records)
+
+
+@pytest.mark.parametrize("fusion, top_k", [("rrf", 5), ("linear", 10), ("", 0)])
+def test_calibration_for_other_search_settings_disables_skipping(tmp_path, caplog, fusion, top_k):
+    path = tmp_path / "judge_skip.json"
+    JudgeSkipPolicy(
+        weights={"gap": 10.0}, bias=-2.0, threshold=0.5, search_fusion=fusion, search_top_k=top_k
+    ).save(path)
+
+    assert load_policy(path, "linear", 5) == JudgeSkipPolicy()
+    assert "judge skipping disabled" in caplog.text
+    assert load_policy(path, fusion, top_k).enabled
+
+
+async def test_bad_calibration_path_does_not_break_search(monkeypatch):
+    from src.orchestration import search
+
+    monkeypatch.setattr(search, "JUDGE_SKIP_CALIBRATION", "/nonexistent/judge_skip.json")
+    monkeypatch.setattr(search, "_skip_policy", None)
+
+    assert search.judge_skip_stats()["enabled"] is False
+
+
+async def test_decision_log_writes_off_loop_in_order(tmp_path):
+    path = tmp_path / "decisions.jsonl"
+    log = DecisionLog(path)
+    with patch("src.orchestration.judge_policy.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+        for chosen in ("a", "b", "none"):
+            log.append("can't log in", _candidates(), chosen)
+        assert not path.exists()  # nothing written on the loop
+        await log.flush()
+
+    assert [r["chosen_skill_id"] for r in load_decision_log(path)] == ["a", "b", "none"]
+    to_thread.assert_called()
+
+
+def test_clearing_judge_cache_keeps_skip_counters():
+    from src.orchestration import search
+
+    search._judge_counts["skipped"] = 3
+    search.clear_judge_cache()
+    assert search.judge_skip_stats()["judge_skipped"] == 3
+    search.reset_judge_skip_stats()
+    assert search.judge_skip_stats()["judge_skipped"] == 0
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -30,6 +31,12 @@ def _make_skill(**overrides):
     return Skill(**defaults)
 
 
+async def _consume_embedding(query_embedding, query_text, **kwargs):
+    """hybrid_search stub that, like the real one, awaits the in-flight embedding."""
+    await query_embedding
+    return []
+
+
 @patch("src.orchestration.search.db")
 @patch("src.orchestration.search.call_flash")
 @patch("src.orchestration.search.embed", new_callable=AsyncMock)
@@ -164,13 +171,320 @@ async def test_search_always_returns_positive_search_time(mock_embed, mock_flash
 async def test_search_uses_retrieval_query_task_type(mock_embed, mock_flash, mock_db):
     """Embed is called with RETRIEVAL_QUERY, not RETRIEVAL_DOCUMENT."""
     mock_embed.return_value = [0.1] * 768
-    mock_db.hybrid_search = AsyncMock(return_value=[])
+    mock_db.hybrid_search = AsyncMock(side_effect=_consume_embedding)
 
     from src.orchestration.search import search_skills_orchestration
 
     await search_skills_orchestration("test query")
 
-    mock_embed.assert_awaited_once_with("test query", task_type="RETRIEVAL_QUERY")
+    mock_embed.assert_called_once_with(
+        "test query", task_type="RETRIEVAL_QUERY", hedge=True, site="search.embed"
+    )
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_repeat_query_served_from_judge_cache(mock_embed, mock_flash, mock_db):
+    skill = _make_skill()
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(return_value=[{"skill": skill, "score": 0.9}])
+    mock_flash.return_value = json.dumps({"skill_id": "skill-001"})
+
+    from src.orchestration.search import judge_cache_stats, search_skills_orchestration
+
+    first = await search_skills_orchestration("can't log in")
+    second = await search_skills_orchestration("can't  log in")
+
+    assert first.skill.skill_id == second.skill.skill_id == "skill-001"
+    mock_flash.assert_awaited_once()
+    assert judge_cache_stats()["hits"] == 1
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_judge_cache_negative_hit(mock_embed, mock_flash, mock_db):
+    """A "none" decision is cached too."""
+    skill = _make_skill()
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(return_value=[{"skill": skill, "score": 0.5}])
+    mock_flash.return_value = json.dumps({"skill_id": "none"})
+
+    from src.orchestration.search import search_skills_orchestration
+
+    assert (await search_skills_orchestration("unrelated")).skill is None
+    assert (await search_skills_orchestration("unrelated")).skill is None
+    mock_flash.assert_awaited_once()
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_judge_cache_misses_after_skill_version_bump(
+    mock_embed, mock_flash, mock_db
+):
+    mock_embed.return_value = [0.1] * 768
+    mock_flash.return_value = json.dumps({"skill_id": "skill-001"})
+
+    from src.orchestration.search import search_skills_orchestration
+
+    mock_db.hybrid_search = AsyncMock(
+        return_value=[{"skill": _make_skill(version=1), "score": 0.9}]
+    )
+    await search_skills_orchestration("can't log in")
+    mock_db.hybrid_search = AsyncMock(
+        return_value=[{"skill": _make_skill(version=2), "score": 0.9}]
+    )
+    await search_skills_orchestration("can't log in")
+
+    assert mock_flash.await_count == 2
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_hydrates_only_chosen_card(mock_embed, mock_flash, mock_db):
+    """Candidates are SkillCards; only the winner's resolution_md is fetched."""
+    from src.skills.models import SkillCard
+
+    cards = [
+        {"skill": SkillCard(skill_id="skill-A", title="Billing Refund", version=3), "score": 0.9},
+        {"skill": SkillCard(skill_id="skill-B", title="Password Reset", version=1), "score": 0.8},
+    ]
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(return_value=cards)
+    mock_db.get_skill_resolution = AsyncMock(return_value="# Refund steps")
+    mock_flash.return_value = json.dumps({"skill_id": "skill-A"})
+
+    from src.orchestration.search import search_skills_orchestration
+
+    result = await search_skills_orchestration("refund please")
+
+    assert result.skill.resolution_md == "# Refund steps"
+    mock_db.get_skill_resolution.assert_awaited_once_with("skill-A", 3)
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_chosen_card_deleted_before_hydration(mock_embed, mock_flash, mock_db):
+    from src.skills.models import SkillCard
+
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(
+        return_value=[{"skill": SkillCard(skill_id="skill-A", title="Gone"), "score": 0.9}]
+    )
+    mock_db.get_skill_resolution = AsyncMock(return_value=None)
+    mock_flash.return_value = json.dumps({"skill_id": "skill-A"})
+
+    from src.orchestration.search import search_skills_orchestration
+
+    result = await search_skills_orchestration("refund please")
+
+    assert result.skill is None
+
+
+def _slow(result, delay=10.0):
+    async def _call(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return result
+    return _call
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_late_embedding_falls_back_to_keyword_only(mock_embed, mock_flash, mock_db):
+    seen = []
+
+    async def _hybrid_search(query_embedding, query, **kwargs):
+        seen.append(await query_embedding)
+        return _cards("A")
+
+    mock_embed.side_effect = _slow([0.1] * 768)
+    mock_db.hybrid_search = _hybrid_search
+    mock_db.get_skill_resolution = AsyncMock(return_value="# A")
+    mock_flash.return_value = json.dumps({"skill_id": "A"})
+
+    from src.orchestration.search import search_skills_orchestration
+
+    result = await search_skills_orchestration("refund", deadline_ms=100)
+
+    assert seen == [None]
+    assert result.fallbacks == ["keyword_only"]
+    assert result.skill.skill_id == "A"
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_late_judge_falls_back_to_top_candidate(mock_embed, mock_flash, mock_db):
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(return_value=_cards("A", "B"))
+    mock_db.get_skill_resolution = AsyncMock(return_value="# A")
+    mock_flash.side_effect = _slow(json.dumps({"skill_id": "B"}))
+
+    from src.orchestration.search import search_skills_orchestration
+
+    result = await search_skills_orchestration("refund", deadline_ms=50)
+
+    assert result.fallbacks == ["top_candidate"]
+    assert result.skill.skill_id == "A"
+    assert result.search_time_ms < 1000
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_late_retrieval_returns_no_match(mock_embed, mock_flash, mock_db):
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(side_effect=_slow(_cards("A")))
+
+    from src.orchestration.search import search_skills_orchestration
+
+    result = await search_skills_orchestration("refund", deadline_ms=50)
+
+    assert result.skill is None
+    assert result.fallbacks == ["retrieval_timeout"]
+    mock_flash.assert_not_awaited()
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed", new_callable=AsyncMock)
+async def test_search_zero_deadline_disables_budget(mock_embed, mock_flash, mock_db):
+    mock_embed.return_value = [0.1] * 768
+    mock_db.hybrid_search = AsyncMock(return_value=_cards("A", "B"))
+    mock_db.get_skill_resolution = AsyncMock(return_value="# B")
+    mock_flash.side_effect = _slow(json.dumps({"skill_id": "B"}), delay=0.05)
+
+    from src.orchestration.search import search_skills_orchestration
+
+    result = await search_skills_orchestration("refund", deadline_ms=0)
+
+    assert result.fallbacks == []
+    assert result.skill.skill_id == "B"
+
+
+def _cards(*ids):
+    from src.skills.models import SkillCard
+
+    return [
+        {"skill": SkillCard(skill_id=sid, title=f"Skill {sid}"), "score": 0.9 - i * 0.1}
+        for i, sid in enumerate(ids)
+    ]
+
+
+@patch("src.orchestration.search.JUDGE_BATCH_SIZE", 2)
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed_batch", new_callable=AsyncMock)
+async def test_search_batch_groups_judge_prompts(mock_embed_batch, mock_flash, mock_db):
+    queries = ["refund", "login", "cancel", "nothing"]
+    mock_embed_batch.return_value = [[0.1] * 768] * 4
+    mock_db.hybrid_search_batch = AsyncMock(
+        return_value=[_cards("A", "B"), _cards("C"), _cards("D"), []]
+    )
+    mock_db.get_skill_resolutions = AsyncMock(return_value={"B": "# B", "D": "# D"})
+    mock_flash.side_effect = [
+        json.dumps({"decisions": {"q0": "B", "q1": "none"}}),
+        json.dumps({"decisions": {"q0": "D"}}),
+    ]
+
+    from src.orchestration.search import search_skills_batch_orchestration
+
+    result = await search_skills_batch_orchestration(queries)
+
+    mock_embed_batch.assert_awaited_once_with(
+        queries, task_type="RETRIEVAL_QUERY", site="search.embed_batch"
+    )
+    assert mock_flash.await_count == 2
+    assert [r.query for r in result.results] == queries
+    assert [r.skill.skill_id if r.skill else None for r in result.results] == ["B", None, "D", None]
+    mock_db.get_skill_resolutions.assert_awaited_once_with([("B", 1), ("D", 1)])
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed_batch", new_callable=AsyncMock)
+async def test_search_batch_unparseable_group_rejudged_individually(
+    mock_embed_batch, mock_flash, mock_db
+):
+    mock_embed_batch.return_value = [[0.1] * 768] * 2
+    mock_db.hybrid_search_batch = AsyncMock(return_value=[_cards("A"), _cards("B")])
+    mock_db.get_skill_resolutions = AsyncMock(return_value={"A": "# A"})
+    mock_flash.side_effect = [
+        "not json",
+        json.dumps({"skill_id": "A"}),
+        json.dumps({"skill_id": "none"}),
+    ]
+
+    from src.orchestration.search import search_skills_batch_orchestration, search_skills_orchestration
+
+    result = await search_skills_batch_orchestration(["refund", "login"])
+
+    assert mock_flash.await_count == 3
+    assert result.results[0].skill.skill_id == "A"
+    assert result.results[1].skill is None
+
+    # Decisions are shared with the single-query judge cache
+    mock_db.hybrid_search = AsyncMock(return_value=_cards("A"))
+    mock_db.get_skill_resolution = AsyncMock(return_value="# A")
+    with patch("src.orchestration.search.embed", new_callable=AsyncMock):
+        await search_skills_orchestration("refund")
+    assert mock_flash.await_count == 3
+
+
+@patch("src.orchestration.search.JUDGE_BATCH_SIZE", 1)
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed_batch", new_callable=AsyncMock)
+async def test_search_batch_failed_group_fails_only_its_queries(
+    mock_embed_batch, mock_flash, mock_db
+):
+    mock_embed_batch.return_value = [[0.1] * 768] * 3
+    mock_db.hybrid_search_batch = AsyncMock(return_value=[_cards("A"), _cards("B"), _cards("C")])
+    mock_db.get_skill_resolutions = AsyncMock(return_value={"A": "# A", "C": "# C"})
+
+    async def _flash(prompt, **kwargs):
+        if "login" in prompt:
+            raise RuntimeError("503 after retries")
+        return json.dumps({"decisions": {"q0": "A" if "refund" in prompt else "C"}})
+
+    mock_flash.side_effect = _flash
+
+    from src.orchestration.search import search_skills_batch_orchestration
+
+    result = await search_skills_batch_orchestration(["refund", "login", "cancel"])
+
+    assert [r.skill.skill_id if r.skill else None for r in result.results] == ["A", None, "C"]
+    assert [r.fallbacks for r in result.results] == [[], ["judge_error"], []]
+    # The failed group is not fanned out into per-query calls
+    assert mock_flash.await_count == 3
+
+
+@patch("src.orchestration.search.db")
+@patch("src.orchestration.search.call_flash", new_callable=AsyncMock)
+@patch("src.orchestration.search.embed_batch", new_callable=AsyncMock)
+async def test_search_batch_non_object_decisions_rejudged_individually(
+    mock_embed_batch, mock_flash, mock_db
+):
+    mock_embed_batch.return_value = [[0.1] * 768] * 2
+    mock_db.hybrid_search_batch = AsyncMock(return_value=[_cards("A"), _cards("B")])
+    mock_db.get_skill_resolutions = AsyncMock(return_value={"A": "# A"})
+    mock_flash.side_effect = [
+        json.dumps({"decisions": ["A", "B"]}),
+        json.dumps({"skill_id": "A"}),
+        json.dumps({"skill_id": "none"}),
+    ]
+
+    from src.orchestration.search import search_skills_batch_orchestration
+
+    result = await search_skills_batch_orchestration(["refund", "login"])
+
+    assert mock_flash.await_count == 3
+    assert [r.skill.skill_id if r.skill else None for r in result.results] == ["A", None]
 
 
 def test_format_candidates():
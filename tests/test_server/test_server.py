@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -135,4 +136,127 @@ async def test_search_strips_whitespace_from_query(mock_orch):
 
     await search_skills.fn(query="  test query  ")
 
-    mock_orch.assert_awaited_once_with("test query")
+    mock_orch.assert_awaited_once_with("test query", filters=None, deadline_ms=None)
+
+
+@patch("src.server.server.search_skills_batch_orchestration", new_callable=AsyncMock)
+async def test_search_skills_batch_strips_and_validates(mock_orch):
+    from fastmcp.exceptions import ToolError
+    from src.server.models import BatchSearchResponse
+    from src.server.server import search_skills_batch
+
+    mock_orch.return_value = BatchSearchResponse(results=[], search_time_ms=1.0)
+    await search_skills_batch.fn(queries=[" refund ", "login"])
+    mock_orch.assert_awaited_once_with(["refund", "login"])
+
+    with pytest.raises(ToolError):
+        await search_skills_batch.fn(queries=[])
+    with pytest.raises(ToolError):
+        await search_skills_batch.fn(queries=["refund", "  "])
+    with patch("src.server.server.SEARCH_BATCH_MAX", 1), pytest.raises(ToolError):
+        await search_skills_batch.fn(queries=["a", "b"])
+
+
+async def test_stats_route_reports_cache_stats():
+    import json
+
+    from src.server.server import stats
+
+    response = await stats(None)
+    body = json.loads(response.body)
+
+    assert "hit_rate" in body["embedding_cache"]
+    assert "hit_rate" in body["judge_cache"]
+
+
+async def test_lifespan_warms_up_and_closes_clients():
+    from src.server import server
+
+    calls = []
+
+    def _step(name):
+        async def _record(*args, **kwargs):
+            calls.append(name)
+        return _record
+
+    with patch.object(server, "warm_pool", _step("warm_pool")), \
+         patch.object(server, "init_client", lambda: calls.append("init_client")), \
+         patch.object(server, "ensure_indexes", _step("ensure_indexes")), \
+         patch.object(server, "LOCAL_VECTOR_INDEX", False), \
+         patch.object(server, "KEYWORD_INDEX_BACKEND", "neo4j"), \
+         patch.object(server, "STARTUP_WARMUP", True), \
+         patch.object(server, "_warm_up", AsyncMock(side_effect=RuntimeError("no quota"))), \
+         patch.object(server, "close_client", _step("close_client")), \
+         patch.object(server, "close_driver", _step("close_driver")):
+        async with server.lifespan(None):
+            assert calls == ["warm_pool", "init_client", "ensure_indexes"]
+            server._warm_up.assert_awaited_once()  # failure is logged, not fatal
+
+    assert calls[-2:] == ["close_client", "close_driver"]
+
+
+async def test_lifespan_closes_clients_when_startup_fails():
+    from src.server import server
+
+    close_client, close_driver = AsyncMock(), AsyncMock()
+    with patch.object(server, "warm_pool", AsyncMock()), \
+         patch.object(server, "init_client", lambda: None), \
+         patch.object(server, "ensure_indexes", AsyncMock(side_effect=RuntimeError("no db"))), \
+         patch.object(server, "close_client", close_client), \
+         patch.object(server, "close_driver", close_driver):
+        with pytest.raises(RuntimeError, match="no db"):
+            async with server.lifespan(None):
+                pass
+
+    close_client.assert_awaited_once()
+    close_driver.assert_awaited_once()
+
+
+@pytest.mark.parametrize("setting, value", [
+    ("SEARCH_FUSION", "rff"),
+    ("KEYWORD_INDEX_BACKEND", "locl"),
+    ("HYBRID_SEARCH_MODE", "one"),
+])
+async def test_lifespan_rejects_unknown_search_settings(setting, value):
+    from src.server import server
+    from src.utils import config
+
+    warm_pool = AsyncMock()
+    with patch.object(config, setting, value), \
+         patch.object(server, "warm_pool", warm_pool):
+        with pytest.raises(ValueError, match=f"Unknown {setting} '{value}'"):
+            async with server.lifespan(None):
+                pass
+
+    warm_pool.assert_not_awaited()
+
+
+async def test_lifespan_stops_sync_loop_before_closing_driver():
+    from src.server import server
+
+    calls = []
+
+    async def _sync_loop(replicas, interval):
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await asyncio.sleep(0)
+            calls.append("sync_stopped")
+
+    async def _close_driver():
+        calls.append("close_driver")
+
+    with patch.object(server, "warm_pool", AsyncMock()), \
+         patch.object(server, "init_client", lambda: None), \
+         patch.object(server, "ensure_indexes", AsyncMock()), \
+         patch.object(server, "LOCAL_VECTOR_INDEX", True), \
+         patch.object(server, "init_vector_index", AsyncMock()), \
+         patch.object(server, "KEYWORD_INDEX_BACKEND", "neo4j"), \
+         patch.object(server, "STARTUP_WARMUP", False), \
+         patch.object(server, "run_sync_loop", _sync_loop), \
+         patch.object(server, "close_client", AsyncMock()), \
+         patch.object(server, "close_driver", _close_driver):
+        async with server.lifespan(None):
+            await asyncio.sleep(0)
+
+    assert calls == ["sync_stopped", "close_driver"]
@@ -83,3 +83,17 @@ def test_skill_update_partial():
     assert update.title == "New Title"
     assert update.problem is None
     assert update.embedding is None
+
+
+def test_skill_card_from_neo4j_node_drops_nulls_and_extras():
+    from src.skills.models import SkillCard
+
+    card = SkillCard.from_neo4j_node({
+        "skill_id": "s-1",
+        "title": "Refund",
+        "conditions": None,
+        "embedding": [0.1] * 768,
+    })
+    assert card.conditions == []
+    assert card.confidence == 0.5
+    assert not hasattr(card, "embedding")
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from src.utils.cache import LRUCache, normalize_text
+
+
+def test_normalize_text_collapses_whitespace():
+    assert normalize_text("  reset \n my   password ") == "reset my password"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expires_entries():
+    cache = LRUCache(maxsize=10, ttl_s=5.0)
+    with patch("src.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("src.utils.cache.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["size"] == 0
+
+
+def test_hit_rate_counts_lookups():
+    cache = LRUCache(maxsize=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_zero_maxsize_disables_cache():
+    cache = LRUCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None